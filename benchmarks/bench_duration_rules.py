@@ -0,0 +1,56 @@
+"""
+사전검사 rules 방식(duration_rules 구간 계산) 벤치마크.
+
+patterns.json의 모든 패턴을 규칙으로 다시 계산해 대조한 뒤,
+workload.py로 합성한 신청 건(기본 300,000건, 틀린 건 20%)을 vector 방식과 rules 방식으로 판정해
+소요시간과 배율을 출력하고, 작업여부와 근무시간 컬럼이 같은지 확인함
+(패턴에 0.0으로 적힌 버킷은 rules 방식에서 공란 → 같은 값으로 봄).
+
+    python benchmarks/bench_duration_rules.py [--rows 300000]
+"""
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import workload  # ROOT로 이동 후 main.py를 불러옴
+
+main = workload.main
+
+
+def timed(df, mode):
+    started = time.perf_counter()
+    result = main.precheck_attendance(df.copy(), main.PATTERNS_FILE, mode)
+    return result, time.perf_counter() - started
+
+
+def blank_zero(column):
+    # 0.0과 공란을 같은 값으로 맞춤
+    return column.where(~column.isin([0, 0.0]), "").fillna("").astype(str)
+
+
+def run(args):
+    if not main.report_duration_rules(main.PATTERNS_FILE):
+        return
+
+    documents = workload.corpus_documents(args.rows, 50, args.seed, invalid_ratio=0.2)
+    df = main.normalize_documents(*workload.document_frames(documents))
+    print(f"\n합성 데이터: {len(df):,}건")
+
+    expected, vector_seconds = timed(df, "vector")
+    result, rules_seconds = timed(df, "rules")
+    print(f"{'vector':>8}: {vector_seconds:7.2f}s  ({len(df) / vector_seconds:,.0f} rows/s)")
+    print(f"{'rules':>8}: {rules_seconds:7.2f}s  ({len(df) / rules_seconds:,.0f} rows/s, vector 대비 {vector_seconds / rules_seconds:4.2f}배)")
+
+    columns = ["작업여부"] + [excel_col for excel_col, _ in main.DURATION_MAPPING.values()]
+    different = {col: int((blank_zero(expected[col]) != blank_zero(result[col])).sum()) for col in columns}
+    if any(different.values()):
+        print(f"❌ 결과 다름: { {col: n for col, n in different.items() if n} }")
+    else:
+        print("✅ 결과 동일 (작업여부, 근무시간)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="사전검사 rules 방식 측정 및 vector 방식 대조")
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
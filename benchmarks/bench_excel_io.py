@@ -0,0 +1,76 @@
+"""
+엑셀 입출력 방식 비교 벤치마크 (한 달치 합성 데이터).
+
+문서당 50건짜리 작업신청서 표를 workload.py로 합성해 총 N건(기본 100,000건)을 만들고
+신청결과 저장 → 정리 → 사전검사 저장 → 처리결과+로그 저장을
+pandas(기존 to_excel/xlsxwriter/load_workbook) / stream(xlsxwriter constant_memory, 로그 시트 동시 기록) 방식으로 각각 실행해
+단계별 소요시간과 최대 메모리(peak RSS)를 출력함. 방식마다 별도 프로세스에서 실행함.
+
+    python benchmarks/bench_excel_io.py [건수] [문서당건수]
+"""
+import os, sys, time, tempfile, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+    except ImportError:
+        import psutil  # Windows
+        return psutil.Process().memory_info().peak_wset / 1024 / 1024
+
+
+def run_mode(mode, total_rows, rows_per_doc):
+    # 하위 프로세스: 한 가지 방식만 실행하고 결과를 한 줄로 출력
+    workdir = tempfile.mkdtemp(prefix="bench_excel_io_")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import workload  # ROOT로 이동 후 main.py를 불러옴
+    main = workload.main
+
+    main.EXCEL_IO_MODE = mode
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")  # 단계별 진행 출력 숨김
+    frames, names = workload.document_frames(workload.corpus_documents(total_rows, rows_per_doc, invalid_ratio=0.2))
+    log_path = os.path.join(workdir, "log.txt")
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.writelines(f"로그 {i}\n" for i in range(total_rows // 10))
+
+    baseline = peak_rss_mb()
+    paths = {name: os.path.join(workdir, f"{name}.xlsx") for name in ("raw", "formatted", "checked", "final")}
+    timings = []
+
+    started = time.perf_counter()
+    main.save_all_to_excel(frames, names, paths["raw"])
+    timings.append(("신청결과 저장", time.perf_counter() - started))
+
+    started = time.perf_counter()
+    main.format_excel(paths["raw"], paths["formatted"])
+    timings.append(("정리", time.perf_counter() - started))
+
+    started = time.perf_counter()
+    df = main.precheck_and_save_attendance_possibility(paths["formatted"], main.PATTERNS_FILE, paths["checked"])
+    timings.append(("사전검사 저장", time.perf_counter() - started))
+
+    started = time.perf_counter()
+    main.write_frame(df, paths["final"], log_path=log_path)
+    timings.append(("처리결과+로그 저장", time.perf_counter() - started))
+
+    sys.stdout = sys.__stdout__
+    stages = "  ".join(f"{name} {seconds:6.1f}s" for name, seconds in timings)
+    print(f"{mode:>6}: {stages}  | peak RSS {peak_rss_mb():7.0f} MB (데이터 생성 후 {baseline:.0f} MB)")
+
+
+def run(total_rows=100_000, rows_per_doc=50):
+    print(f"합성 데이터: {total_rows:,}건 / 문서당 {rows_per_doc}건 ({-(-total_rows // rows_per_doc):,}개 시트)")
+    for mode in ("pandas", "stream"):
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--mode", mode, str(total_rows), str(rows_per_doc)], check=True)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--mode"]:
+        run_mode(args[1], int(args[2]), int(args[3]))
+    else:
+        run(*(int(arg) for arg in args))
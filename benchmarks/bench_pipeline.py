@@ -0,0 +1,163 @@
+"""
+모의 서버(mock_server.py)를 대상으로 main.py 전체 흐름을 실행하는 처리량 벤치마크.
+
+그룹웨어 로그인 → 작업확인서 검색/수집/접수 → 정리/사전검사 → HRMS 로그인/권한/메뉴 → 반영까지
+main.py의 함수를 그대로 호출하고, 수집(docs/min)과 HRMS 반영(rows/min) 처리량을 출력함.
+요청마다 지연(--latency)을 넣어 실제 서버 응답 속도를 흉내 낼 수 있음.
+
+    python benchmarks/bench_pipeline.py --docs 20 --rows 10 --latency 0.05 --workers 1 --apply row
+    python benchmarks/bench_pipeline.py --docs 20 --rows 10 --latency 0.05 --flow both
+    python benchmarks/bench_pipeline.py --docs 20 --rows 10 --latency 0.05 --collect http --http-workers 4
+    python benchmarks/bench_pipeline.py --docs 60 --rows 5 --page-size 15 --collect index
+"""
+import argparse, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)  # main.py는 patterns.json을 현재 폴더에서 읽음
+
+import main
+from mock_server import MockServer, MockState
+from workload import generate_documents
+
+
+def configure(server):
+    # main.py의 접속 주소/로그인 정보를 모의 서버로 바꿈
+    main.LOGIN_GW_URL = server.gw_url + "login"
+    main.GW_BASE_URL = server.gw_url
+    main.LOGIN_HRMS_URL = server.hrms_url + "login.htm"
+    main.USERNAME, main.GW_PASSWORD, main.HRMS_PASSWORD = "bench", "bench", "bench"
+    main.SAVE_INTERMEDIATE_FILES = False
+
+
+def collect(workers):
+    main.COLLECT_WORKERS = workers
+    return main.collect_work_confirmation_documents()
+
+
+def make_state(args):
+    return MockState(
+        generate_documents(args.docs, args.rows, args.seed, args.invalid, no_table_every=args.no_table_every),
+        latency=args.latency,
+        page_size=args.page_size,
+    )
+
+
+def run_sequential(args):
+    # 기존 순서: 그룹웨어 수집 → 정리/사전검사 → HRMS 로그인 → 반영
+    state = make_state(args)
+    with MockServer(state) as server:
+        configure(server)
+        main.driver = main.create_driver(headless=not args.show)
+        timings = {}
+        try:
+            started = time.perf_counter()
+            main.login_groupware()
+            timings["groupware_login"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            dataframes, doc_numbers = collect(args.workers)
+            timings["collect"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            df_checked, _ = main.prepare_attendance_rows(dataframes, doc_numbers)
+            timings["precheck"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            main.login_hrms()
+            main.set_hrms_role_if_needed()
+            main.go_to_attendance_management()
+            timings["hrms_login"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            df = main.apply_rows_to_hrms(df_checked.copy(), mode=args.apply)
+            timings["hrms_apply"] = time.perf_counter() - started
+
+            if args.reapply:
+                # 같은 행을 다시 반영 (이미 저장된 값 → diff 방식이면 저장 생략)
+                started = time.perf_counter()
+                df_again = main.apply_rows_to_hrms(df_checked.copy(), mode=args.apply)
+                timings["hrms_reapply"] = time.perf_counter() - started
+        finally:
+            main.driver.quit()
+
+    stats = state.stats()
+    applied = int(df["완료여부"].astype(str).str.startswith("성공").sum())
+    print("\n──────── 결과 (sequential) ────────")
+    print(f"문서 {len(doc_numbers)}/{stats['documents']}건 수집, 접수 {stats['received']}건(일괄접수 {stats['bulk_receipts']}회) / 반영 성공 {applied}/{len(df)}행 "
+          f"(서버 저장 {stats['saves']}회, {stats['saved_rows']}행) / 요청 {stats['requests']}회")
+    for name, seconds in timings.items():
+        print(f"{name:>16}: {seconds:8.2f}s")
+    collect_label = {"http": f"http x{main.COLLECT_HTTP_WORKERS}", "index": "index"}.get(main.COLLECT_MODE, f"workers={args.workers}")
+    print(f"{'docs/min':>16}: {stats['received'] / timings['collect'] * 60:8.1f}  ({collect_label})")
+    print(f"{'rows/min':>16}: {applied / timings['hrms_apply'] * 60:8.1f}  (apply={args.apply})")
+    if args.reapply:
+        unchanged = int(df_again["완료여부"].eq(main.HRMS_UNCHANGED_RESULT).sum())
+        print(f"{'reapply rows/min':>16}: {len(df_again) / timings['hrms_reapply'] * 60:8.1f}  "
+              f"(변경없음 {unchanged}/{len(df_again)}행, skip_unchanged={main.HRMS_SKIP_UNCHANGED})")
+    total = sum(seconds for name, seconds in timings.items() if name != "hrms_reapply")
+    print(f"{'end-to-end':>16}: {total:8.2f}s")
+    return total
+
+
+def run_pipelined(args):
+    # 그룹웨어 세션(수집 스레드)과 HRMS 세션(반영)을 대기열로 연결해 동시에 진행
+    state = make_state(args)
+    with MockServer(state) as server:
+        configure(server)
+        main.HRMS_APPLY_MODE = args.apply
+        main.driver = main.create_driver(headless=not args.show)
+        try:
+            started = time.perf_counter()
+            df, _ = main.run_pipelined(headless=not args.show)
+            total = time.perf_counter() - started
+        finally:
+            main.driver.quit()
+
+    stats = state.stats()
+    applied = int(df["완료여부"].astype(str).str.startswith("성공").sum())
+    print("\n──────── 결과 (pipelined) ────────")
+    print(f"문서 {df['문서번호'].nunique()}/{stats['documents']}건 수집, 접수 {stats['received']}건 / 반영 성공 {applied}/{len(df)}행 "
+          f"(서버 저장 {stats['saves']}회, {stats['saved_rows']}행) / 요청 {stats['requests']}회 "
+          f"(대기열 {main.PIPELINE_QUEUE_SIZE}건)")
+    print(f"{'end-to-end':>16}: {total:8.2f}s")
+    return total
+
+
+def run(args):
+    main.HRMS_SKIP_UNCHANGED = not args.no_diff
+    main.PIPELINE_QUEUE_SIZE = args.queue_size
+    main.COLLECT_MODE = args.collect
+    main.COLLECT_HTTP_WORKERS = args.http_workers
+    totals = {}
+    if args.flow in ("sequential", "both"):
+        totals["sequential"] = run_sequential(args)
+    if args.flow in ("pipelined", "both"):
+        totals["pipelined"] = run_pipelined(args)
+    if len(totals) == 2:
+        print(f"\n⏱️ end-to-end: sequential {totals['sequential']:.2f}s → pipelined {totals['pipelined']:.2f}s "
+              f"({totals['sequential'] / totals['pipelined']:.2f}배)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모의 서버 대상 전체 흐름 처리량 측정")
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=10, help="문서당 신청 건수")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청마다 넣을 지연(초)")
+    parser.add_argument("--workers", type=int, default=1, help="문서 수집 작업자 수")
+    parser.add_argument("--collect", choices=["browser", "index", "http"], default="browser",
+                        help="문서 수집 방식 (index: 목록 색인 + 일괄접수, http: 목록/문서 HTML 직접 조회, 접수만 브라우저)")
+    parser.add_argument("--http-workers", type=int, default=4, help="http 수집 동시 요청 수")
+    parser.add_argument("--apply", choices=["row", "batch"], default="row", help="HRMS 반영 방식")
+    parser.add_argument("--invalid", type=float, default=0.0, help="사전검사에서 걸러질 신청 건 비율")
+    parser.add_argument("--page-size", type=int, default=10, help="모의 서버 목록 한 페이지의 문서 수")
+    parser.add_argument("--no-table-every", type=int, default=0, help="N번째 문서마다 표 없는 문서")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--flow", choices=["sequential", "pipelined", "both"], default="sequential",
+                        help="전체 흐름 방식 (both: 모의 서버를 새로 띄워 두 방식 end-to-end 비교)")
+    parser.add_argument("--queue-size", type=int, default=5, help="pipelined 방식 대기열 크기(문서 수)")
+    parser.add_argument("--reapply", action="store_true", help="반영 후 같은 행을 한 번 더 반영 (diff 방식 확인)")
+    parser.add_argument("--no-diff", action="store_true", help="값이 같아도 저장 (HRMS_SKIP_UNCHANGED=False)")
+    parser.add_argument("--show", action="store_true", help="브라우저 창 표시")
+    run(parser.parse_args())
@@ -0,0 +1,54 @@
+"""
+사전검사 parallel 방식 확장성 벤치마크.
+
+workload.py로 합성한 신청 건(기본 300,000건, 틀린 건 20%)을 정리한 뒤
+serial(vector/row) 판정과 parallel 판정(작업 프로세스 1/2/4/8개)을 실행해 소요시간과 배율을 출력하고,
+parallel 결과가 serial 결과와 바이트 단위로 같은지(CSV 직렬화 sha256 + dtype) 확인함.
+
+    python benchmarks/bench_precheck_parallel.py [--rows 300000] [--workers 1 2 4 8] [--engine vector|row]
+"""
+import argparse, hashlib, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import workload  # ROOT로 이동 후 main.py를 불러옴
+
+main = workload.main
+
+
+def digest(df):
+    return hashlib.sha256(df.to_csv(index=False).encode("utf-8") + str(list(df.dtypes)).encode("utf-8")).hexdigest()
+
+
+def timed(df, mode):
+    started = time.perf_counter()
+    result = main.precheck_attendance(df, main.PATTERNS_FILE, mode)
+    return result, time.perf_counter() - started
+
+
+def run(args):
+    documents = workload.corpus_documents(args.rows, 50, args.seed, invalid_ratio=0.2)
+    df = main.normalize_documents(*workload.document_frames(documents))
+    main.PRECHECK_PARALLEL_ENGINE = args.engine
+    main.PRECHECK_PARALLEL_MIN_ROWS = 0
+    print(f"\n합성 데이터: {len(df):,}건 / CPU {os.cpu_count()}개 / 묶음 판정 방식: {args.engine}")
+
+    expected, serial_seconds = timed(df, args.engine)
+    expected_digest = digest(expected)
+    print(f"{'serial':>12}: {serial_seconds:7.2f}s  ({len(df) / serial_seconds:,.0f} rows/s)")
+
+    for workers in args.workers:
+        main.PRECHECK_WORKERS = workers
+        result, seconds = timed(df, "parallel")
+        same = digest(result) == expected_digest
+        print(f"{f'parallel x{workers}':>12}: {seconds:7.2f}s  ({len(df) / seconds:,.0f} rows/s, "
+              f"serial 대비 {serial_seconds / seconds:4.2f}배)  {'✅ 결과 동일' if same else '❌ 결과 다름'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="사전검사 parallel 방식 확장성 측정")
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--engine", choices=["vector", "row"], default="vector", help="각 묶음의 판정 방식")
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
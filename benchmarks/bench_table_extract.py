@@ -0,0 +1,51 @@
+"""
+작업신청서(확인서) 표 추출 방식 비교 벤치마크.
+
+고정 샘플(fixtures/work_confirmation_table.html)을 headless Chrome으로 열고
+cells(셀마다 WebDriver 호출) / script(execute_script 1회) / html(outerHTML 로컬 파싱)
+방식의 소요시간과 결과 일치 여부를 출력함.
+
+    python benchmarks/bench_table_extract.py [반복횟수]
+"""
+import os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "work_confirmation_table.html")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # main.py는 patterns.json을 현재 폴더에서 읽음
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+import main
+
+
+def run(repeat=5):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    main.driver = webdriver.Chrome(options=options)
+
+    try:
+        main.driver.get("file://" + FIXTURE)
+        table = main.driver.find_element(By.XPATH, "//table[contains(., '작업신청서(확인서)신청결과')]")
+
+        results = {}
+        for mode in ("cells", "script", "html"):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                rows = main.read_table_rows(table, mode)
+            elapsed = (time.perf_counter() - started) / repeat
+            results[mode] = rows
+            print(f"{mode:>6}: {elapsed * 1000:8.1f} ms/표  ({len(rows)}행)")
+
+        for mode in ("script", "html"):
+            same = results[mode] == results["cells"]
+            print(f"{mode:>6} == cells : {'일치' if same else '불일치'}")
+
+        # 수집 경로와 같이 DataFrame으로 바꾼 뒤 정리
+        main.normalize_documents([main.table_rows_to_dataframe(results["script"])], ["FIXTURE"])
+    finally:
+        main.driver.quit()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
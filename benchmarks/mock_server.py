@@ -0,0 +1,541 @@
+"""
+그룹웨어 + 통합인사시스템(HRMS) 모의 서버 (오프라인 벤치마크용).
+
+main.py가 사용하는 화면 요소만 흉내 냄.
+- 그룹웨어: 로그인 → 결재 메뉴 → 결재 수신 문서 목록(td.check 선택 / td.doc_num / td.subject) → 양식명 검색,
+  목록은 page_size건씩 나눠 보여 주고(page=N, div.paging), 선택 문서 일괄접수 → 확인 레이어 제공
+  기안일(td.date) 기간 검색(fromDate/toDate, YYYY-MM-DD) 지원. 문서의 기안일은 draft_date(없으면 오늘)
+  문서 화면(작업신청서(확인서)신청결과 표, 접수 → 확인 레이어, 목록 버튼)
+- HRMS: 로그인(비밀번호 없으면 알림), onLoginAuthority 팝업(bottomF 권한 그리드, b_save.gif 저장),
+  subMenu/menuAction → Iframe_myIBTab1_divIBTabItem_1_Content > topF(조회 조건) / bottomF(mySheet, btn_save)
+  mySheet는 HeaderRows/LastRow/RowCount/GetCellValue/SetCellValue/GetRowStatus/IsDataModified/GetSaveString 을 제공하고
+  저장 시 확인(confirm) → 저장 완료(alert) 알림 2개를 띄움. 저장 요청은 IBSheet 저장 문자열 형식
+  (sStatus=U&per_no=...&...)으로 /odm/saveOffdutyDay.do 에 보내며 {"Result": {"Code": 0, ...}} 로 응답.
+
+모든 요청에 latency(초)만큼 지연을 넣을 수 있음.
+
+    python benchmarks/mock_server.py [--docs N] [--rows N] [--latency 초] [--page-size N] [--port 그룹웨어포트]
+"""
+import argparse, json, threading, time
+from datetime import date
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote
+
+from workload import TABLE_TITLE, UPPER_COLUMNS, LOWER_COLUMNS, generate_documents
+
+FORM_NAME = "작업 확인서"
+SESSION_COOKIE = "MOCKSESSION"
+
+# mySheet 컬럼 (main.DURATION_MAPPING의 savename과 같음)
+SHEET_VALUE_COLUMNS = [
+    "work_time", "overtime", "night_time", "extend_time", "work_extra_time",
+    "minuit_over_time", "holiday_over_time", "extra_minuit_over_time", "work_support", "late_time",
+]
+SHEET_COLUMNS = ["per_no", "name", "base_date", "odm_cd"] + SHEET_VALUE_COLUMNS
+
+
+# ──────────────────────────────────────────────────────────────
+# 모의 데이터 (신청 건은 workload.generate_documents로 생성)
+# ──────────────────────────────────────────────────────────────
+def render_table(rows):
+    # main.py가 읽는 3줄 구성 표 (제목/헤더 3줄 + 신청 1건당 상단/하단/공백)
+    lines = [
+        f'<table class="work_table" border="1">',
+        f'<tr><td colspan="10" class="title">{TABLE_TITLE}</td></tr>',
+        "<tr>" + "".join(f"<td>{name}</td>" for name in UPPER_COLUMNS) + "</tr>",
+        "<tr>" + "".join(f"<td>{name}</td>" for name in LOWER_COLUMNS) + "</tr>",
+    ]
+    for row in rows:
+        lines.append("<tr>" + "".join(f"<td>{escape(row.get(name, ''))}</td>" for name in UPPER_COLUMNS) + "</tr>")
+        lines.append("<tr>" + "".join(f"<td>{escape(row.get(name, ''))}</td>" for name in LOWER_COLUMNS) + "</tr>")
+        lines.append('<tr><td colspan="10"></td></tr>')
+    lines.append("</table>")
+    return "\n".join(lines)
+
+
+class MockState:
+    """모의 서버 상태 (문서 접수 여부, HRMS 근태 데이터, 요청/저장 횟수)."""
+
+    def __init__(self, documents, latency=0.0, menu_delay=0.2, page_size=10):
+        self.lock = threading.Lock()
+        today = date.today().isoformat()
+        self.documents = {doc["id"]: dict(doc, received=False, draft_date=doc.get("draft_date", today)) for doc in documents}
+        self.latency = latency
+        self.menu_delay = menu_delay
+        self.page_size = page_size
+        self.role_selected = False
+        self.requests = 0
+        self.bulk_receipts = 0
+        self.saves = 0
+        self.saved_rows = 0
+
+        # 문서의 신청 건마다 HRMS 근태 행 1개 (사번, 기준일자)
+        self.attendance = {}
+        for doc in documents:
+            for row in doc["rows"] or ():
+                base_date = row["근무일자"].replace(".", "")
+                self.attendance[(row["사번"], base_date)] = {
+                    "per_no": row["사번"], "name": row["성명"], "base_date": base_date, "odm_cd": "",
+                    **dict.fromkeys(SHEET_VALUE_COLUMNS, ""),
+                }
+
+    def pending_documents(self):
+        with self.lock:
+            return [doc for doc in self.documents.values() if not doc["received"]]
+
+    def receive(self, doc_id):
+        with self.lock:
+            if doc_id in self.documents:
+                self.documents[doc_id]["received"] = True
+
+    def receive_bulk(self, doc_ids):
+        with self.lock:
+            self.bulk_receipts += 1
+            for doc_id in doc_ids:
+                if doc_id in self.documents:
+                    self.documents[doc_id]["received"] = True
+
+    def search(self, per_no, base_date):
+        with self.lock:
+            return [
+                dict(row) for (row_per_no, row_date), row in sorted(self.attendance.items())
+                if row_date == base_date and (not per_no or row_per_no == per_no)
+            ]
+
+    def save(self, rows):
+        with self.lock:
+            self.saves += 1
+            for row in rows:
+                key = (row.get("per_no", ""), row.get("base_date", ""))
+                if key in self.attendance and row.get("sStatus") in ("U", "I"):
+                    if "odm_cd" in row:
+                        self.attendance[key]["odm_cd"] = row["odm_cd"]
+                    for column in SHEET_VALUE_COLUMNS:
+                        if column in row:
+                            self.attendance[key][column] = _sheet_number(row[column])
+                    self.saved_rows += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "documents": len(self.documents),
+                "received": sum(doc["received"] for doc in self.documents.values()),
+                "requests": self.requests,
+                "bulk_receipts": self.bulk_receipts,
+                "saves": self.saves,
+                "saved_rows": self.saved_rows,
+            }
+
+
+def _sheet_number(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_save_string(body):
+    """IBSheet 저장 문자열(같은 키가 행 수만큼 반복) → 행 목록."""
+    params = parse_qs(body, keep_blank_values=True)
+    count = len(params.get("sStatus", []))
+    return [{key: values[i] for key, values in params.items() if i < len(values)} for i in range(count)]
+
+
+# ──────────────────────────────────────────────────────────────
+# 페이지
+# ──────────────────────────────────────────────────────────────
+def page(title, body, script=""):
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+{body}
+<script>{script}</script>
+</body></html>"""
+
+
+GW_LOGIN_PAGE = page("로그인", """
+<input id="username"> <input id="password" type="password">
+<button id="login_submit" onclick="login()">로그인</button>
+""", f"""
+function login() {{
+    document.cookie = "{SESSION_COOKIE}=" + encodeURIComponent(document.getElementById("username").value) + "; path=/";
+    location.href = "/home";
+}}
+""")
+
+GW_HOME_PAGE = page("home", '<a href="/app/approval">전자결재</a>')
+
+GW_APPROVAL_PAGE = page("전자결재", '<a data-navi="todoreception" href="/app/approval/todoreception">결재 수신 문서</a>')
+
+
+def gw_list_page(state, query):
+    keyword = query.get("keyword", [""])[0]
+    date_from, date_to = query.get("fromDate", [""])[0], query.get("toDate", [""])[0]
+    documents = [
+        doc for doc in state.pending_documents()
+        if keyword in FORM_NAME and (not date_from or doc["draft_date"] >= date_from) and (not date_to or doc["draft_date"] <= date_to)
+    ]
+    pages = max(1, -(-len(documents) // state.page_size))
+    current = min(max(1, int(query.get("page", ["1"])[0] or 1)), pages)
+    shown = documents[(current - 1) * state.page_size:current * state.page_size]
+    rows = "\n".join(
+        f'<tr><td class="check"><input type="checkbox" name="docId" value="{doc["id"]}"></td>'
+        f'<td class="doc_num"><span>{doc["doc_number"]}</span></td>'
+        f'<td class="subject"><a href="/app/approval/document/{doc["id"]}">{FORM_NAME} ({doc["doc_number"]})</a></td>'
+        f'<td class="date">{doc["draft_date"]}</td></tr>'
+        for doc in shown
+    )
+    list_url = f"/app/approval/todoreception?searchtype=formName&keyword={quote(keyword)}&fromDate={date_from}&toDate={date_to}"
+    paging = " ".join(
+        f'<a class="page{" on" if number == current else ""}" href="{list_url}&page={number}">{number}</a>'
+        for number in range(1, pages + 1)
+    )
+    return page("결재 수신 문서", f"""
+<select id="searchtype"><option value="title">제목</option><option value="formName">양식명</option></select>
+<input id="keyword" value=""> 기안일 <input id="fromDate" value=""> ~ <input id="toDate" value="">
+<button class="btn_search2" onclick="search()">검색</button>
+<span class="btn" id="bulk_receipt" onclick="bulkReceive()">일괄접수</span>
+<div id="layer"></div>
+<table class="list"><tbody>
+{rows}
+</tbody></table>
+<div class="paging">{paging}</div>
+""", """
+function search() {
+    location.href = "/app/approval/todoreception?searchtype=" + document.getElementById("searchtype").value +
+        "&keyword=" + encodeURIComponent(document.getElementById("keyword").value) +
+        "&fromDate=" + document.getElementById("fromDate").value + "&toDate=" + document.getElementById("toDate").value;
+}
+function bulkReceive() {
+    var ids = Array.from(document.querySelectorAll("td.check input:checked")).map(function (box) { return box.value; });
+    if (!ids.length) { alert("선택된 문서가 없습니다."); return; }
+    var xhr = new XMLHttpRequest();
+    xhr.open("POST", "/api/receive_bulk", false);
+    xhr.setRequestHeader("Content-Type", "application/x-www-form-urlencoded");
+    xhr.send("ids=" + ids.join(","));
+    document.getElementById("layer").innerHTML = '<span class="btn" onclick="location.reload()">확인</span>';
+}
+""")
+
+
+def gw_document_page(doc):
+    receipt = "" if doc["received"] else '<span class="btn" id="receipt" onclick="receive()">접수</span>'
+    table = render_table(doc["rows"]) if doc["rows"] is not None else "<table><tr><td>일반 문서</td></tr></table>"
+    list_url = "/app/approval/todoreception?searchtype=formName&keyword=" + quote(FORM_NAME)
+    return page(doc["doc_number"], f"""
+<div class="btns">{receipt} <span class="btn" onclick="location.href='{list_url}'">목록</span></div>
+<div id="layer"></div>
+<div class="doc_body">
+<table><tr><td>문서번호</td><td>{doc["doc_number"]}</td></tr></table>
+{table}
+</div>
+""", f"""
+function receive() {{
+    var xhr = new XMLHttpRequest();
+    xhr.open("POST", "/api/receive/{doc["id"]}", false);
+    xhr.send();
+    document.getElementById("receipt").remove();
+    document.getElementById("layer").innerHTML = '<span class="btn" onclick="closeLayer()">확인</span>';
+}}
+function closeLayer() {{ document.getElementById("layer").innerHTML = ""; }}
+""")
+
+
+HRMS_LOGIN_PAGE = page("통합인사시스템", """
+<input id="login_id"> <input id="passwd" type="password">
+<a href="#" class="btn_login" onclick="login(); return false;">로그인</a>
+""", """
+function login() {
+    if (!document.getElementById("passwd").value) { alert("비밀번호를 입력하세요."); return; }
+    location.href = "/main.htm";
+}
+""")
+
+
+def hrms_main_page(state):
+    return page("통합인사시스템", '<div id="tabs"></div>', f"""
+function onLoginAuthority() {{ window.open("/authority.htm", "authority", "width=600,height=400"); }}
+function subMenu(menuId) {{
+    setTimeout(function () {{
+        window.menuAction = function (url, tab) {{
+            document.getElementById("tabs").innerHTML =
+                '<iframe name="Iframe_myIBTab1_divIBTabItem_1_Content" src="/odm.htm" width="100%" height="800"></iframe>';
+        }};
+    }}, {int(state.menu_delay * 1000)});
+}}
+""")
+
+
+HRMS_AUTHORITY_PAGE = page("로그인 권한", '<iframe name="bottomF" src="/authority_grid.htm" width="100%" height="300"></iframe>')
+
+
+def hrms_authority_grid(state):
+    selected = "GMBool3" if state.role_selected else "GMBool0"
+    return page("로그인 권한", f"""
+<table class="GMSection">
+<tr><td class="GMBool GMBool0" onclick="select(this)"></td><td>일반사용자</td></tr>
+<tr><td class="GMBool {selected}" onclick="select(this)"></td><td>업무담당자</td></tr>
+</table>
+<img src="/images/b_save.gif" alt="저장" onclick="save()" style="width:40px;height:20px;display:inline-block">
+""", """
+function select(td) { td.className = "GMBool GMBool3"; }
+function save() {
+    if (!confirm("저장하시겠습니까?")) return;
+    var xhr = new XMLHttpRequest();
+    xhr.open("POST", "/api/authority", false);
+    xhr.send();
+    alert("저장되었습니다.");
+}
+""")
+
+
+HRMS_ODM_PAGE = page("일일근태관리", """
+<iframe name="topF" src="/odm_top.htm" width="100%" height="80"></iframe>
+<iframe name="bottomF" src="/odm_bottom.htm" width="100%" height="600"></iframe>
+""")
+
+HRMS_ODM_TOP_PAGE = page("조회조건", """
+사번 <input id="per_no"> 기준일자 <input id="base_date"> 정산년월 <input id="jungsan_ym">
+<button name="Search_button" onclick="search()">조회</button>
+""", """
+function search() {
+    parent.frames["bottomF"].doSearch(document.getElementById("per_no").value, document.getElementById("base_date").value);
+}
+""")
+
+HRMS_ODM_BOTTOM_PAGE = page("일일근태", """
+<button id="btn_save" onclick="save()">저장</button>
+<div id="grid"></div>
+""", f"""
+var COLUMNS = {json.dumps(SHEET_COLUMNS)};
+var HEADER_ROWS = 3;
+var lastSearch = null;
+var mySheet = {{
+    data: [],
+    HeaderRows: function () {{ return HEADER_ROWS; }},
+    RowCount: function () {{ return this.data.length; }},
+    LastRow: function () {{ return HEADER_ROWS + this.data.length - 1; }},
+    GetCellValue: function (row, name) {{
+        var item = this.data[row - HEADER_ROWS];
+        return item ? item.values[name] : "";
+    }},
+    SetCellValue: function (row, name, value) {{
+        var item = this.data[row - HEADER_ROWS];
+        if (!item) return;
+        item.values[name] = value;
+        item.status = "U";
+    }},
+    GetRowStatus: function (row) {{
+        var item = this.data[row - HEADER_ROWS];
+        return item ? item.status : "";
+    }},
+    IsDataModified: function () {{
+        return this.data.some(function (item) {{ return item.status !== "R"; }});
+    }},
+    GetSaveString: function () {{
+        return this.data.filter(function (item) {{ return item.status !== "R"; }}).map(function (item) {{
+            return "sStatus=" + item.status + COLUMNS.map(function (name) {{
+                var value = item.values[name];
+                return "&" + name + "=" + encodeURIComponent(value === undefined || value === null ? "" : value);
+            }}).join("");
+        }}).join("&");
+    }}
+}};
+function render() {{
+    document.getElementById("grid").innerText = mySheet.data.length + "건";
+}}
+function doSearch(perNo, baseDate) {{
+    lastSearch = [perNo, baseDate];
+    var xhr = new XMLHttpRequest();
+    xhr.open("GET", "/api/odm?per_no=" + encodeURIComponent(perNo) + "&base_date=" + encodeURIComponent(baseDate), false);
+    xhr.send();
+    mySheet.data = JSON.parse(xhr.responseText).map(function (values) {{ return {{values: values, status: "R"}}; }});
+    render();
+}}
+function save() {{
+    if (!confirm("저장하시겠습니까?")) return;
+    var xhr = new XMLHttpRequest();
+    xhr.open("POST", "/odm/saveOffdutyDay.do", false);
+    xhr.setRequestHeader("Content-Type", "application/x-www-form-urlencoded; charset=UTF-8");
+    xhr.send(mySheet.GetSaveString());
+    var result = JSON.parse(xhr.responseText).Result;
+    if (result.Code !== 0) {{ alert("저장 실패: " + result.Message); return; }}
+    alert(result.Message);
+    if (lastSearch) doSearch(lastSearch[0], lastSearch[1]);
+}}
+""")
+
+
+# ──────────────────────────────────────────────────────────────
+# HTTP 처리
+# ──────────────────────────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    state = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # 요청 로그 생략
+
+    def _begin(self):
+        with self.state.lock:
+            self.state.requests += 1
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        url = urlparse(self.path)
+        return url.path, parse_qs(url.query)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length).decode("utf-8") if length else ""
+
+    def _send(self, body, content_type="text/html; charset=utf-8", status=200, headers=()):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, value):
+        self._send(json.dumps(value, ensure_ascii=False), "application/json; charset=utf-8")
+
+    def _not_found(self):
+        self._send("not found", "text/plain; charset=utf-8", 404)
+
+
+class GroupwareHandler(_Handler):
+    def _logged_in(self):
+        return f"{SESSION_COOKIE}=" in (self.headers.get("Cookie") or "")
+
+    def do_GET(self):
+        path, query = self._begin()
+        if path == "/login":
+            return self._send(GW_LOGIN_PAGE)
+        if not self._logged_in():
+            return self._send("", status=302, headers=[("Location", "/login")])
+        if path in ("/", "/home"):
+            return self._send(GW_HOME_PAGE)
+        if path == "/app/approval":
+            return self._send(GW_APPROVAL_PAGE)
+        if path == "/app/approval/todoreception":
+            return self._send(gw_list_page(self.state, query))
+        if path.startswith("/app/approval/document/"):
+            doc = self.state.documents.get(int(path.rsplit("/", 1)[-1] or 0))
+            return self._send(gw_document_page(doc)) if doc else self._not_found()
+        self._not_found()
+
+    def do_POST(self):
+        path, _ = self._begin()
+        body = self._body()
+        if path == "/api/receive_bulk" and self._logged_in():
+            ids = parse_qs(body).get("ids", [""])[0]
+            self.state.receive_bulk([int(doc_id) for doc_id in ids.split(",") if doc_id.strip()])
+            return self._send_json({"result": "ok"})
+        if path.startswith("/api/receive/") and self._logged_in():
+            self.state.receive(int(path.rsplit("/", 1)[-1]))
+            return self._send_json({"result": "ok"})
+        self._not_found()
+
+
+class HrmsHandler(_Handler):
+    def do_GET(self):
+        path, query = self._begin()
+        pages = {
+            "/login.htm": lambda: HRMS_LOGIN_PAGE,
+            "/main.htm": lambda: hrms_main_page(self.state),
+            "/authority.htm": lambda: HRMS_AUTHORITY_PAGE,
+            "/authority_grid.htm": lambda: hrms_authority_grid(self.state),
+            "/odm.htm": lambda: HRMS_ODM_PAGE,
+            "/odm_top.htm": lambda: HRMS_ODM_TOP_PAGE,
+            "/odm_bottom.htm": lambda: HRMS_ODM_BOTTOM_PAGE,
+        }
+        if path in pages:
+            return self._send(pages[path]())
+        if path == "/images/b_save.gif":
+            return self._send("", "image/gif")
+        if path == "/api/odm":
+            per_no = query.get("per_no", [""])[0].strip()
+            base_date = "".join(ch for ch in query.get("base_date", [""])[0] if ch.isdigit())
+            return self._send_json(self.state.search(per_no, base_date))
+        self._not_found()
+
+    def do_POST(self):
+        path, _ = self._begin()
+        body = self._body()
+        if path == "/api/authority":
+            self.state.role_selected = True
+            return self._send_json({"result": "ok"})
+        if path == "/odm/saveOffdutyDay.do":
+            self.state.save(parse_save_string(body))
+            return self._send_json({"Result": {"Code": 0, "Message": "저장되었습니다."}})
+        self._not_found()
+
+
+class MockServer:
+    """그룹웨어/HRMS 모의 서버 2개를 백그라운드 스레드로 실행 (with 문 지원)."""
+
+    def __init__(self, state, host="127.0.0.1", gw_port=0, hrms_port=0):
+        self.state = state
+        gw_handler = type("BoundGroupwareHandler", (GroupwareHandler,), {"state": state})
+        hrms_handler = type("BoundHrmsHandler", (HrmsHandler,), {"state": state})
+        self.servers = [ThreadingHTTPServer((host, gw_port), gw_handler), ThreadingHTTPServer((host, hrms_port), hrms_handler)]
+        for server in self.servers:
+            server.daemon_threads = True
+        self.threads = []
+
+    @property
+    def gw_url(self):
+        host, port = self.servers[0].server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def hrms_url(self):
+        host, port = self.servers[1].server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        for server in self.servers:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="그룹웨어/HRMS 모의 서버")
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=10, help="문서당 신청 건수")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청마다 넣을 지연(초)")
+    parser.add_argument("--port", type=int, default=8801, help="그룹웨어 포트 (HRMS는 +1)")
+    parser.add_argument("--invalid", type=float, default=0.0, help="사전검사에서 걸러질 신청 건 비율")
+    parser.add_argument("--page-size", type=int, default=10, help="목록 한 페이지의 문서 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    state = MockState(generate_documents(args.docs, args.rows, args.seed, args.invalid),
+                      latency=args.latency, page_size=args.page_size)
+    server = MockServer(state, gw_port=args.port, hrms_port=args.port + 1).start()
+    print(f"그룹웨어: {server.gw_url}login\nHRMS    : {server.hrms_url}login.htm\n(Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
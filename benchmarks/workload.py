@@ -0,0 +1,259 @@
+"""
+사전검사/정리 벤치마크용 합성 작업확인서 데이터 생성기 (seed 고정 시 항상 같은 결과).
+
+- 신청 건: patterns.json 패턴을 따르는 정상 건과 일부러 틀린 건(지각/조퇴, 출/퇴근 공란,
+  신청시간 불일치, 패턴 외 구분, 예외 대상자)과 00:20 야간 예외(is_special_pattern_exception) 건
+- 문서: 신청 건을 문서별로 묶어 save_all_to_excel과 같은 시트 배치(제목/헤더 3줄 + 상단/하단/공백 3줄)로 저장
+- 패턴: patterns.json에 합성 패턴을 더한 큰 패턴 세트
+
+    python benchmarks/workload.py --rows 100000 --rows-per-doc 50 --invalid 0.2 --extra-patterns 200 --seed 0 --out corpus --check
+"""
+import argparse, hashlib, json, os, random, sys
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+START_DIR = os.getcwd()
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # main.py는 patterns.json을 현재 폴더에서 읽음
+
+import main
+
+TABLE_TITLE = "작업신청서(확인서)신청결과"
+UPPER_COLUMNS = ["No", "구분", "소속", "성명", "시작", "신청시간", "출근", "근무일자", "보상구분", "작업내용"]
+LOWER_COLUMNS = ["사번", "종료", "퇴근"]
+
+# 신청 건 유형 → 사전검사 기대 결과(작업여부 앞부분)
+CASES = {
+    "valid": "작업가능",
+    "night_overtime": "작업가능",   # 시간외근무 00:20~01:20/02:20, 전날 15:40 이전 출근
+    "night_holiday": "작업가능",    # 휴일근무 00:20 시작, 전날 23:00 이후 출근
+    "late": "패턴불일치",           # 지각: 출근이 시작시각 이후
+    "early_leave": "패턴불일치",    # 조퇴: 퇴근이 종료시각 이전
+    "wrong_work_time": "패턴불일치",
+    "blank_goto": "출/퇴근시간 공란",
+    "blank_getoff": "출/퇴근시간 공란",
+    "other_kind": "휴일,시간외근무 외 패턴",
+    "exception_name": "예외설정",
+}
+INVALID_CASES = [case for case, expected in CASES.items() if expected != "작업가능"]
+
+
+def _shift(hhmm, minutes):
+    return (datetime.strptime(hhmm, "%H:%M") + timedelta(minutes=minutes)).strftime("%H:%M")
+
+
+def _minutes(hhmm):
+    hours, minutes = map(int, hhmm.split(":"))
+    return hours * 60 + minutes
+
+
+def load_patterns(path=None):
+    with open(path or os.path.join(ROOT, main.PATTERNS_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def generate_patterns(extra=0, seed=0, base=None):
+    """
+    patterns.json 패턴에 (구분, 시작, 종료)가 겹치지 않는 합성 패턴 extra개를 더한 패턴 세트.
+    시작/종료는 10분 단위, 길이는 1~10시간이며 신청시간(work_times)은 패턴 길이 그대로임.
+    """
+    rng = random.Random(seed)
+    data = json.loads(json.dumps(base or load_patterns()))
+    # duration_rules 등 패턴 목록이 아닌 설정은 건너뜀
+    used = {(key, p["start"], p["end"]) for key in main.PATTERN_GROUPS.values() for p in data[key]}
+
+    added = 0
+    while added < extra:
+        key = rng.choice(["holidaywork_patterns", "overtime_patterns"])
+        # 시간외근무는 15:40~20:00, 휴일근무는 06:00~16:00 사이 10분 단위 시작
+        first, last = ("15:40", "20:00") if key == "overtime_patterns" else ("06:00", "16:00")
+        start = _shift(first, rng.randrange((_minutes(last) - _minutes(first)) // 10 + 1) * 10)
+        length = rng.randrange(6, 60) * 10  # 1~10시간
+        end = _shift(start, length)
+        if (key, start, end) in used:
+            continue
+        used.add((key, start, end))
+
+        hours = round(length / 60, 2)
+        work_times = [f"{length // 60:02d}{length % 60:02d}"]
+        duration_key = "work_extra_time" if key == "holidaywork_patterns" else "overtime"
+        data[key].append({"start": start, "end": end, "work_times": work_times, "duration": {duration_key: hours}})
+        added += 1
+    return data
+
+
+def _pick(rng, candidates):
+    kind, pattern = rng.choice(candidates)
+    return kind, pattern, rng.choice(pattern["work_times"])
+
+
+def generate_rows(n_rows, seed=0, invalid_ratio=0.0, patterns=None):
+    """
+    신청 건 n_rows개 (dict: 표 컬럼 + "case"). invalid_ratio 비율만큼 INVALID_CASES를 고르게 섞고,
+    정상 건의 일부는 00:20 야간 예외 건으로 만듦.
+    """
+    rng = random.Random(seed)
+    patterns = patterns or load_patterns()
+    all_patterns = [("휴일근무", p) for p in patterns["holidaywork_patterns"]] + \
+                   [("시간외근무", p) for p in patterns["overtime_patterns"]]
+    night_overtime = [(k, p) for k, p in all_patterns
+                      if k == "시간외근무" and p["start"] == "00:20" and p["end"] in ("01:20", "02:20")]
+    night_holiday = [(k, p) for k, p in all_patterns if k == "휴일근무" and p["start"] == "00:20"]
+    # 지각/조퇴가 예외나 자정 넘김으로 통과하지 않는 패턴만 사용
+    late_ok = [(k, p) for k, p in all_patterns if p["start"] != "00:20"]
+    early_ok = [(k, p) for k, p in all_patterns if _minutes(p["end"]) >= 60]
+
+    rows = []
+    for i in range(n_rows):
+        if rng.random() < invalid_ratio:
+            case = rng.choice(INVALID_CASES)
+        elif night_overtime and night_holiday and rng.random() < 0.1:
+            case = rng.choice(["night_overtime", "night_holiday"])
+        else:
+            case = "valid"
+
+        source = {"night_overtime": night_overtime, "night_holiday": night_holiday,
+                  "late": late_ok, "early_leave": early_ok}.get(case, all_patterns)
+        kind, pattern, work_time = _pick(rng, source)
+        goto = _shift(pattern["start"], -10)
+        # 사전검사는 시각만 비교하므로 자정을 넘기지 않게 퇴근시각을 잡음
+        getoff = _shift(pattern["end"], 15) if _minutes(pattern["end"]) + 15 < 24 * 60 else pattern["end"]
+        name = f"직원{rng.randrange(1000):03d}"
+
+        if case == "night_overtime":
+            goto = _shift("15:40", -rng.randrange(10, 120, 10))
+        elif case == "night_holiday":
+            goto = _shift("23:00", rng.randrange(0, 60, 10))
+        elif case == "late":
+            goto = _shift(pattern["start"], rng.randrange(1, 30))
+        elif case == "early_leave":
+            getoff = _shift(pattern["end"], -rng.randrange(10, 60))
+        elif case == "wrong_work_time":
+            work_time = "9999"
+        elif case == "blank_goto":
+            goto = ""
+        elif case == "blank_getoff":
+            getoff = ""
+        elif case == "other_kind":
+            kind = "연차"
+        elif case == "exception_name":
+            name = rng.choice(main.PRECHECK_EXCEPTION_NAMES)
+
+        rows.append({
+            "No": "", "구분": kind, "소속": rng.choice(["생산1팀", "생산2팀", "설비팀"]), "성명": name,
+            "시작": pattern["start"], "신청시간": f"{work_time[:2]}:{work_time[2:]}",
+            "출근": goto, "근무일자": f"2025.04.{rng.randrange(1, 31):02d}", "보상구분": "수당", "작업내용": "설비 점검",
+            "사번": str(2000000 + i), "종료": pattern["end"], "퇴근": getoff,
+            "case": case,
+        })
+    return rows
+
+
+def generate_documents(n_docs, rows_per_doc, seed=0, invalid_ratio=0.0, patterns=None, no_table_every=0):
+    """
+    신청 건을 문서별로 묶은 목록 [{"id", "doc_number", "rows"}]. no_table_every=N이면 N번째 문서마다
+    표 없는 문서(rows=None, 접수만 하는 문서)를 끼워 넣음.
+    """
+    has_table = [not (no_table_every and (doc_no + 1) % no_table_every == 0) for doc_no in range(n_docs)]
+    rows = iter(generate_rows(sum(has_table) * rows_per_doc, seed, invalid_ratio, patterns))
+
+    documents = []
+    for doc_no in range(n_docs):
+        doc_rows = None
+        if has_table[doc_no]:
+            doc_rows = [dict(next(rows), No=str(i + 1)) for i in range(rows_per_doc)]
+        documents.append({"id": doc_no + 1, "doc_number": f"MS-2025-{doc_no + 1:05d}", "rows": doc_rows})
+    return documents
+
+
+def corpus_documents(n_rows, rows_per_doc, seed=0, invalid_ratio=0.0, patterns=None):
+    # 신청 건 n_rows개를 문서당 rows_per_doc건씩 나눈 문서 목록 (마지막 문서는 남은 건수만)
+    n_docs = -(-n_rows // rows_per_doc)
+    documents = generate_documents(n_docs, rows_per_doc, seed, invalid_ratio, patterns)
+    extra_rows = n_docs * rows_per_doc - n_rows
+    if extra_rows:
+        documents[-1]["rows"] = documents[-1]["rows"][:-extra_rows]
+    return documents
+
+
+def table_rows(rows):
+    # 문서 화면 표를 읽은 것과 같은 행 목록 (제목/상단 헤더/하단 헤더 + 신청 1건당 상단/하단/공백)
+    table = [[TABLE_TITLE], list(UPPER_COLUMNS), list(LOWER_COLUMNS)]
+    for row in rows:
+        table.append([row[name] for name in UPPER_COLUMNS])
+        table.append([row[name] for name in LOWER_COLUMNS])
+        table.append([""])
+    return table
+
+
+def document_frames(documents):
+    # 수집 단계 결과와 같은 (문서별 DataFrame 목록, 문서번호 목록)
+    documents = [doc for doc in documents if doc["rows"] is not None]
+    frames = [main.table_rows_to_dataframe(table_rows(doc["rows"])) for doc in documents]
+    return frames, [doc["doc_number"] for doc in documents]
+
+
+def write_workbook(documents, path):
+    """save_all_to_excel과 같은 형식(문서번호별 시트)으로 신청결과 통합 문서 저장."""
+    main.save_all_to_excel(*document_frames(documents), path)
+
+
+def records_digest(documents):
+    # 생성 결과 확인용 해시 (xlsx는 생성 시각이 들어가므로 내용 기준으로 비교)
+    return hashlib.sha256(json.dumps(documents, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def check_expectations(documents, patterns_path):
+    """정리 → 사전검사 결과가 각 유형의 기대 결과와 맞는지 확인하고 불일치 건수 반환."""
+    df = main.precheck_attendance(main.normalize_documents(*document_frames(documents)), patterns_path)
+    cases = [row["case"] for doc in documents for row in doc["rows"] or ()]
+    mismatches = [
+        (case, status) for case, status in zip(cases, df["작업여부"].astype(str))
+        if not status.startswith(CASES[case])
+    ]
+    for case, status in mismatches[:10]:
+        print(f"⚠️ 기대와 다름: {case} → {status}")
+    return len(mismatches)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="합성 작업확인서 데이터 생성")
+    parser.add_argument("--rows", type=int, default=10000, help="신청 건수")
+    parser.add_argument("--rows-per-doc", type=int, default=50)
+    parser.add_argument("--invalid", type=float, default=0.2, help="틀린 건 비율")
+    parser.add_argument("--extra-patterns", type=int, default=0, help="patterns.json에 더할 합성 패턴 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="corpus", help="출력 폴더")
+    parser.add_argument("--check", action="store_true", help="사전검사 결과가 기대와 맞는지 확인")
+    args = parser.parse_args()
+
+    out = os.path.join(START_DIR, args.out)
+    os.makedirs(out, exist_ok=True)
+    patterns = generate_patterns(args.extra_patterns, args.seed)
+    patterns_path = os.path.join(out, "patterns.json")
+    with open(patterns_path, "w", encoding="utf-8") as f:
+        json.dump(patterns, f, ensure_ascii=False, indent="\t")
+
+    documents = corpus_documents(args.rows, args.rows_per_doc, args.seed, args.invalid, patterns)
+    write_workbook(documents, os.path.join(out, main.RAW_RESULT_FILE))
+
+    counts = {}
+    for doc in documents:
+        for row in doc["rows"]:
+            counts[row["case"]] = counts.get(row["case"], 0) + 1
+    manifest = {
+        "seed": args.seed, "rows": args.rows, "rows_per_doc": args.rows_per_doc, "documents": len(documents),
+        "invalid_ratio": args.invalid, "patterns": sum(len(patterns[key]) for key in main.PATTERN_GROUPS.values()),
+        "cases": counts, "records_sha256": records_digest(documents),
+    }
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    if args.check:
+        mismatches = check_expectations(documents, patterns_path)
+        print(f"{'✅' if not mismatches else '❌'} 기대 결과 불일치 {mismatches}건")
+
+
+if __name__ == "__main__":
+    main_cli()
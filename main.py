@@ -4,22 +4,92 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, NoSuchFrameException
 from webdriver_manager.chrome import ChromeDriverManager
-from datetime import datetime
+from datetime import datetime, timedelta, time as dt_time
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlencode, urlparse
+from requests.adapters import HTTPAdapter
 import pandas as pd
-import time, os, re, json, sys, openpyxl
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import Counter
+import time, os, re, json, sys, shutil, functools, threading, queue, atexit, sqlite3, argparse, openpyxl, xlsxwriter, requests
+
+try:
+    import keyring  # 선택: OS 자격 증명 저장소에서 비밀번호 조회
+except ImportError:
+    keyring = None
 
 
 # ──────────────────────────────────────────────────────────────
 # 기본 변수 및 세팅
 # ──────────────────────────────────────────────────────────────
 LOGIN_GW_URL = "https://office.ms-global.com/login"
+GW_BASE_URL = "https://office.ms-global.com/"
 LOGIN_HRMS_URL = "https://hrms.ms-global.com/login.htm"
+PATTERNS_FILE = "patterns.json"
+
+# 문서 수집 작업자 수 (1이면 기존 순차 수집, 2 이상이면 headless 세션 N개로 병렬 수집)
+COLLECT_WORKERS = 1
+COLLECT_HEADLESS = True
+
+# 문서 수집 방식: "browser"(목록의 첫 문서를 열어 수집/접수 반복),
+#               "index"(목록 전체 페이지를 색인한 뒤 문서 URL로 하나씩 수집, 접수는 일괄접수),
+#               "http"(로그인 쿠키로 목록/문서 HTML을 직접 받아 파싱, 브라우저는 접수/확인에만 사용)
+COLLECT_MODE = "browser"
+# http 방식 동시 요청 수 (keep-alive 연결 풀 크기) / 요청 제한시간(초)
+COLLECT_HTTP_WORKERS = 4
+COLLECT_HTTP_TIMEOUT = 10
+# 결재 수신 문서 목록 주소(GW_BASE_URL 기준)와 양식명 검색 조건 (search_work_confirmation과 같은 조건)
+GW_LIST_PATH = "app/approval/todoreception"
+GW_SEARCH_PARAMS = {"searchtype": "formName", "keyword": "작업 확인서"}
+# 목록 페이지 번호 파라미터 / 색인 시 최대 순회 페이지 수 / 목록의 일괄접수 사용 여부 (index, http 방식)
+GW_LIST_PAGE_PARAM = "page"
+GW_LIST_MAX_PAGES = 200
+GW_BULK_RECEIPT = True
+# 증분 검색: 직전 성공 실행의 기준일(watermark)부터 기안일 기간 검색 (--full이면 전체 검색)
+# 목록 검색의 기안일 시작/종료 입력(id = 주소 파라미터 이름), 날짜 형식, 결재가 늦게 도착한 문서를 위한 겹침 일수
+GW_SEARCH_DATE_FIELDS = ("fromDate", "toDate")
+GW_SEARCH_DATE_FORMAT = "%Y-%m-%d"
+WATERMARK_OVERLAP_DAYS = 3
+
+# 결과 파일
+RAW_RESULT_FILE = "작업확인서_신청결과.xlsx"
+FORMATTED_FILE = "작업확인서_신청결과_정리자동.xlsx"
+PRECHECK_FILE = "작업확인서_선별결과.xlsx"
+FINAL_RESULT_FILE = "작업확인서_처리결과.xlsx"
+
+# 파이프라인 방식: "memory"(단계 간 DataFrame 직접 전달), "excel"(단계마다 중간 엑셀 저장 후 재로딩),
+#                 "pipelined"(그룹웨어 수집과 HRMS 반영을 브라우저 세션 2개로 동시에 진행)
+PIPELINE_MODE = "memory"
+# pipelined 방식에서 수집 → 반영 대기열에 쌓아 둘 최대 문서 수 (가득 차면 수집 세션이 대기)
+PIPELINE_QUEUE_SIZE = 5
+# memory 방식에서도 중간 결과 엑셀을 남길지 여부 (백그라운드 저장)
+SAVE_INTERMEDIATE_FILES = True
+# 엑셀 저장 방식: "stream"(xlsxwriter constant_memory로 행 단위 기록), "pandas"(기존 to_excel)
+EXCEL_IO_MODE = "stream"
+
+# 처리 기록(ledger) 파일: 문서 수집/사전검사/HRMS 반영 상태를 남겨 --resume 실행 시 이어서 처리
+LEDGER_FILE = "작업확인서_처리기록.sqlite3"
+
+# chromedriver 경로 캐시 파일 (있으면 webdriver_manager 확인을 건너뜀)
+CHROMEDRIVER_CACHE_FILE = "chromedriver_path.txt"
+
+# 비대화식 실행용 로그인 정보: 환경변수 → keyring(서비스명, 사원번호 기준) 순으로 조회
+CREDENTIAL_ENV = {"username": "RPA_USERNAME", "gw_password": "RPA_GW_PASSWORD", "hrms_password": "RPA_HRMS_PASSWORD"}
+KEYRING_SERVICE = "rpa-work-confirmation"
+
+# 종료 코드
+EXIT_OK = 0            # 전체 성공
+EXIT_ROWS_FAILED = 1   # 처리는 끝났지만 반영 실패 행 있음
+EXIT_CONFIG_ERROR = 2  # 로그인 정보/설정 누락
+EXIT_LOGIN_FAILED = 3  # 그룹웨어/HRMS 로그인 실패
+EXIT_ERROR = 4         # 그 외 예외로 중단
 
 #휴일근무, 시간외근무 패턴 로딩
 try:
-    with open("patterns.json", "r", encoding="utf-8") as f:
+    with open(PATTERNS_FILE, "r", encoding="utf-8") as f:
         pattern_data = json.load(f)
 
     holidaywork_patterns = pattern_data["holidaywork_patterns"]
@@ -32,12 +102,106 @@ except Exception as e:
 # 공통 유틸
 # ──────────────────────────────────────────────────────────────
 
+# 시각 변환 실패/공란을 나타내는 분 값 (정상 값은 자정 기준 0~1439분)
+MISSING_MINUTES = -1
+
+# "HH:MM" → 자정 기준 분 (하루 1440개를 미리 계산해 strptime 없이 조회)
+_HHMM_MINUTES = {f"{h:02d}:{m:02d}": h * 60 + m for h in range(24) for m in range(60)}
+_TIME_TEXT = re.compile(r"(\d{1,2}):(\d{1,2})(?::\d{1,2}(?:\.\d+)?)?")
+
+@functools.lru_cache(maxsize=4096)
+def _text_to_minutes(text):
+    text = text.strip()
+    minutes = _HHMM_MINUTES.get(text)
+    if minutes is not None:
+        return minutes
+    # "7:00", "07:00:00" 같은 변형
+    match = _TIME_TEXT.fullmatch(text)
+    if match and int(match[1]) < 24 and int(match[2]) < 60:
+        return int(match[1]) * 60 + int(match[2])
+    return MISSING_MINUTES
+
+def time_to_minutes(value):
+    """
+    시각 값을 자정 기준 분(0~1439)으로 변환, 변환할 수 없으면 MISSING_MINUTES(-1).
+    - 문자열: "HH:MM", "H:MM", "HH:MM:SS" (앞뒤 공백 무시, 초는 버림)
+    - datetime.time / datetime: 시·분
+    - 실수: 엑셀 시각 값(하루=1.0 중 0 이상 1 미만, 초 단위로 반올림한 뒤 초는 버림)
+    - 공란/NaN/정수/1 이상·음수 실수(날짜가 붙은 값, 24:00)/그 외 형식: -1
+    """
+    if isinstance(value, str):
+        return _text_to_minutes(value)
+    if isinstance(value, (dt_time, datetime)) and not pd.isna(value):
+        return value.hour * 60 + value.minute
+    if isinstance(value, (float, np.floating)) and 0 <= value < 1:
+        # 0.6527...(15:40)처럼 딱 떨어지지 않는 값은 초 단위로 맞춘 뒤 분으로 (23:59:59.9 → 23:59)
+        return min(int(round(float(value) * 86400)) // 60, 1439)
+    return MISSING_MINUTES
+
 #문자->시간 변환함수
 def str_to_time(tstr):
-    try:
-        return datetime.strptime(tstr.strip(), "%H:%M").time()
-    except:
-        return None
+    minutes = time_to_minutes(tstr)
+    return None if minutes == MISSING_MINUTES else dt_time(minutes // 60, minutes % 60)
+
+# 구분(B열) -> patterns.json 키
+PATTERN_GROUPS = {
+    "휴일근무": "holidaywork_patterns",
+    "시간외근무": "overtime_patterns",
+}
+
+# 예외패턴 기준시각 (자정 기준 분, 행마다 다시 파싱하지 않도록 미리 변환)
+SPECIAL_START_TIME = time_to_minutes("00:20")
+SPECIAL_OVERTIME_END_TIMES = (time_to_minutes("01:20"), time_to_minutes("02:20"))
+SPECIAL_OVERTIME_GOTO_LIMIT = time_to_minutes("15:40")
+SPECIAL_HOLIDAY_GOTO_FROM = time_to_minutes("23:00")
+
+# 사전검사 방식: "vector"(일괄 판정), "row"(행 단위), "verify"(두 방식 대조), "parallel"(여러 프로세스로 나눠 판정),
+#             "rules"(패턴 목록 대신 duration_rules 구간 계산으로 판정)
+PRECHECK_MODE = "vector"
+
+# parallel 방식 설정: 작업 프로세스 수 / 프로세스마다 나눠 줄 묶음 수 / 이보다 적은 행은 나누지 않음 / 각 묶음의 판정 방식
+PRECHECK_WORKERS = os.cpu_count() or 1
+PRECHECK_CHUNKS_PER_WORKER = 4
+PRECHECK_PARALLEL_MIN_ROWS = 20000
+PRECHECK_PARALLEL_ENGINE = "vector"
+
+# 사전검사 예외 대상자
+PRECHECK_EXCEPTION_NAMES = ["장태근", "김규환", "이법훈", "배종태", "천국식", "손성호"]
+
+def compile_patterns(pattern_data):
+    """
+    patterns.json 내용을 한 번만 파싱해 조회용 인덱스로 변환 (시작/종료는 자정 기준 분).
+    - groups: 구분별 전체 패턴 목록 (원래 순서 유지, 실패사유 산출용)
+    - index : (구분, 시작, 종료) -> 해당 패턴 목록 (원래 순서 유지)
+    - rules : duration_rules가 있으면 compile_duration_rules 결과 (rules 방식), 없으면 None
+    """
+    groups = {}
+    index = {}
+    for kind, key in PATTERN_GROUPS.items():
+        compiled = []
+        for order, pattern in enumerate(pattern_data[key]):
+            entry = {
+                "order": order,
+                "start": time_to_minutes(pattern["start"]),
+                "end": time_to_minutes(pattern["end"]),
+                "work_times": frozenset(pattern["work_times"]),
+                "duration": pattern["duration"],
+            }
+            compiled.append(entry)
+            index.setdefault((kind, entry["start"], entry["end"]), []).append(entry)
+        groups[kind] = compiled
+    rules = pattern_data.get("duration_rules")
+    return {"groups": groups, "index": index, "rules": compile_duration_rules(rules) if rules else None}
+
+_pattern_index_cache = {}
+
+def load_pattern_index(json_path):
+    """patterns.json을 읽어 컴파일하고, 파일이 바뀌지 않았으면 캐시된 인덱스를 재사용."""
+    cache_key = (os.path.abspath(json_path), os.path.getmtime(json_path))
+    if cache_key not in _pattern_index_cache:
+        with open(json_path, "r", encoding="utf-8") as f:
+            _pattern_index_cache[cache_key] = compile_patterns(json.load(f))
+    return _pattern_index_cache[cache_key]
 
 # ✅ duration key <-> (엑셀컬럼명, HRMS savename) 매핑
 DURATION_MAPPING = {
@@ -56,22 +220,133 @@ DURATION_MAPPING = {
 # ──────────────────────────────────────────────────────────────
 # 로그 설정
 # ──────────────────────────────────────────────────────────────
+# 로그 기록 대기열 크기 (가득 차면 print가 잠시 대기) / 파일에 한 번에 쓰는 최대 항목 수
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 500
+
+def log_records_path(log_path):
+    # 사람용 로그(.txt) 옆에 두는 구조화 기록(JSONL) 경로
+    return os.path.splitext(log_path)[0] + ".jsonl"
+
 class DualLogger:
-    def __init__(self, file_path):
+    """
+    콘솔에는 바로 출력하고, 로그 파일 기록은 백그라운드 스레드가 대기열에서 모아 한 번에 씀.
+    출력한 각 줄과 log_record()로 남긴 구조화 기록(단계, 문서번호, 사번, 소요시간)은
+    로그 파일 옆 JSONL 파일에도 기록됨. flush()는 대기열이 모두 기록될 때까지 기다리고,
+    move_to()는 두 파일을 닫고 옮긴 뒤 이어서 기록하며, 프로그램 종료 시(atexit) 자동으로 close()됨.
+    """
+    def __init__(self, file_path, records_path=None):
         self.terminal = sys.__stdout__  # 원래 cmd 출력
         self.log = open(file_path, 'w', encoding='utf-8')
+        self.records = open(records_path or log_records_path(file_path), 'w', encoding='utf-8')
+        self.stage = ""
+        self.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self.file_lock = threading.Lock()  # 기록 스레드와 move_to의 파일 교체를 구분
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, name="log-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
 
     def write(self, message):
         self.terminal.write(message)
-        self.log.write(message)
+        if not self.closed:
+            self.queue.put(("text", time.time(), self.stage, message))
+
+    def record(self, stage, **fields):
+        # 구조화 기록 1건 (예: record("hrms_apply", 사번=..., duration=...))
+        if not self.closed:
+            self.queue.put(("record", time.time(), stage, fields))
+
+    def _write_loop(self):
+        partial = ""  # 줄바꿈 전까지 모인 출력 (print는 내용과 "\n"을 나눠 씀)
+        while True:
+            items = [self.queue.get()]
+            while len(items) < LOG_BATCH_SIZE:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            text, records, stop = [], [], False
+            for item in items:
+                if item is None:
+                    stop = True
+                    continue
+                kind, ts, stage, payload = item
+                stamp = datetime.fromtimestamp(ts).isoformat(timespec="milliseconds")
+                if kind == "text":
+                    text.append(payload)
+                    *lines, partial = (partial + payload).split("\n")
+                    records += [{"ts": stamp, "stage": stage, "message": line} for line in lines if line.strip()]
+                else:
+                    records.append({"ts": stamp, "stage": stage, **payload})
+
+            if stop and partial.strip():
+                records.append({"ts": datetime.now().isoformat(timespec="milliseconds"), "stage": self.stage, "message": partial})
+            try:
+                with self.file_lock:
+                    self.log.write("".join(text))
+                    self.records.writelines(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+                    self.log.flush()
+                    self.records.flush()
+            except Exception as e:
+                self.terminal.write(f"⚠️ 로그 파일 기록 실패: {e}\n")
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+            if stop:
+                return
 
     def flush(self):
-        pass  # for compatibility
+        # 대기열에 쌓인 기록이 파일에 모두 쓰일 때까지 대기 (로그 파일을 다시 읽기 전에 호출)
+        self.terminal.flush()
+        if not self.closed:
+            self.queue.join()
 
+    def move_to(self, folder):
+        """
+        로그/JSONL 파일을 folder로 옮기고 옮긴 파일에 이어서 기록. 옮긴 경로 목록 반환.
+        Windows는 열려 있는 파일을 옮길 수 없으므로 대기열을 비우고 닫은 뒤 옮겨서 다시 엶.
+        """
+        self.flush()
+        moved = []
+        with self.file_lock:
+            for name in ("log", "records"):
+                handle = getattr(self, name)
+                handle.close()
+                target = os.path.join(folder, os.path.basename(handle.name))
+                shutil.move(handle.name, target)
+                setattr(self, name, open(target, "a", encoding="utf-8"))
+                moved.append(target)
+        return moved
+
+    def close(self):
+        if self.closed:
+            return
+        self.queue.put(None)
+        self.closed = True
+        self.writer.join()
+        self.log.close()
+        self.records.close()
+
+def set_log_stage(stage):
+    # 이후 출력되는 줄의 구조화 기록에 붙일 단계 이름
+    if isinstance(sys.stdout, DualLogger):
+        sys.stdout.stage = stage
+
+def log_record(stage, **fields):
+    # 구조화 기록 남기기 (DualLogger를 쓰지 않는 실행(벤치마크 등)에서는 무시)
+    if isinstance(sys.stdout, DualLogger):
+        sys.stdout.record(stage, **fields)
+
+def load_log_records(log_path):
+    """로그 파일 옆 JSONL 구조화 기록을 DataFrame으로 한 번에 읽음 (없으면 None)."""
+    sys.stdout.flush()
+    records_path = log_records_path(log_path)
+    if not os.path.exists(records_path) or os.path.getsize(records_path) == 0:
+        return None
+    return pd.read_json(records_path, lines=True, dtype=False)
 
-# 로그 경로 설정
-log_file = f"작업확인서_자동처리로그_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-sys.stdout = sys.stderr = DualLogger(log_file)
 
 #엑셀에 로그 추가
 def append_log_to_excel(log_path, excel_path, sheet_name="로그기록"):
@@ -82,23 +357,220 @@ def append_log_to_excel(log_path, excel_path, sheet_name="로그기록"):
         wb = openpyxl.Workbook()
         wb.remove(wb.active)
 
-    # 로그파일 읽기
-    with open(log_path, "r", encoding="utf-8") as f:
-        log_lines = f.readlines()
-
     # 시트 추가
     if sheet_name in wb.sheetnames:
         del wb[sheet_name]  # 기존 로그 시트 제거
     ws = wb.create_sheet(title=sheet_name)
 
-    # 로그 줄별로 기록
-    for i, line in enumerate(log_lines, start=1):
-        ws.cell(row=i, column=1, value=line.strip())
+    # 구조화 기록(JSONL)이 있으면 표로, 없으면 로그 줄별로 기록
+    header, rows = log_sheet_rows(log_path)
+    if header is not None:
+        ws.append(header)
+    for row in rows:
+        ws.append([_cell_value(value) for value in row])
 
     # 저장
     wb.save(excel_path)
     print(f"📄 로그 시트 추가 완료: {excel_path} > [{sheet_name}]")
 
+# ──────────────────────────────────────────────────────────────
+# 실행 계측 (단계/문서/행별 소요시간, WebDriver 명령 수, 대기/sleep)
+# ──────────────────────────────────────────────────────────────
+METRICS_FILE = "작업확인서_실행계측.xlsx"
+METRIC_KEYS = ("commands", "waits", "wait_seconds", "sleeps", "sleep_seconds")
+
+class RunMetrics:
+    """
+    단계(stage)별 합계와 문서/행(item)별 측정값을 모음.
+    - count(): WebDriver 명령/대기/sleep 횟수·시간 누적 (전체 + 스레드별)
+    - stage(): 이전 단계를 끝내고 새 단계 시작 (로그 단계 이름도 변경)
+    - probe()/record_item(): 문서 1건, 행 1건 단위 측정 (병렬 작업자도 자기 스레드 값만 집계)
+    - write_report(): 단계별 합계와 항목별 p50/p95 요약을 결과 폴더에 저장
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.totals = dict.fromkeys(METRIC_KEYS, 0)
+        self.stages = []
+        self.items = []
+        self.current = None  # (단계 이름, 시작 시각, 시작 시점 합계)
+
+    def _thread_counts(self):
+        if not hasattr(self.local, "counts"):
+            self.local.counts = dict.fromkeys(METRIC_KEYS, 0)
+        return self.local.counts
+
+    def count(self, key, amount=1):
+        counts = self._thread_counts()
+        counts[key] += amount
+        with self.lock:
+            self.totals[key] += amount
+
+    def stage(self, name):
+        self.end_stage()
+        with self.lock:
+            self.current = (name, time.perf_counter(), dict(self.totals))
+        set_log_stage(name)
+
+    def end_stage(self):
+        if self.current is None:
+            return
+        name, started, before = self.current
+        with self.lock:
+            self.stages.append({
+                "stage": name, "seconds": time.perf_counter() - started,
+                **{key: self.totals[key] - before[key] for key in METRIC_KEYS},
+            })
+            self.current = None
+
+    def probe(self):
+        return time.perf_counter(), dict(self._thread_counts())
+
+    def record_item(self, kind, key, probe, **fields):
+        """probe() 이후의 소요시간/명령 수/대기를 항목 1건으로 기록하고 구조화 로그에도 남김."""
+        started, before = probe
+        counts = self._thread_counts()
+        item = {
+            "kind": kind, "key": key, "seconds": time.perf_counter() - started,
+            **{name: counts[name] - before[name] for name in METRIC_KEYS},
+        }
+        with self.lock:
+            self.items.append(item)
+        log_record(kind, key=key, duration=round(item["seconds"], 3), commands=item["commands"], **fields)
+
+    def summary(self):
+        # (단계별 합계, 항목 종류별 요약) DataFrame
+        stages = pd.DataFrame(self.stages, columns=["stage", "seconds", *METRIC_KEYS])
+        if len(stages):
+            stages = stages.groupby("stage", sort=False).sum().reset_index()
+            stages["share"] = (stages["seconds"] / stages["seconds"].sum()).round(3)
+
+        items = pd.DataFrame(self.items, columns=["kind", "key", "seconds", *METRIC_KEYS])
+        rows = []
+        for kind, group in items.groupby("kind", sort=False):
+            row = {"kind": kind, "count": len(group), "total_seconds": group["seconds"].sum()}
+            for column in ("seconds", "commands", "wait_seconds"):
+                row[f"{column}_p50"] = group[column].quantile(0.5)
+                row[f"{column}_p95"] = group[column].quantile(0.95)
+            row["seconds_max"] = group["seconds"].max()
+            rows.append(row)
+        return stages, pd.DataFrame(rows), items
+
+    def write_report(self, folder):
+        self.end_stage()
+        stages, item_summary, items = self.summary()
+        if len(stages):
+            print("\n📊 단계별 소요시간")
+            print(stages[["stage", "seconds", "share", "commands", "waits", "wait_seconds"]].round(2).to_string(index=False))
+        if len(item_summary):
+            print("\n📊 문서/행별 소요시간 (p50/p95)")
+            print(item_summary.round(2).to_string(index=False))
+
+        path = os.path.join(folder, METRICS_FILE)
+        try:
+            write_sheets(path, [
+                ("단계별", *frame_rows(stages.round(3))),
+                ("항목별요약", *frame_rows(item_summary.round(3))),
+                ("항목별상세", *frame_rows(items.round(3))),
+            ])
+            print(f"✅ 실행 계측 저장 완료: {path}")
+        except Exception as e:
+            print(f"❌ 실행 계측 저장 실패: {e}")
+
+metrics = RunMetrics()
+
+def sleep(seconds):
+    # 고정 대기 (횟수/시간을 실행 계측에 기록)
+    metrics.count("sleeps")
+    metrics.count("sleep_seconds", seconds)
+    time.sleep(seconds)
+
+def instrument_driver(drv):
+    # WebDriver 명령(요소 조회, 클릭, 스크립트 실행, 대기 중 조회 포함) 수를 세도록 execute를 감쌈
+    execute = drv.execute
+
+    def counted_execute(driver_command, params=None):
+        metrics.count("commands")
+        return execute(driver_command, params)
+
+    drv.execute = counted_execute
+    return drv
+
+# ──────────────────────────────────────────────────────────────
+# 엑셀 입출력 (스트리밍 저장: 통합 문서를 메모리에 쌓지 않고 행 단위 기록)
+# ──────────────────────────────────────────────────────────────
+def _cell_value(value):
+    # 셀에 쓸 값: 빈 값(NaN/NaT/None/"") → 빈 셀, numpy 스칼라 → 파이썬 값, Timestamp → datetime, time → 문자열
+    if value is None or (isinstance(value, str) and value == ""):
+        return None
+    if not isinstance(value, (str, list, tuple)) and pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, dt_time):
+        return str(value)  # pandas to_excel과 같이 "HH:MM:SS" 문자열로 기록
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def frame_rows(df):
+    # DataFrame → (헤더, 행 반복자). 행은 필요할 때 하나씩 만듦
+    return list(df.columns), df.itertuples(index=False, name=None)
+
+def write_sheets(path, sheets):
+    """
+    (시트명, 헤더, 행 반복자) 목록을 xlsxwriter constant_memory 모드로 행 단위 저장.
+    기록한 행은 바로 임시 파일로 내보내므로 메모리 사용량이 전체 행 수에 비례하지 않음.
+    """
+    workbook = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",  # pandas to_excel과 같은 날짜 표시
+    })
+    try:
+        for sheet_name, header, rows in sheets:
+            ws = workbook.add_worksheet(sheet_name[:31])
+            row_no = 0
+            if header is not None:
+                ws.write_row(row_no, 0, [_cell_value(value) for value in header])
+                row_no += 1
+            for row in rows:
+                ws.write_row(row_no, 0, [_cell_value(value) for value in row])
+                row_no += 1
+    finally:
+        workbook.close()
+
+def read_log_lines(log_path):
+    # 로그 파일을 줄 단위로 읽어 로그 시트 행으로 반환 (기록 중인 로그는 먼저 flush)
+    sys.stdout.flush()
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield [line.strip()]
+
+def log_sheet_rows(log_path):
+    # 로그 시트 내용: 구조화 기록(JSONL)을 한 번에 읽은 표, 없으면 텍스트 로그 줄
+    records = load_log_records(log_path)
+    if records is None:
+        return None, read_log_lines(log_path)
+    return frame_rows(records)
+
+def write_frame(df, path, sheet_name="Sheet1", log_path=None, log_sheet_name="로그기록"):
+    """
+    DataFrame을 엑셀로 저장 (EXCEL_IO_MODE). log_path가 있으면 로그 시트를 같은 통합 문서에 함께 기록해
+    저장된 파일을 다시 여는 append_log_to_excel 과정을 생략함.
+    """
+    if EXCEL_IO_MODE != "stream":
+        df.to_excel(path, sheet_name=sheet_name, index=False)
+        if log_path:
+            append_log_to_excel(log_path, path, log_sheet_name)
+        return
+
+    sheets = [(sheet_name, *frame_rows(df))]
+    if log_path:
+        sheets.append((log_sheet_name, *log_sheet_rows(log_path)))
+    write_sheets(path, sheets)
+    if log_path:
+        print(f"📄 로그 시트 추가 완료: {path} > [{log_sheet_name}]")
+
 # ──────────────────────────────────────────────────────────────
 # 로그인 정보 입력받기
 # ──────────────────────────────────────────────────────────────
@@ -113,7 +585,7 @@ def get_login_info():
         sys.__stdout__.write("그룹웨어 비밀번호를 입력하세요: ")
         sys.__stdout__.flush()
         GW_PASSWORD = input().strip()
-        time.sleep(0.1)
+        sleep(0.1)
         sys.__stdout__.write("통합인사시스템 비밀번호를 입력하세요: ")
         sys.__stdout__.flush()
         HRMS_PASSWORD = input().strip()
@@ -136,69 +608,412 @@ def get_login_info():
             elif confirm == "0":
                 print("🔁 다시 입력해주세요.\n")
                 break
-                time.sleep(1)
+                sleep(1)
             else:
                 print("⚠️ 잘못된 입력입니다. 1 또는 0만 입력 가능합니다.")
-                time.sleep(1)
+                sleep(1)
+
+def load_credentials(credentials_file=None):
+    """
+    비대화식 실행용 로그인 정보를 파일(JSON) → 환경변수 → keyring 순으로 채움.
+    파일 형식: {"username": ..., "gw_password": ..., "hrms_password": ...}
+    세 값이 모두 있으면 True (USERNAME, GW_PASSWORD, HRMS_PASSWORD 설정).
+    """
+    global USERNAME, GW_PASSWORD, HRMS_PASSWORD
+
+    values = {}
+    if credentials_file:
+        try:
+            with open(credentials_file, "r", encoding="utf-8") as f:
+                values = {k: str(v) for k, v in json.load(f).items() if k in CREDENTIAL_ENV and v}
+        except Exception as e:
+            print(f"❌ 로그인 정보 파일 읽기 실패: {credentials_file} - {e}")
+            return False
+
+    for key, env_name in CREDENTIAL_ENV.items():
+        if not values.get(key) and os.environ.get(env_name):
+            values[key] = os.environ[env_name]
+
+    if keyring is not None and values.get("username"):
+        for key in ("gw_password", "hrms_password"):
+            if not values.get(key):
+                try:
+                    values[key] = keyring.get_password(KEYRING_SERVICE, f"{values['username']}:{key}")
+                except Exception as e:
+                    print(f"⚠️ keyring 조회 실패: {key} - {e}")
+
+    missing = [key for key in CREDENTIAL_ENV if not values.get(key)]
+    if missing:
+        print(f"⚠️ 로그인 정보 누락: {', '.join(missing)}")
+        return False
+
+    USERNAME, GW_PASSWORD, HRMS_PASSWORD = values["username"], values["gw_password"], values["hrms_password"]
+    print(f"🔐 로그인 정보 불러옴: 사원번호 {USERNAME}")
+    return True
+
+
+# ──────────────────────────────────────────────────────────────
+# 브라우저 세션
+# ──────────────────────────────────────────────────────────────
+_chromedriver_path = None
+_chromedriver_source = None  # "지정" / "캐시" / "webdriver_manager"
+
+def resolve_chromedriver(pinned_path=None):
+    """
+    chromedriver 경로 결정: 지정 경로(--chromedriver, RPA_CHROMEDRIVER) → 캐시 파일 → webdriver_manager.
+    webdriver_manager로 받은 경로는 캐시 파일에 기록해 다음 실행(warm start)부터 바로 사용.
+    """
+    global _chromedriver_path, _chromedriver_source
+    pinned_path = pinned_path or os.environ.get("RPA_CHROMEDRIVER")
+
+    if pinned_path:
+        _chromedriver_path, _chromedriver_source = pinned_path, "지정"
+    elif os.path.exists(CHROMEDRIVER_CACHE_FILE):
+        with open(CHROMEDRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            cached = f.read().strip()
+        if cached and os.path.exists(cached):
+            _chromedriver_path, _chromedriver_source = cached, "캐시"
+
+    if _chromedriver_path is None:
+        _chromedriver_path, _chromedriver_source = ChromeDriverManager().install(), "webdriver_manager"
+        with open(CHROMEDRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+            f.write(_chromedriver_path)
+
+    return _chromedriver_path
+
+def create_driver(headless=False):
+    # chromedriver 경로는 한 번만 확인해 이후 세션(병렬 작업자 포함)에서 재사용
+    if _chromedriver_path is None:
+        resolve_chromedriver()
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    try:
+        return instrument_driver(webdriver.Chrome(service=Service(_chromedriver_path), options=options))
+    except Exception as e:
+        if _chromedriver_source != "캐시":
+            raise
+        # Chrome 업데이트 등으로 캐시된 chromedriver가 맞지 않으면 캐시를 버리고 다시 확인
+        print(f"⚠️ 캐시된 chromedriver로 시작 실패 → 다시 확인: {e}")
+        os.remove(CHROMEDRIVER_CACHE_FILE)
+        _reset_chromedriver()
+        return create_driver(headless)
+
+def _reset_chromedriver():
+    global _chromedriver_path, _chromedriver_source
+    _chromedriver_path = _chromedriver_source = None
+
+# ──────────────────────────────────────────────────────────────
+# 조건 대기 (고정 sleep 대신 화면 상태를 확인하며 필요한 만큼만 대기)
+# ──────────────────────────────────────────────────────────────
+# 대기 이름별 제한시간(초). 없는 이름은 "default" 사용
+WAIT_TIMEOUTS = {
+    "default": 10,
+    "alert": 5,
+    "receipt": 5,
+    "list_button": 5,
+    "list_refresh": 10,
+    "document_ready": 10,
+    "ibsheet_idle": 10,
+    "hrms_sheet_row": 3,
+}
+WAIT_POLL_SECONDS = 0.1
+
+# 대기 기록: (대기 이름, 소요초, 성공여부)
+wait_records = []
+
+def wait_for(condition, name, timeout=None, drv=None, required=True):
+    """
+    condition(driver)이 참이 될 때까지 대기하고 실제 소요시간을 wait_records에 기록.
+    required=False면 제한시간 초과 시 예외 대신 False 반환.
+    """
+    drv = drv or driver
+    if timeout is None:
+        timeout = WAIT_TIMEOUTS.get(name, WAIT_TIMEOUTS["default"])
+
+    started = time.perf_counter()
+    succeeded = False
+    try:
+        result = WebDriverWait(drv, timeout, poll_frequency=WAIT_POLL_SECONDS).until(condition)
+        succeeded = True
+        return result
+    except TimeoutException:
+        if required:
+            raise
+        return False
+    finally:
+        elapsed = time.perf_counter() - started
+        wait_records.append((name, elapsed, succeeded))
+        metrics.count("waits")
+        metrics.count("wait_seconds", elapsed)
+
+def document_ready(d):
+    return d.execute_script("return document.readyState") == "complete"
+
+def no_alert_present(d):
+    return not EC.alert_is_present()(d)
+
+def element_absent(locator):
+    return lambda d: not d.find_elements(*locator)
+
+def list_refreshed(old_element):
+    # 이전 목록 요소가 화면에서 사라지고(staleness) 새 문서가 로드 완료된 상태
+    def condition(d):
+        return (old_element is None or EC.staleness_of(old_element)(d)) and document_ready(d)
+    return condition
+
+def ibsheet_idle(d):
+    # IBSheet 로드 완료 + 변경(dirty) 행 없음
+    return d.execute_script(
+        "return typeof mySheet !== 'undefined' && "
+        "!(typeof mySheet.IsDataModified === 'function' && mySheet.IsDataModified());"
+    )
+
+def js_function_ready(function_name):
+    return lambda d: d.execute_script(f"return typeof window['{function_name}'] === 'function';")
+
+def report_wait_stats():
+    # 대기 이름별 횟수/합계/평균/최대/제한시간 초과 건수 출력
+    if not wait_records:
+        return
+    stats = pd.DataFrame(wait_records, columns=["대기", "소요초", "성공"])
+    summary = stats.groupby("대기")["소요초"].agg(["count", "sum", "mean", "max"])
+    summary["초과"] = stats[~stats["성공"]].groupby("대기").size()
+    summary = summary.fillna({"초과": 0}).astype({"초과": int}).sort_values("sum", ascending=False)
+    print("\n⏱️ 대기 시간 요약 (초)")
+    print(summary.round(2).to_string())
+
+# ──────────────────────────────────────────────────────────────
+# 처리 기록 (중단 후 --resume 재실행 시 완료된 작업 건너뛰기)
+# ──────────────────────────────────────────────────────────────
+ROW_KEY_COLUMNS = ["사번", "근무일자", "구분"]
+
+def row_key(row):
+    # 신청 1건 식별자 (사번, 근무일자, 구분)
+    return tuple("" if pd.isna(row.get(col)) else str(row.get(col)).strip() for col in ROW_KEY_COLUMNS)
+
+class Ledger:
+    """
+    문서번호별 수집 상태(원본 표 포함)와 (사번, 근무일자, 구분)별 사전검사/반영 상태를 SQLite에 기록.
+    - documents : 수집한 문서 표(JSON), 모든 행이 끝나면 done=1
+    - attendance: state = prechecked → applied/failed, 사전검사 결과(작업여부)
+    - meta      : 실행 간 설정값 (증분 검색 watermark 등, JSON)
+    수집 작업자 스레드에서도 기록하므로 연결 하나를 lock으로 보호함.
+    """
+    def __init__(self, path=LEDGER_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_number   TEXT PRIMARY KEY,
+                table_json   TEXT NOT NULL,
+                done         INTEGER NOT NULL DEFAULT 0,
+                collected_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS attendance (
+                emp_no     TEXT NOT NULL,
+                work_date  TEXT NOT NULL,
+                kind       TEXT NOT NULL,
+                doc_number TEXT,
+                precheck   TEXT,
+                state      TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (emp_no, work_date, kind)
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key        TEXT PRIMARY KEY,
+                value      TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+        """)
+
+    def _execute(self, sql, params=()):
+        with self.lock, self.conn:
+            return self.conn.executemany(sql, params) if isinstance(params, list) else self.conn.execute(sql, params)
+
+    def record_document(self, doc_number, df):
+        # 수집한 문서 표를 헤더 포함 행 목록(JSON)으로 저장 (table_rows_to_dataframe으로 복원)
+        rows = [list(df.columns)] + df.to_numpy(dtype=object).tolist()
+        self._execute(
+            "INSERT OR REPLACE INTO documents (doc_number, table_json, done, collected_at) VALUES (?, ?, 0, ?)",
+            (doc_number, json.dumps(rows, ensure_ascii=False, default=str), datetime.now().isoformat(timespec="seconds")),
+        )
+
+    def collected_doc_numbers(self):
+        with self.lock:
+            return {doc_number for (doc_number,) in self.conn.execute("SELECT doc_number FROM documents")}
+
+    def pending_documents(self):
+        """수집은 됐지만 아직 끝나지 않은 문서의 (표 목록, 문서번호 목록) - 수집 순서대로."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT doc_number, table_json FROM documents WHERE done = 0 ORDER BY collected_at, rowid"
+            ).fetchall()
+        return [table_rows_to_dataframe(json.loads(table_json)) for _, table_json in rows], [doc for doc, _ in rows]
+
+    def record_prechecked(self, df):
+        # 사전검사 결과 기록 (이미 반영된 건은 상태를 되돌리지 않음)
+        now = datetime.now().isoformat(timespec="seconds")
+        self._execute("""
+            INSERT INTO attendance (emp_no, work_date, kind, doc_number, precheck, state, updated_at)
+            VALUES (?, ?, ?, ?, ?, 'prechecked', ?)
+            ON CONFLICT (emp_no, work_date, kind) DO UPDATE SET
+                doc_number = excluded.doc_number, precheck = excluded.precheck, updated_at = excluded.updated_at,
+                state = CASE WHEN state = 'applied' THEN state ELSE 'prechecked' END
+        """, [row_key(row) + (row.get("문서번호"), row.get("작업여부"), now) for _, row in df.iterrows()])
+
+    def record_applied(self, df, indices):
+        # '완료여부'가 기재된 행의 반영 결과 기록 (성공/성공(변경없음) → applied, 실패 → failed)
+        now = datetime.now().isoformat(timespec="seconds")
+        params = [
+            ("applied" if df.at[idx, "완료여부"] != "실패" else "failed", now) + row_key(df.loc[idx])
+            for idx in indices if df.at[idx, "완료여부"] in ("성공", HRMS_UNCHANGED_RESULT, "실패")
+        ]
+        self._execute(
+            "UPDATE attendance SET state = ?, updated_at = ? WHERE emp_no = ? AND work_date = ? AND kind = ?", params
+        )
+
+    def applied_keys(self):
+        with self.lock:
+            return set(self.conn.execute("SELECT emp_no, work_date, kind FROM attendance WHERE state = 'applied'"))
+
+    def finish_documents(self, df):
+        # 반영 대상 행이 모두 성공했거나 대상이 아닌(작업불가능) 문서는 done 처리
+        if df.empty:
+            return
+        finished = df["작업여부"].ne("작업가능") | df["완료여부"].astype(str).str.startswith("성공")
+        doc_numbers = finished.groupby(df["문서번호"]).all()
+        self._execute(
+            "UPDATE documents SET done = 1 WHERE doc_number = ?",
+            [(doc_number,) for doc_number in doc_numbers[doc_numbers].index],
+        )
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        self._execute(
+            "INSERT OR REPLACE INTO meta (key, value, updated_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), datetime.now().isoformat(timespec="seconds")),
+        )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
 
+# main()에서 열고, None이면 기록하지 않음
+ledger = None
+
+# ──────────────────────────────────────────────────────────────
+# 증분 검색 (기안일 기간 watermark)
+# ──────────────────────────────────────────────────────────────
+WATERMARK_KEY = "search_watermark"
+
+# run_pipeline에서 설정하는 이번 실행의 기안일 검색 기간 (시작, 종료) 문자열, None이면 전체 검색
+search_date_range = None
+
+# 이번 실행에서 수집/접수에 실패한 문서번호 (모르면 None). 하나라도 있으면 watermark를 올리지 않음
+collection_errors = []
+
+def note_collection_error(doc_number=None):
+    collection_errors.append(doc_number)
+
+def load_search_date_range(watermark):
+    """
+    watermark({"date": 직전 성공 실행 시작일, ...}) → (시작일, 오늘) 검색 기간. 없으면 None(전체 검색).
+    결재가 늦게 수신함에 도착한 문서를 놓치지 않도록 WATERMARK_OVERLAP_DAYS일 앞에서부터 검색함.
+    """
+    if not watermark or not watermark.get("date"):
+        return None
+    since = datetime.strptime(watermark["date"], "%Y-%m-%d") - timedelta(days=WATERMARK_OVERLAP_DAYS)
+    return since.strftime(GW_SEARCH_DATE_FORMAT), datetime.now().strftime(GW_SEARCH_DATE_FORMAT)
+
+def make_watermark(run_started, doc_numbers, previous=None):
+    """
+    이번 실행의 watermark. 실행 시작 시점까지 기안된 문서는 이번 검색에 모두 보였으므로 시작일을 기준일로 기록하고,
+    수집한 문서번호 중 가장 큰 값(직전 값 포함)을 함께 남김.
+    """
+    doc_numbers = list(doc_numbers) + ([previous["doc_number"]] if previous and previous.get("doc_number") else [])
+    return {
+        "date": run_started.strftime("%Y-%m-%d"), "doc_number": max(doc_numbers, default=""),
+        "run_at": run_started.isoformat(timespec="seconds"),
+    }
 
 # ──────────────────────────────────────────────────────────────
 # 그룹웨어 자동화 관련 함수
 # ──────────────────────────────────────────────────────────────
-def login_groupware():
-    driver.get(LOGIN_GW_URL)
-    wait.until(EC.presence_of_element_located((By.ID, "username"))).send_keys(USERNAME)
-    driver.find_element(By.ID, "password").send_keys(GW_PASSWORD)
-    driver.find_element(By.ID, "login_submit").click()
-    wait.until(lambda d: "dashboard" in d.current_url or "home" in d.current_url)
+def login_groupware(drv=None):
+    drv = drv or driver
+    drv.get(LOGIN_GW_URL)
+    wait_for(EC.presence_of_element_located((By.ID, "username")), "gw_login_form", drv=drv).send_keys(USERNAME)
+    drv.find_element(By.ID, "password").send_keys(GW_PASSWORD)
+    drv.find_element(By.ID, "login_submit").click()
+    wait_for(lambda d: "dashboard" in d.current_url or "home" in d.current_url, "gw_login", drv=drv)
     print("✅ 그룹웨어 로그인 완료")
 
-def go_to_received_documents():
-    wait.until(EC.element_to_be_clickable((By.XPATH, "//a[@href='/app/approval']"))).click()
-    wait.until(EC.element_to_be_clickable((By.XPATH, "//a[@data-navi='todoreception']"))).click()
+def go_to_received_documents(drv=None):
+    drv = drv or driver
+    wait_for(EC.element_to_be_clickable((By.XPATH, "//a[@href='/app/approval']")), "approval_menu", drv=drv).click()
+    wait_for(EC.element_to_be_clickable((By.XPATH, "//a[@data-navi='todoreception']")), "approval_menu", drv=drv).click()
     print("✅ '결재 수신 문서' 진입 완료")
 
-def search_work_confirmation():
-    dropdown = Select(wait.until(EC.presence_of_element_located((By.ID, "searchtype"))))
+def search_work_confirmation(drv=None):
+    drv = drv or driver
+    dropdown = Select(wait_for(EC.presence_of_element_located((By.ID, "searchtype")), "search_form", drv=drv))
     dropdown.select_by_value("formName")
-    search_box = driver.find_element(By.ID, "keyword")
+    search_box = drv.find_element(By.ID, "keyword")
     search_box.send_keys("작업 확인서")
-    driver.find_element(By.CLASS_NAME, "btn_search2").click()
-    time.sleep(3)
-    print("✅ '작업확인서' 검색 완료")
 
-def click_receipt_and_confirm():
+    # 증분 검색: 기안일 기간 입력 (입력란이 없으면 생략)
+    if search_date_range:
+        for field_id, value in zip(GW_SEARCH_DATE_FIELDS, search_date_range):
+            drv.execute_script("""
+                var input = document.getElementById(arguments[0]);
+                if (input) { input.value = arguments[1]; input.dispatchEvent(new Event("change")); }
+            """, field_id, value)
+
+    # 검색 전 목록의 첫 문서가 교체(stale)되고 페이지 로드가 끝날 때까지 대기
+    old_documents = drv.find_elements(*DOCUMENT_LINK_LOCATOR)
+    drv.find_element(By.CLASS_NAME, "btn_search2").click()
+    wait_for(list_refreshed(old_documents[0] if old_documents else None), "list_refresh", required=False, drv=drv)
+    print("✅ '작업확인서' 검색 완료" + (f" (기안일 {search_date_range[0]} ~ {search_date_range[1]})" if search_date_range else ""))
+
+def click_receipt_and_confirm(drv=None):
+    drv = drv or driver
     try:
         # "접수" 버튼 존재 확인
-        receipt_btns = driver.find_elements(By.XPATH, "//span[text()='접수']")
+        receipt_btns = drv.find_elements(By.XPATH, "//span[text()='접수']")
         if not receipt_btns:
             # print("ℹ️ 접수 버튼 없음 (이미 접수되었거나 조건 미충족)")
             return
 
         # "접수" 클릭
-        receipt_btn = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//span[text()='접수']"))
+        receipt_btn = wait_for(
+            EC.element_to_be_clickable((By.XPATH, "//span[text()='접수']")), "receipt", drv=drv
         )
         receipt_btn.click()
         # print("📥 접수 버튼 클릭됨")
 
         # "확인" 버튼이 등장하면 접수 성공으로 간주
-        WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.XPATH, "//span[text()='확인']"))
+        wait_for(
+            EC.presence_of_element_located((By.XPATH, "//span[text()='확인']")), "receipt", drv=drv
         )
         # print("✅ 확인 버튼 등장 → 접수 성공으로 간주")
 
         # "확인" 버튼 존재 확인 후 클릭
-        confirm_elements = driver.find_elements(By.XPATH, "//span[text()='확인']")
+        confirm_elements = drv.find_elements(By.XPATH, "//span[text()='확인']")
         if confirm_elements:
-            confirm_btn = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//span[text()='확인']"))
+            confirm_btn = wait_for(
+                EC.element_to_be_clickable((By.XPATH, "//span[text()='확인']")), "receipt", drv=drv
             )
             confirm_btn.click()
             # print("✅ 확인 버튼 클릭 시도")
-            WebDriverWait(driver, 5).until_not(
-                EC.presence_of_element_located((By.XPATH, "//span[text()='확인']"))
-            )
+            wait_for(element_absent((By.XPATH, "//span[text()='확인']")), "receipt", drv=drv)
             # print("✅ 확인 완료됨")
         else:
             # print("ℹ️ 확인 버튼 없음")
@@ -206,31 +1021,28 @@ def click_receipt_and_confirm():
 
     except Exception as e:
         print(f"❌ 접수 또는 확인 단계 실패: {type(e).__name__} - {e}")
+        note_collection_error()
 
-def click_back_to_list():
+def click_back_to_list(drv=None):
+    drv = drv or driver
     for _ in range(5):
         try:
             # 목록 버튼 대기 → XPath만 미리 쓰고, 클릭 직전에 다시 조회
-            WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//span[text()='목록']"))
-            )
+            wait_for(EC.presence_of_element_located((By.XPATH, "//span[text()='목록']")), "list_button", drv=drv)
 
             # 반드시 새로 조회해서 클릭해야 Stale 방지됨
-            list_btn = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//span[text()='목록']"))
-            )
+            list_btn = wait_for(EC.element_to_be_clickable((By.XPATH, "//span[text()='목록']")), "list_button", drv=drv)
             list_btn.click()
-            time.sleep(2)
-            # 문서 목록 페이지 복귀 확인
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//td[@class='subject']/a"))
-            )
+
+            # 문서 화면을 벗어나 목록 페이지 로드가 끝나고 문서 목록이 보일 때까지 대기
+            wait_for(list_refreshed(list_btn), "list_refresh", drv=drv)
+            wait_for(EC.presence_of_element_located(DOCUMENT_LINK_LOCATOR), "list_refresh", drv=drv)
             print("✅ 목록 복귀 완료")
             return True
 
         except StaleElementReferenceException:
+            # 다음 시도에서 목록 버튼이 다시 나타날 때까지 대기함
             print("⚠️ 목록 요소가 사라짐 → 재시도")
-            time.sleep(1)
 
         except Exception as e:
             print(f"❌ 목록 복귀 실패: {type(e).__name__} - {e}")
@@ -246,19 +1058,273 @@ def safe_driver_back(max_retries=5, wait_seconds=2):
             driver.back()
 
             # 문서 목록 페이지의 제목 요소 대기
-            WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//td[@class='subject']/a"))
-            )
+            wait_for(EC.presence_of_element_located(DOCUMENT_LINK_LOCATOR), "list_refresh", timeout=5)
             print("✅ 뒤로가기 성공! 문서 목록 페이지로 복귀함.")
             return True
         except Exception as e:
             print(f"⚠️ 뒤로가기 실패 {attempt}회차 → 재시도 예정")
-            time.sleep(wait_seconds)
+            # 재시도 전 현재 페이지 로드가 끝나기를 최대 wait_seconds초 대기
+            wait_for(document_ready, "document_ready", timeout=wait_seconds, required=False)
 
     print("❌ 최대 재시도 횟수 초과 → 강제 이동 시도 필요")
     return False
 
-def get_work_confirmation_documents():
+# 표 전체를 한 번의 스크립트 호출로 읽음 (find_elements("tr") → find_elements("td") → .text 와 같은 구조)
+TABLE_ROWS_SCRIPT = """
+return Array.from(arguments[0].querySelectorAll('tr')).map(function (tr) {
+    return Array.from(tr.querySelectorAll('td')).map(function (td) { return td.innerText.trim(); });
+});
+"""
+
+# 표 추출 방식: "script"(execute_script 1회), "html"(outerHTML 로컬 파싱), "cells"(셀마다 WebDriver 호출)
+TABLE_EXTRACT_MODE = "script"
+
+class _HtmlNode:
+    __slots__ = ("tag", "attrs", "children")
+
+    def __init__(self, tag, attrs=()):
+        self.tag = tag
+        self.attrs = dict(attrs)
+        self.children = []  # _HtmlNode 또는 텍스트(str)
+
+    def has_class(self, name):
+        return name in (self.attrs.get("class") or "").split()
+
+class _HtmlTreeBuilder(HTMLParser):
+    """표 추출용 최소 HTML 트리 (생략된 </td>, </tr> 닫힘 처리 포함)."""
+    VOID_TAGS = {"br", "img", "input", "hr", "meta", "link", "col", "wbr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _HtmlNode("#root")
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("td", "th", "tr") and self.stack[-1].tag in ("td", "th"):
+            self.stack.pop()
+        if tag == "tr" and self.stack[-1].tag == "tr":
+            self.stack.pop()
+        node = _HtmlNode(tag, attrs)
+        self.stack[-1].children.append(node)
+        if tag not in self.VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+def _iter_nodes(node, tag):
+    # 문서 순서대로 하위 요소 중 tag 에 해당하는 노드 (querySelectorAll 과 같은 순서)
+    for child in node.children:
+        if isinstance(child, _HtmlNode):
+            if child.tag == tag:
+                yield child
+            yield from _iter_nodes(child, tag)
+
+def _collect_text(node, parts):
+    for child in node.children:
+        if isinstance(child, str):
+            parts.append(child)
+        elif child.tag == "br":
+            parts.append("\n")
+        elif child.tag in ("div", "p", "tr", "li", "table"):
+            parts.append("\n")
+            _collect_text(child, parts)
+            parts.append("\n")
+        else:
+            _collect_text(child, parts)
+
+def _node_text(node):
+    # innerText 근사: <br>/블록 요소는 줄바꿈, 줄 안의 연속 공백은 하나로
+    parts = []
+    _collect_text(node, parts)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def _parse_html(html):
+    builder = _HtmlTreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+def parse_table_html(html, marker=None):
+    """
+    HTML에서 표 행 목록(list[list[str]])을 추출.
+    marker가 있으면 그 문구를 포함하는 첫 번째 table, 없으면 첫 번째 table 기준.
+    (XPath //table[contains(., marker)] 와 같은 선택 기준)
+    """
+    for table in _iter_nodes(_parse_html(html), "table"):
+        if marker is None or marker in _node_text(table):
+            return [[_node_text(td) for td in _iter_nodes(tr, "td")] for tr in _iter_nodes(table, "tr")]
+    return None
+
+def read_table_rows(table, mode=None, drv=None):
+    """작업신청서(확인서) 표 WebElement → 행 목록. 실패 시 셀 단위 조회로 대체."""
+    mode = mode or TABLE_EXTRACT_MODE
+    drv = drv or driver
+    try:
+        if mode == "script":
+            return drv.execute_script(TABLE_ROWS_SCRIPT, table)
+        if mode == "html":
+            return parse_table_html(table.get_attribute("outerHTML"))
+    except Exception as e:
+        print(f"⚠️ 표 일괄 추출 실패({mode}) → 셀 단위 조회: {e}")
+
+    rows = table.find_elements(By.TAG_NAME, "tr")
+    return [[td.text.strip() for td in row.find_elements(By.TAG_NAME, "td")] for row in rows]
+
+def table_rows_to_dataframe(table_data):
+    # 첫 행을 헤더로 사용 (save_all_to_excel 시트 형태)
+    df = pd.DataFrame(table_data)
+    if len(df) > 1:
+        df.columns = df.iloc[0]
+        df = df[1:]
+    return df
+
+# 결재 수신 문서 목록의 문서 제목 링크
+DOCUMENT_LINK_LOCATOR = (By.XPATH, "//td[@class='subject']/a")
+
+def sanitize_doc_number(text):
+    # 문서번호 → 엑셀 시트명으로 쓸 수 있는 형태 (금지문자 치환, 31자 제한)
+    return re.sub(r'[\\/*?:\[\]]', '_', text.strip())[:31]
+
+def list_documents(drv=None):
+    """현재 목록 화면의 문서를 (문서번호, 문서 URL) 목록으로 반환 (URL로 열 수 없으면 None)."""
+    drv = drv or driver
+    entries = drv.execute_script("""
+        var links = document.querySelectorAll("td.subject > a");
+        var nums = document.querySelectorAll("td.doc_num > span");
+        return Array.from(links).map(function (a, i) {
+            return [nums[i] ? nums[i].innerText : "", a.href];
+        });
+    """)
+    return [
+        (sanitize_doc_number(doc_number), href if href.startswith("http") else None)
+        for doc_number, href in entries
+    ]
+
+def parse_document_list_html(html, base_url):
+    """목록 화면 HTML → (문서번호, 문서 URL) 목록 (list_documents와 같은 형식, 행마다 td.doc_num / td.subject 기준)."""
+    entries = []
+    for tr in _iter_nodes(_parse_html(html), "tr"):
+        cells = [td for td in _iter_nodes(tr, "td")]
+        links = [a for td in cells if td.has_class("subject") for a in _iter_nodes(td, "a")]
+        if not links:
+            continue
+        nums = [span for td in cells if td.has_class("doc_num") for span in _iter_nodes(td, "span")]
+        href = urljoin(base_url, links[0].attrs.get("href") or "")
+        entries.append((
+            sanitize_doc_number(_node_text(nums[0]) if nums else ""),
+            href if urlparse(href).scheme in ("http", "https") else None,
+        ))
+    return entries
+
+def _copy_session_cookies(cookies, target_driver, base_url):
+    # 메인 세션에서 미리 읽어 둔 로그인 쿠키를 다른 브라우저 세션에 복사 (도메인 진입 후에만 추가 가능)
+    target_driver.get(base_url)
+    for cookie in cookies:
+        cookie = {k: v for k, v in cookie.items() if k in ("name", "value", "path", "domain", "secure", "httpOnly", "expiry")}
+        if "expiry" in cookie:
+            cookie["expiry"] = int(cookie["expiry"])
+        try:
+            target_driver.add_cookie(cookie)
+        except Exception as e:
+            print(f"⚠️ 쿠키 복사 실패: {cookie.get('name')} - {e}")
+
+def collect_document(drv, doc_number, url, receive=True):
+    """문서 URL을 직접 열어 표를 수집하고 접수(receive=False면 생략). 표가 없으면 접수만 하고 None 반환."""
+    drv.get(url)
+    wait_for(EC.presence_of_element_located((By.TAG_NAME, "table")), "document_open", drv=drv)
+
+    try:
+        table = wait_for(
+            EC.presence_of_element_located((By.XPATH, "//table[contains(., '작업신청서(확인서)신청결과')]")),
+            "document_table", timeout=5, drv=drv
+        )
+    except Exception:
+        print(f"⚠️ 테이블 없음 → 접수만 진행: {doc_number}")
+        if receive:
+            click_receipt_and_confirm(drv)
+        return None
+
+    df = table_rows_to_dataframe(read_table_rows(table, drv=drv))
+    if receive:
+        click_receipt_and_confirm(drv)
+    return df
+
+def _collection_worker(worker_no, jobs, cookies, skip_doc_numbers=()):
+    # 작업자 1명: 별도 headless 세션에서 할당된 문서(순번, 문서번호, URL)를 차례로 처리
+    results = {}
+    drv = create_driver(headless=COLLECT_HEADLESS)
+    try:
+        _copy_session_cookies(cookies, drv, GW_BASE_URL)
+        for order, doc_number, url in jobs:
+            try:
+                doc_probe = metrics.probe()
+                df = collect_document(drv, doc_number, url)
+                results[order] = (doc_number, df)
+                if ledger is not None and df is not None and doc_number not in skip_doc_numbers:
+                    ledger.record_document(doc_number, df)
+                print(f"✅ [작업자{worker_no}] 수집 완료: {doc_number}")
+                metrics.record_item("document", doc_number, doc_probe, worker=worker_no)
+            except Exception as e:
+                print(f"❌ [작업자{worker_no}] 문서 처리 실패: {doc_number} - {e}")
+                note_collection_error(doc_number)
+    finally:
+        drv.quit()
+    return results
+
+def get_work_confirmation_documents_parallel(workers=None, skip_doc_numbers=()):
+    """
+    현재 목록의 문서를 N개의 headless 세션에 나눠 URL로 직접 열어 수집하고, 문서 순서대로 병합.
+    로그인 쿠키는 메인 세션에서 복사하며, URL로 열 수 없는 문서는 끝난 뒤 메인 세션에서 순차 처리.
+    skip_doc_numbers에 있는 문서는 접수만 하고 결과에서 제외함. 반환 형식은 get_work_confirmation_documents와 같음.
+    """
+    workers = workers or COLLECT_WORKERS
+    entries = list_documents()
+    jobs = [(order, doc_number, url) for order, (doc_number, url) in enumerate(entries) if url]
+    print(f"📄 병렬 수집 시작: 문서 {len(entries)}건 / 작업자 {workers}명")
+
+    # WebDriver 세션은 스레드 간 공유할 수 없으므로 쿠키는 메인 스레드에서 한 번만 읽어 작업자에게 전달
+    cookies = driver.get_cookies()
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_collection_worker, worker_no + 1, jobs[worker_no::workers], cookies, skip_doc_numbers)
+            for worker_no in range(workers) if jobs[worker_no::workers]
+        ]
+        for future in futures:
+            results.update(future.result())
+
+    if len(jobs) < len(entries):
+        # URL이 없는 문서: 목록을 새로 조회해 남은 문서를 순차 처리 (병렬 수집분은 접수만)
+        print(f"ℹ️ URL로 열 수 없는 문서 {len(entries) - len(jobs)}건 → 순차 처리")
+        positions = {doc_number: order for order, (doc_number, _) in enumerate(entries)}
+        driver.refresh()
+        search_work_confirmation()
+        collected = {doc_number for doc_number, _ in results.values()} | set(skip_doc_numbers)
+        for df, doc_number in zip(*get_work_confirmation_documents(skip_doc_numbers=collected)):
+            results[positions.get(doc_number, len(entries) + len(results))] = (doc_number, df)
+
+    ordered = [
+        results[order] for order in sorted(results)
+        if results[order][1] is not None and results[order][0] not in skip_doc_numbers
+    ]
+    print(f"✅ 병렬 수집 완료: {len(ordered)}건")
+    return [df for _, df in ordered], [doc_number for doc_number, _ in ordered]
+
+def get_work_confirmation_documents(skip_doc_numbers=(), drv=None, on_document=None):
+    """
+    목록의 첫 문서를 열어 표를 수집하고 접수하는 과정을 목록이 빌 때까지 반복.
+    skip_doc_numbers에 있는 문서는 표를 다시 수집하지 않고 접수만 진행함.
+    on_document(doc_number, df)가 있으면 표를 수집할 때마다 바로 호출함 (pipelined 방식).
+    """
+    drv = drv or driver
     all_dataframes = []
     doc_numbers = []
     count = 0  # ✅ 문서 처리 카운터
@@ -266,126 +1332,426 @@ def get_work_confirmation_documents():
     while True:
         try:
             # 문서 리스트 재조회 (항상 첫 번째 문서만 처리)
-            document_elements = driver.find_elements(By.XPATH, "//td[@class='subject']/a")
-            docnum_elements = driver.find_elements(By.XPATH, "//td[@class='doc_num']/span")
+            document_elements = drv.find_elements(*DOCUMENT_LINK_LOCATOR)
+            docnum_elements = drv.find_elements(By.XPATH, "//td[@class='doc_num']/span")
 
             if not document_elements:
                 print("✅ 모든 문서 처리 완료")
                 break
 
             doc_element = document_elements[0]
-            doc_number = re.sub(r'[\\/*?:\[\]]', '_', docnum_elements[0].text.strip())[:31]
-            doc_numbers.append(doc_number)
+            doc_number = sanitize_doc_number(docnum_elements[0].text)
+            doc_probe = metrics.probe()
 
             count += 1
             print(f"\n📄 {count}번째 문서 처리 중: 문서번호 {doc_number}")
 
-            # 문서 클릭
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", doc_element)
-            time.sleep(1)
-            driver.execute_script("arguments[0].click();", doc_element)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
+            # 문서 클릭 → 목록을 벗어나 문서 로드가 끝날 때까지 대기
+            drv.execute_script("arguments[0].scrollIntoView({block: 'center'});", doc_element)
+            drv.execute_script("arguments[0].click();", doc_element)
+            wait_for(list_refreshed(doc_element), "document_open", required=False, drv=drv)
+            wait_for(EC.presence_of_element_located((By.TAG_NAME, "table")), "document_open", drv=drv)
 
             # 테이블 존재 여부 확인
             try:
-                table = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, "//table[contains(., '작업신청서(확인서)신청결과')]"))
+                table = wait_for(
+                    EC.presence_of_element_located((By.XPATH, "//table[contains(., '작업신청서(확인서)신청결과')]")),
+                    "document_table", timeout=5, drv=drv
                 )
             except:
                 print("⚠️ 테이블 없음 → 접수만 진행")
-                click_receipt_and_confirm()
-                click_back_to_list()
+                click_receipt_and_confirm(drv)
+                click_back_to_list(drv)
                 continue
 
-            # 데이터 수집
-            rows = table.find_elements(By.TAG_NAME, "tr")
-            table_data = [[td.text.strip() for td in row.find_elements(By.TAG_NAME, "td")] for row in rows]
-            df = pd.DataFrame(table_data)
-            if len(df) > 1:
-                df.columns = df.iloc[0]
-                df = df[1:]
-            all_dataframes.append(df)
+            # 데이터 수집 (문서번호는 표가 수집된 문서만 기록해 시트명과 어긋나지 않게 함)
+            if doc_number in skip_doc_numbers:
+                print(f"ℹ️ 이미 수집된 문서 → 접수만 진행: {doc_number}")
+            else:
+                all_dataframes.append(table_rows_to_dataframe(read_table_rows(table, drv=drv)))
+                doc_numbers.append(doc_number)
+                if ledger is not None:
+                    ledger.record_document(doc_number, all_dataframes[-1])
+                if on_document is not None:
+                    on_document(doc_number, all_dataframes[-1])
 
             print(f"✅ 수집 완료: {doc_number}")
-            click_receipt_and_confirm()                  
-            time.sleep(1)
+            click_receipt_and_confirm(drv)
+            wait_for(document_ready, "document_ready", required=False, drv=drv)
+            metrics.record_item("document", doc_number, doc_probe)
 
             # 마지막 문서 구별
             if len(document_elements) == 1:
                 print(f"✅ 마지막 문서 처리 완료: {doc_number}")
                 break
 
-            click_back_to_list()
-            time.sleep(1)
-            document_elements = driver.find_elements(By.XPATH, "//td[@class='subject']/a")
+            click_back_to_list(drv)
+            document_elements = drv.find_elements(*DOCUMENT_LINK_LOCATOR)
             if not document_elements:
                 print("✅ 모든 문서 처리 완료 (남은 문서 없음)")
                 break
 
         except Exception as e:
             print(f"❌ 문서 처리 실패: {e}")
-            driver.refresh(); time.sleep(3)
+            note_collection_error()
+            drv.refresh()
+            wait_for(document_ready, "document_ready", required=False, drv=drv)
             continue
 
     return all_dataframes, doc_numbers
 
 
-def save_all_to_excel(dataframes, sheet_names, filename="작업확인서_신청결과.xlsx"):
-    with pd.ExcelWriter(filename, engine="xlsxwriter") as writer:
-        for idx, df in enumerate(dataframes):
-            df.to_excel(writer, sheet_name=sheet_names[idx][:31], index=False)
-    print(f"✅ 모든 데이터 저장 완료: {filename}")
-
 # ──────────────────────────────────────────────────────────────
-# 엑셀 정리 함수
+# index 방식 문서 수집 (목록 전체 색인 → 문서번호별 수집 → 일괄접수)
 # ──────────────────────────────────────────────────────────────
-def format_excel(input_path, output_path):
-    if not os.path.exists(input_path):
-        print(f"❌ 파일이 존재하지 않음: {input_path}")
-        return
+# 목록의 일괄접수 버튼 / 행 선택 체크박스(문서번호와 같은 행)
+BULK_RECEIPT_LOCATOR = (By.XPATH, "//span[text()='일괄접수']")
+
+# 현재 목록에서 wanted(sanitize_doc_number 기준 문서번호) 행을 체크. [체크한 문서번호, 목록의 문서 수] 반환
+BULK_SELECT_SCRIPT = r"""
+var wanted = arguments[0], checked = [], total = 0;
+document.querySelectorAll("td.doc_num > span").forEach(function (span) {
+    total++;
+    var docNumber = span.innerText.trim().replace(/[\\\/*?:\[\]]/g, "_").slice(0, 31);
+    var tr = span.closest("tr");
+    var box = tr ? tr.querySelector("td.check input[type=checkbox]") : null;
+    if (box && wanted.indexOf(docNumber) >= 0) {
+        if (!box.checked) box.click();
+        checked.push(docNumber);
+    }
+});
+return [checked, total];
+"""
+
+def document_list_url(page=1):
+    # 작업확인서 검색 조건이 적용된 결재 수신 문서 목록 주소 (page는 1부터)
+    params = dict(GW_SEARCH_PARAMS)
+    if search_date_range:
+        params.update(zip(GW_SEARCH_DATE_FIELDS, search_date_range))
+    if page > 1:
+        params[GW_LIST_PAGE_PARAM] = page
+    return urljoin(GW_BASE_URL, GW_LIST_PATH) + "?" + urlencode(params)
+
+def walk_document_pages(load_page):
+    """
+    load_page(페이지 번호) → (문서번호, URL) 목록을 1페이지부터 차례로 호출해 전체 목록 색인을 만듦 (목록 순서, 문서번호 중복 제거).
+    새 문서가 없는 페이지(빈 페이지, 페이지 번호를 무시하고 같은 목록을 돌려주는 경우)에서 멈춤.
+    """
+    index = {}
+    for page in range(1, GW_LIST_MAX_PAGES + 1):
+        new_entries = [(doc_number, url) for doc_number, url in load_page(page) if doc_number not in index]
+        if not new_entries:
+            break
+        index.update(new_entries)
+    return list(index.items())
+
+def enumerate_documents(drv=None):
+    """목록 페이지를 브라우저로 모두 열어 (문서번호, 문서 URL) 색인 생성 (접수/이동 전에 한 번만)."""
+    drv = drv or driver
+
+    def load_page(page):
+        drv.get(document_list_url(page))
+        wait_for(document_ready, "document_ready", required=False, drv=drv)
+        return list_documents(drv)
+
+    index = walk_document_pages(load_page)
+    print(f"📑 문서 목록 색인: {len(index)}건")
+    return index
+
+def bulk_receipt_available(drv=None):
+    drv = drv or driver
+    if not GW_BULK_RECEIPT:
+        return False
+    drv.get(document_list_url())
+    return bool(drv.find_elements(*BULK_RECEIPT_LOCATOR))
 
-    xls = pd.ExcelFile(input_path)
-    combined_df = pd.DataFrame()
+def bulk_receive_documents(doc_numbers, drv=None):
+    """
+    목록 페이지를 돌며 doc_numbers 문서를 체크해 일괄접수 → 확인. 접수한 문서번호 집합 반환.
+    접수된 문서는 목록에서 빠지므로 같은 페이지를 다시 조회하고, 체크할 문서가 없으면 다음 페이지로 넘어감.
+    일괄접수 버튼이 없거나 실패하면 그때까지 접수한 문서만 반환 (나머지는 호출한 쪽에서 문서별 접수).
+    """
+    drv = drv or driver
+    pending, received = set(doc_numbers), set()
+    page = 1
+    while pending and GW_BULK_RECEIPT and page <= GW_LIST_MAX_PAGES:
+        drv.get(document_list_url(page))
+        if not drv.find_elements(*BULK_RECEIPT_LOCATOR):
+            break
+        checked, total = drv.execute_script(BULK_SELECT_SCRIPT, sorted(pending))
+        if not total:
+            break
+        if not checked:
+            page += 1
+            continue
+        try:
+            drv.find_element(*BULK_RECEIPT_LOCATOR).click()
+            wait_for(EC.element_to_be_clickable((By.XPATH, "//span[text()='확인']")), "receipt", drv=drv).click()
+            wait_for(element_absent((By.XPATH, "//span[text()='확인']")), "receipt", drv=drv)
+        except Exception as e:
+            print(f"❌ 일괄접수 실패: {type(e).__name__} - {e}")
+            break
+        print(f"📥 일괄접수 완료: {len(checked)}건 ({page}페이지)")
+        received.update(checked)
+        pending.difference_update(checked)
+    return received
+
+def receive_documents(entries, drv=None):
+    """{문서번호: URL} 문서를 일괄접수하고, 일괄접수되지 않은 문서는 문서 URL로 열어 접수."""
+    drv = drv or driver
+    received = bulk_receive_documents(entries, drv) if entries else set()
+    for doc_number, url in entries.items():
+        if doc_number not in received:
+            receive_document(drv, url)
+
+def get_work_confirmation_documents_indexed(skip_doc_numbers=(), drv=None, on_document=None):
+    """
+    목록 전체 페이지를 한 번 순회해 (문서번호, URL) 색인을 만들고, 목록 위치/새로고침과 무관하게 문서 URL로 하나씩 열어 표를 수집.
+    접수는 수집이 끝난 뒤 일괄접수로 처리(없으면 문서별 접수)하며, 수집에 실패한 문서는 접수하지 않아 다음 실행에서 다시 처리됨.
+    URL로 열 수 없는 문서는 검색 목록에서 기존 순차 방식으로 처리.
+    skip_doc_numbers / on_document / 반환 형식은 get_work_confirmation_documents와 같음.
+    """
+    drv = drv or driver
+    index = enumerate_documents(drv)
+    all_dataframes, doc_numbers, to_receive = [], [], {}
 
-    for sheet in xls.sheet_names:
-        df_raw = xls.parse(sheet, header=None)
-        result_rows = []
-        row_idx = 3
+    for count, (doc_number, url) in enumerate(index, 1):
+        if not url:
+            continue
+        if doc_number in skip_doc_numbers:
+            print(f"ℹ️ 이미 수집된 문서 → 접수만 진행: {doc_number}")
+            to_receive[doc_number] = url
+            continue
 
-        while row_idx + 1 < len(df_raw):
-            if df_raw.iloc[row_idx].isnull().all():
-                break
+        print(f"\n📄 {count}/{len(index)}번째 문서 처리 중: 문서번호 {doc_number}")
+        doc_probe = metrics.probe()
+        try:
+            df = collect_document(drv, doc_number, url, receive=False)
+        except Exception as e:
+            print(f"❌ 문서 처리 실패 → 접수하지 않음: {doc_number} - {e}")
+            note_collection_error(doc_number)
+            continue
 
-            upper = df_raw.iloc[row_idx]
-            lower = df_raw.iloc[row_idx + 1]
-
-            row_data = {
-                "No": upper[0],
-                "구분": upper[1],
-                "소속": upper[2],
-                "사번": lower[0],
-                "성명": upper[3],
-                "시작": upper[4],
-                "종료": lower[1],
-                "신청시간": upper[5],
-                "출근": upper[6],
-                "퇴근": lower[2],
-                "근무일자": upper[7],
-                "보상구분": upper[8],
-                "작업내용": upper[9],
-                "문서번호": sheet
-            }
+        to_receive[doc_number] = url
+        if df is not None:
+            all_dataframes.append(df)
+            doc_numbers.append(doc_number)
+            if ledger is not None:
+                ledger.record_document(doc_number, df)
+            if on_document is not None:
+                on_document(doc_number, df)
+            print(f"✅ 수집 완료: {doc_number}")
+        metrics.record_item("document", doc_number, doc_probe, collect="index")
 
-            result_rows.append(row_data)
-            row_idx += 3
+    receive_documents(to_receive, drv)
 
-        df_sheet = pd.DataFrame(result_rows)
+    if any(url is None for _, url in index):
+        print("ℹ️ URL로 열 수 없는 문서 → 순차 처리")
+        drv.get(document_list_url())
+        wait_for(document_ready, "document_ready", required=False, drv=drv)
+        dataframes, names = get_work_confirmation_documents(
+            skip_doc_numbers=set(skip_doc_numbers) | set(to_receive), drv=drv, on_document=on_document
+        )
+        all_dataframes += dataframes
+        doc_numbers += names
 
-        # 통합 시 중복 칼럼 제거
-        if combined_df.empty:
-            combined_df = df_sheet
-        else:
-            combined_df = pd.concat([combined_df, df_sheet], ignore_index=True)
+    print(f"✅ 색인 수집 완료: {len(doc_numbers)}건")
+    return all_dataframes, doc_numbers
+
+# ──────────────────────────────────────────────────────────────
+# http 방식 문서 수집 (목록/문서 HTML 직접 조회, 접수만 브라우저)
+# ──────────────────────────────────────────────────────────────
+WORK_TABLE_MARKER = "작업신청서(확인서)신청결과"
+
+def http_session_from_driver(drv=None, pool_size=None):
+    """브라우저 로그인 세션의 쿠키/User-Agent를 복사한 requests.Session (keep-alive 연결 pool_size개 재사용)."""
+    drv = drv or driver
+    pool_size = pool_size or COLLECT_HTTP_WORKERS
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = drv.execute_script("return navigator.userAgent;")
+    for cookie in drv.get_cookies():
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+    return session
+
+def http_get_html(session, url):
+    # 로그인 화면으로 돌려보내지면 세션 만료로 보고 예외 (로그인 화면을 '표 없는 문서'로 오인하지 않도록)
+    response = session.get(url, timeout=COLLECT_HTTP_TIMEOUT)
+    response.raise_for_status()
+    if response.history and urlparse(response.url).path == urlparse(LOGIN_GW_URL).path:
+        raise RuntimeError(f"그룹웨어 세션 만료 (로그인 화면으로 이동): {url}")
+    if "charset" not in response.headers.get("Content-Type", ""):
+        response.encoding = "utf-8"
+    return response.text
+
+def fetch_document_table(session, url):
+    """문서 HTML을 받아 작업신청서(확인서)신청결과 표를 DataFrame으로 변환. 표가 없으면 None."""
+    table_data = parse_table_html(http_get_html(session, url), WORK_TABLE_MARKER)
+    return table_rows_to_dataframe(table_data) if table_data is not None else None
+
+def receive_document(drv, url):
+    # 문서 URL을 브라우저로 열어 접수/확인만 진행
+    drv.get(url)
+    wait_for(EC.presence_of_element_located((By.TAG_NAME, "table")), "document_open", drv=drv)
+    click_receipt_and_confirm(drv)
+
+def get_work_confirmation_documents_http(skip_doc_numbers=(), workers=None, drv=None, on_document=None):
+    """
+    로그인된 브라우저 세션의 쿠키로 작업확인서 검색 목록(전체 페이지)과 문서 HTML을 직접 받아(동시 요청 workers개)
+    표를 파싱하고, 브라우저는 접수/확인에만 사용.
+    - 목록에 일괄접수가 있으면 수집이 끝난 뒤 한 번에 접수, 없으면 문서를 받는 동안 앞 문서부터 차례로 접수
+    - HTTP로 받지 못한 문서는 브라우저로 열어 수집(collect_document)
+    - 목록에서 문서를 찾지 못하거나 URL로 열 수 없는 문서가 있으면 검색 목록을 브라우저로 열어 순차 수집
+    skip_doc_numbers / on_document / 반환 형식은 get_work_confirmation_documents와 같음.
+    """
+    drv = drv or driver
+    workers = workers or COLLECT_HTTP_WORKERS
+    session = http_session_from_driver(drv, workers)
+
+    def load_page(page):
+        list_url = document_list_url(page)
+        return parse_document_list_html(http_get_html(session, list_url), list_url)
+
+    entries = walk_document_pages(load_page)
+    jobs = [(doc_number, url) for doc_number, url in entries if url]
+    bulk = bool(jobs) and bulk_receipt_available(drv)
+    print(f"📄 HTTP 수집 시작: 문서 {len(entries)}건 / 동시 요청 {workers}개 / 접수: {'일괄접수' if bulk else '문서별'}")
+
+    def fetch(job):
+        # (표 DataFrame 또는 None, 예외, 받는 데 걸린 시간)
+        doc_number, url = job
+        if doc_number in skip_doc_numbers:
+            return None, None, 0.0
+        started = time.perf_counter()
+        try:
+            return fetch_document_table(session, url), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
+    all_dataframes, doc_numbers, to_receive = [], [], {}
+    collected = set(skip_doc_numbers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map은 문서 순서대로 결과를 돌려주므로 접수/기록 순서도 목록 순서와 같음
+            for (doc_number, url), (df, error, fetch_seconds) in zip(jobs, pool.map(fetch, jobs)):
+                doc_probe = metrics.probe()
+                if doc_number in skip_doc_numbers:
+                    print(f"ℹ️ 이미 수집된 문서 → 접수만 진행: {doc_number}")
+                    if bulk:
+                        to_receive[doc_number] = url
+                    else:
+                        receive_document(drv, url)
+                    continue
+                if error is not None:
+                    print(f"⚠️ HTTP 수집 실패 → 브라우저로 수집: {doc_number} - {error}")
+                    try:
+                        df = collect_document(drv, doc_number, url, receive=not bulk)
+                    except Exception as e:
+                        print(f"❌ 문서 처리 실패 → 접수하지 않음: {doc_number} - {e}")
+                        note_collection_error(doc_number)
+                        continue
+                elif df is None:
+                    print(f"⚠️ 테이블 없음 → 접수만 진행: {doc_number}")
+                if bulk:
+                    to_receive[doc_number] = url
+                elif error is None:
+                    receive_document(drv, url)
+                collected.add(doc_number)
+                if df is not None:
+                    all_dataframes.append(df)
+                    doc_numbers.append(doc_number)
+                    if ledger is not None:
+                        ledger.record_document(doc_number, df)
+                    if on_document is not None:
+                        on_document(doc_number, df)
+                    print(f"✅ 수집 완료: {doc_number}")
+                metrics.record_item("document", doc_number, doc_probe, collect="http", fetch_seconds=round(fetch_seconds, 3))
+    finally:
+        session.close()
+    receive_documents(to_receive, drv)
+
+    if not entries or len(jobs) < len(entries):
+        print("ℹ️ HTTP 목록으로 처리하지 못한 문서 확인 → 브라우저로 순차 처리")
+        drv.get(document_list_url())
+        wait_for(document_ready, "document_ready", required=False, drv=drv)
+        dataframes, names = get_work_confirmation_documents(skip_doc_numbers=collected, drv=drv, on_document=on_document)
+        all_dataframes += dataframes
+        doc_numbers += names
+
+    print(f"✅ HTTP 수집 완료: {len(doc_numbers)}건")
+    return all_dataframes, doc_numbers
+
+def collect_work_confirmation_documents(skip_doc_numbers=(), drv=None, on_document=None):
+    """그룹웨어 로그인 이후 COLLECT_MODE 방식으로 작업확인서를 수집/접수. 반환 형식은 get_work_confirmation_documents와 같음."""
+    if COLLECT_MODE == "http":
+        return get_work_confirmation_documents_http(skip_doc_numbers, drv=drv, on_document=on_document)
+    if COLLECT_MODE == "index":
+        return get_work_confirmation_documents_indexed(skip_doc_numbers, drv=drv, on_document=on_document)
+    go_to_received_documents(drv)
+    search_work_confirmation(drv)
+    if COLLECT_WORKERS > 1 and on_document is None:
+        return get_work_confirmation_documents_parallel(skip_doc_numbers=skip_doc_numbers)
+    return get_work_confirmation_documents(skip_doc_numbers, drv=drv, on_document=on_document)
+
+def save_all_to_excel(dataframes, sheet_names, filename=RAW_RESULT_FILE):
+    if EXCEL_IO_MODE == "stream":
+        write_sheets(filename, ((sheet_names[idx], *frame_rows(df)) for idx, df in enumerate(dataframes)))
+    else:
+        with pd.ExcelWriter(filename, engine="xlsxwriter") as writer:
+            for idx, df in enumerate(dataframes):
+                df.to_excel(writer, sheet_name=sheet_names[idx][:31], index=False)
+    print(f"✅ 모든 데이터 저장 완료: {filename}")
+
+# ──────────────────────────────────────────────────────────────
+# 엑셀 정리 함수
+# ──────────────────────────────────────────────────────────────
+# 정리 결과 컬럼 → (원본 행 구분, 열 위치). 신청 1건은 상단/하단/공백 3줄로 구성
+LAYOUT_COLUMNS = {
+    "No": ("upper", 0),
+    "구분": ("upper", 1),
+    "소속": ("upper", 2),
+    "사번": ("lower", 0),
+    "성명": ("upper", 3),
+    "시작": ("upper", 4),
+    "종료": ("lower", 1),
+    "신청시간": ("upper", 5),
+    "출근": ("upper", 6),
+    "퇴근": ("lower", 2),
+    "근무일자": ("upper", 7),
+    "보상구분": ("upper", 8),
+    "작업내용": ("upper", 9),
+}
+
+def _normalize_sheet(df_raw, sheet):
+    """
+    문서 1건(시트)의 원본 표(header=None)를 행 단위 레코드로 변환.
+    4번째 줄부터 3줄(상단/하단/공백)이 신청 1건이며, 상단이 모두 비면 종료.
+    상단(3::3)/하단(4::3) 줄을 배열 슬라이싱으로 한 번에 잘라 컬럼별로 재배치함.
+    """
+    values = df_raw.to_numpy(dtype=object)
+    upper, lower = values[3::3], values[4::3]
+    upper = upper[:len(lower)]  # 하단 줄이 없는 마지막 상단 줄은 제외
+
+    # 모든 값이 빈 상단 줄이 나오면 그 앞까지만 사용
+    blank = pd.isna(upper).all(axis=1) if upper.size else np.ones(len(upper), dtype=bool)
+    if blank.any():
+        upper, lower = upper[:blank.argmax()], lower[:blank.argmax()]
+    if not len(upper):
+        return pd.DataFrame()
+
+    parts = {"upper": upper, "lower": lower}
+    result = pd.DataFrame({
+        column: list(parts[part][:, position]) for column, (part, position) in LAYOUT_COLUMNS.items()
+    })
+    result["문서번호"] = sheet
+    return result
+
+def _combine_sheets(sheet_frames):
+    # 시트별 결과를 한 번에 통합 (빈 시트 제외)
+    sheet_frames = [df_sheet for df_sheet in sheet_frames if not df_sheet.empty]
+    combined_df = pd.concat(sheet_frames, ignore_index=True) if sheet_frames else pd.DataFrame()
 
     # 🔍 중복 열 탐지 및 제거
     duplicated_cols = combined_df.columns[combined_df.columns.duplicated()].tolist()
@@ -395,12 +1761,43 @@ def format_excel(input_path, output_path):
         #print("✅ 중복 열 없음")
         pass
 
-    combined_df = combined_df.loc[:, ~combined_df.columns.duplicated()]
-    combined_df.to_excel(output_path, index=False)
+    return combined_df.loc[:, ~combined_df.columns.duplicated()]
+
+def format_excel(input_path, output_path):
+    if not os.path.exists(input_path):
+        print(f"❌ 파일이 존재하지 않음: {input_path}")
+        return
+
+    with pd.ExcelFile(input_path) as xls:
+        combined_df = _combine_sheets(
+            [_normalize_sheet(xls.parse(sheet, header=None), sheet) for sheet in xls.sheet_names]
+        )
+
+    write_frame(combined_df, output_path)
     print(f"✅ 엑셀 정리 및 통합 완료: {output_path}")
 
     return combined_df
 
+def _document_to_raw(df):
+    """
+    수집된 문서 표를 save_all_to_excel로 저장한 뒤 header=None으로 다시 읽은 것과
+    같은 형태로 변환 (헤더 줄 포함, 빈 문자열/None -> NaN).
+    """
+    df_raw = pd.DataFrame([list(df.columns)] + df.to_numpy(dtype=object).tolist())
+    return df_raw.mask(df_raw.isna() | df_raw.eq(""))
+
+def normalize_documents(dataframes, doc_numbers):
+    """
+    엑셀을 거치지 않고 수집된 문서 표들을 바로 정리 (format_excel의 메모리 버전).
+    문서번호는 save_all_to_excel의 시트명과 같이 31자로 자름.
+    """
+    combined_df = _combine_sheets(
+        _normalize_sheet(_document_to_raw(df), doc_numbers[idx][:31]) for idx, df in enumerate(dataframes)
+    )
+    print(f"✅ 문서 정리 및 통합 완료 (메모리): {len(combined_df)}건")
+
+    return combined_df
+
 def is_special_pattern_exception(row, pattern_start, pattern_end):
     """
     특정 패턴의 시간외근무 또는 휴일근무가 '정상 출근'으로 인정되도록 예외 처리.
@@ -408,124 +1805,610 @@ def is_special_pattern_exception(row, pattern_start, pattern_end):
     조건:
     - 시간외근무: 시작 00:20, 종료 01:20/02:20, 출근이 15:40 이전
     - 휴일근무: 시작 00:20, 출근이 23:00 이후 (전날 출근 간주)
+    pattern_start/pattern_end는 "HH:MM" 문자열 또는 time 값.
     """
-    try:
-        goto_time = str_to_time(row["출근"])
-        getoff_time = str_to_time(row["퇴근"])
-        if not goto_time or not getoff_time:
-            return False
+    return _is_special_exception(
+        row["구분"], time_to_minutes(row["출근"]), time_to_minutes(row["퇴근"]),
+        time_to_minutes(pattern_start), time_to_minutes(pattern_end),
+    )
+
+def _is_special_exception(kind, goto_time, getoff_time, pattern_start, pattern_end):
+    # is_special_pattern_exception 본체 (모두 분 단위로 변환된 값)
+    if min(goto_time, getoff_time, pattern_start, pattern_end) < 0:
+        return False
 
-        # [1] 시간외근무: 야간 연장 예외
-        if (
-            row["구분"] == "시간외근무" and
-            pattern_start == str_to_time("00:20") and
-            pattern_end in [str_to_time("01:20"), str_to_time("02:20")] and
-            goto_time < str_to_time("15:40") and
-            getoff_time >= pattern_end
-        ):
-            return True
+    # [1] 시간외근무: 야간 연장 예외
+    if (
+        kind == "시간외근무" and
+        pattern_start == SPECIAL_START_TIME and
+        pattern_end in SPECIAL_OVERTIME_END_TIMES and
+        goto_time < SPECIAL_OVERTIME_GOTO_LIMIT and
+        getoff_time >= pattern_end
+    ):
+        return True
 
-        # [2] 휴일근무: 전날 출근 예외
-        if (
-            row["구분"] == "휴일근무" and
-            pattern_start == str_to_time("00:20") and
-            goto_time >= str_to_time("23:00") and
-            getoff_time >= pattern_end
-        ):
-            return True
+    # [2] 휴일근무: 전날 출근 예외
+    if (
+        kind == "휴일근무" and
+        pattern_start == SPECIAL_START_TIME and
+        goto_time >= SPECIAL_HOLIDAY_GOTO_FROM and
+        getoff_time >= pattern_end
+    ):
+        return True
 
+    return False
+
+def _attendance_ok(kind, goto_time, getoff_time, pattern):
+    # 엑셀 '출근'이 패턴 '시작' 미만, 엑셀 '퇴근'이 패턴 '종료' 이상이거나 예외패턴이면 통과 (변환 실패 시각이 있으면 불통과)
+    if min(goto_time, getoff_time, pattern["start"], pattern["end"]) < 0:
         return False
-    except:
-        return False
+    return (
+        (goto_time < pattern["start"] and getoff_time >= pattern["end"]) or
+        _is_special_exception(kind, goto_time, getoff_time, pattern["start"], pattern["end"])
+    )
+
+def evaluate_attendance_row(row, pattern_index, minutes=None):
+    """
+    한 행을 컴파일된 패턴 인덱스와 비교해 (작업여부, duration) 반환.
+    (구분, 시작, 종료) 키로 후보 패턴을 바로 찾고, 매칭 실패 시에만
+    전체 패턴을 돌며 가장 짧은 실패 사유를 산출함.
+    minutes: 미리 변환한 (시작, 종료, 출근, 퇴근) 분 값 (없으면 행에서 변환)
+    """
+    #예외설정(장태근, 김규환)
+    if row["성명"] in PRECHECK_EXCEPTION_NAMES:
+        return "예외설정", None
+
+    # 출근/퇴근 필수 체크
+    if pd.isna(row["출근"]) or pd.isna(row["퇴근"]) or str(row["출근"]).strip() == "" or str(row["퇴근"]).strip() == "":
+        return "출/퇴근시간 공란", None
+
+    if minutes is None:
+        minutes = [time_to_minutes(row[col]) for col in PRECHECK_TIME_COLUMNS]
+    start_time, end_time, goto_time, getoff_time = minutes
+    work_time = str(row["신청시간"]).strip().replace(":", "").replace(".", "").zfill(4)
+
+    # 근무유형에 따라 비교할 패턴 선택
+    kind = row["구분"]
+    if kind not in pattern_index["groups"]:
+        return "휴일,시간외근무 외 패턴", None
+
+    # 시작/종료가 같은 후보만 확인 (원래 순서대로 첫 통과 패턴 채택)
+    for pattern in pattern_index["index"].get((kind, start_time, end_time), ()):
+        if work_time in pattern["work_times"] and _attendance_ok(kind, goto_time, getoff_time, pattern):
+            #모든 조건 통과!
+            return "작업가능", pattern["duration"]
+
+    failure_reasons = [] # 최종 실패 이유 수집
+    for pattern in pattern_index["groups"][kind]:
+        reasons = [] # 현재 패턴에 대한 실패 이유
+
+        if start_time != pattern["start"]:
+            reasons.append("시작시간 불일치")
+        if end_time != pattern["end"]:
+            reasons.append("종료시간 불일치")
+        if work_time not in pattern["work_times"]:
+            reasons.append("신청시간 불일치")
+        if not _attendance_ok(kind, goto_time, getoff_time, pattern):
+            reasons.append("지각,조퇴 기타사유")
+
+        failure_reasons.append(reasons) # 현재 패턴 실패이유 누적
+
+    if failure_reasons:
+        shortest_reason = min(failure_reasons, key=lambda x: len(x))
+        return f"패턴불일치({', '.join(shortest_reason)})", None
+    return None, None
+
+def _precheck_rows(df, pattern_index, times=None):
+    # 행 단위 기준 구현: 한 행씩 evaluate_attendance_row 호출
+    times = precheck_time_columns(df) if times is None else times
+    results = []
+    for (label, row), minutes in zip(df.iterrows(), times.to_numpy().tolist()):
+        result, duration = evaluate_attendance_row(row, pattern_index, minutes)
+        if duration:
+            for key, value in duration.items():
+                if key in DURATION_MAPPING:
+                    excel_col, _ = DURATION_MAPPING[key]
+                    df.at[label, excel_col] = value
+        results.append(result)
+
+    return pd.Series(results, index=df.index, dtype=object)
+
+def minutes_column(series):
+    """
+    열 전체를 int16 분 값으로 변환 (변환 실패/공란은 MISSING_MINUTES).
+    고유값만 time_to_minutes로 한 번씩 변환하므로 행 단위 판정과 규칙이 같음.
+    """
+    codes, uniques = pd.factorize(series)  # 빈 값은 code -1 -> 마지막 MISSING_MINUTES
+    parsed = np.array([time_to_minutes(v) for v in uniques] + [MISSING_MINUTES], dtype=np.int16)
+    return parsed[codes]
+
+# 사전검사에서 분 단위로 변환해 쓰는 시각 컬럼 (evaluate_attendance_row의 minutes 순서)
+PRECHECK_TIME_COLUMNS = ["시작", "종료", "출근", "퇴근"]
+
+def precheck_time_columns(df):
+    """시작/종료/출근/퇴근을 한 번만 변환한 int16 분 컬럼 표 (행 단위/일괄 판정이 함께 사용)."""
+    return pd.DataFrame({col: minutes_column(df[col]) for col in PRECHECK_TIME_COLUMNS}, index=df.index)
+
+def _normalize_work_time(series):
+    # 신청시간 -> "HHMM" (evaluate_attendance_row와 같은 규칙, 고유값만 변환)
+    codes, uniques = pd.factorize(series.astype(str))
+    normalized = [v.strip().replace(":", "").replace(".", "").zfill(4) for v in uniques]
+    return np.array(normalized, dtype=object)[codes]
+
+def _pattern_frame(pattern_index):
+    """컴파일된 패턴을 (구분, 패턴순번) 단위 표로 변환 (인덱스에 캐시)."""
+    if "frame" not in pattern_index:
+        records, work_time_keys = [], []
+        for kind, patterns in pattern_index["groups"].items():
+            for pattern in patterns:
+                record = {
+                    "구분": kind,
+                    "_order": pattern["order"],
+                    "_pid": len(records),
+                    "_p_start": pattern["start"],
+                    "_p_end": pattern["end"],
+                }
+                for key in DURATION_MAPPING:
+                    record[key] = pattern["duration"].get(key)
+                records.append(record)
+                work_time_keys += [(record["_pid"], wt) for wt in pattern["work_times"]]
+        pattern_index["frame"] = pd.DataFrame(records)
+        pattern_index["work_time_keys"] = pd.MultiIndex.from_tuples(work_time_keys, names=["_pid", "_work_time"])
+    return pattern_index["frame"], pattern_index["work_time_keys"]
+
+def _precheck_screen(df, kinds):
+    """
+    패턴 비교 전 판정 (evaluate_attendance_row 앞부분과 같은 순서): 예외설정 → 출/퇴근시간 공란 → 휴일,시간외근무 외 패턴.
+    (작업여부 배열, 패턴/규칙으로 판정할 행 마스크) 반환.
+    """
+    result = np.full(len(df), None, dtype=object)
+    goto_raw, getoff_raw = df["출근"], df["퇴근"]
+    is_exception = df["성명"].isin(PRECHECK_EXCEPTION_NAMES).to_numpy()
+    is_blank = (
+        goto_raw.isna() | getoff_raw.isna() |
+        goto_raw.astype(str).str.strip().eq("") | getoff_raw.astype(str).str.strip().eq("")
+    ).to_numpy() & ~is_exception
+    is_other = ~df["구분"].isin(list(kinds)).to_numpy() & ~is_exception & ~is_blank
+    result[is_exception] = "예외설정"
+    result[is_blank] = "출/퇴근시간 공란"
+    result[is_other] = "휴일,시간외근무 외 패턴"
+    return result, ~(is_exception | is_blank | is_other)
+
+def _failure_messages(reasons, failed):
+    # 실패사유 조합(최대 16가지)을 비트값으로 묶어 "패턴불일치(...)" 문구를 한 번씩만 생성
+    names = list(reasons.columns)
+    reason_bits = reasons.to_numpy() @ (1 << np.arange(len(names)))
+    messages = {
+        bits: f"패턴불일치({', '.join(name for i, name in enumerate(names) if bits >> i & 1)})"
+        for bits in np.unique(reason_bits[failed])
+    }
+    return [messages[bits] for bits in reason_bits[failed]]
+
+def _precheck_vectorized(df, pattern_index, times=None):
+    """
+    DataFrame 전체를 한 번에 판정하는 벡터화 구현 (_precheck_rows와 같은 결과).
+    시작/종료/출근/퇴근 분 컬럼(precheck_time_columns)을 패턴 표와 구분 기준으로 조인하고,
+    패턴별 실패사유 개수가 가장 적은(같으면 앞선) 패턴을 행마다 채택함.
+    """
+    times = precheck_time_columns(df) if times is None else times
+    result, target = _precheck_screen(df, pattern_index["groups"])
+    if target.any():
+        rows = pd.DataFrame({
+            "_pos": np.flatnonzero(target),
+            "구분": df["구분"].to_numpy()[target],
+            "_start": times["시작"].to_numpy()[target],
+            "_end": times["종료"].to_numpy()[target],
+            "_goto": times["출근"].to_numpy()[target],
+            "_getoff": times["퇴근"].to_numpy()[target],
+            "_work_time": _normalize_work_time(df["신청시간"])[target],
+        })
+        patterns, work_time_keys = _pattern_frame(pattern_index)
+        joined = rows.merge(patterns, on="구분", how="inner")
+
+        # 시작/종료 비교는 변환 실패끼리도 같은 값으로 취급 (-1 == -1)
+        start, end = joined["_start"], joined["_end"]
+        p_start, p_end = joined["_p_start"], joined["_p_end"]
+        goto, getoff = joined["_goto"], joined["_getoff"]
+        kind = joined["구분"]
+        # 출근/퇴근/패턴 시각 중 변환 실패가 있으면 지각,조퇴 판정 불통과 (_attendance_ok와 같음)
+        comparable = (goto >= 0) & (getoff >= 0) & (p_start >= 0) & (p_end >= 0)
+
+        # is_special_pattern_exception과 같은 조건
+        special = comparable & (getoff >= p_end) & (p_start == SPECIAL_START_TIME) & (
+            ((kind == "시간외근무") & p_end.isin(SPECIAL_OVERTIME_END_TIMES) & (goto < SPECIAL_OVERTIME_GOTO_LIMIT)) |
+            ((kind == "휴일근무") & (goto >= SPECIAL_HOLIDAY_GOTO_FROM))
+        )
+        reasons = pd.DataFrame({
+            "시작시간 불일치": start != p_start,
+            "종료시간 불일치": end != p_end,
+            "신청시간 불일치": ~pd.MultiIndex.from_arrays([joined["_pid"], joined["_work_time"]]).isin(work_time_keys),
+            "지각,조퇴 기타사유": ~((comparable & (goto < p_start) & (getoff >= p_end)) | special),
+        })
+        joined["_n_reasons"] = reasons.sum(axis=1)
+
+        best = joined.sort_values(["_pos", "_n_reasons", "_order"], kind="stable").drop_duplicates("_pos")
+        matched = best["_n_reasons"].to_numpy() == 0
+        positions = best["_pos"].to_numpy()
+        result[positions[matched]] = "작업가능"
+        result[positions[~matched]] = _failure_messages(reasons.loc[best.index], ~matched)
+
+        for key, (excel_col, _) in DURATION_MAPPING.items():
+            values = best[key].to_numpy()
+            fill = matched & pd.notna(values)
+            if fill.any():
+                column = df[excel_col].to_numpy(dtype=object).copy()
+                column[positions[fill]] = values[fill]
+                df[excel_col] = column
+
+    return pd.Series(result, index=df.index)
+
+# ──────────────────────────────────────────────────────────────
+# 근무시간 규칙 계산 (patterns.json duration_rules, rules 방식)
+# ──────────────────────────────────────────────────────────────
+# 하루를 넘기는 근무(종료 <= 시작 → 다음날 종료)까지 담도록 이틀치 분 단위로 계산
+RULE_MINUTES = 2 * 1440
+
+def _rule_window(window):
+    # ["HH:MM", "HH:MM"] 구간 [시작, 종료)의 이틀치 분 마스크 (종료 <= 시작이면 자정 넘김)
+    start, end = (time_to_minutes(t) for t in window)
+    minute = np.arange(RULE_MINUTES) % 1440
+    return (minute >= start) & (minute < end) if start < end else (minute >= start) | (minute < end)
+
+def _prefix_sum(mask):
+    # prefix[m] = [0, m) 구간에서 mask가 참인 분 수 → 구간 [s, e)의 분 수는 prefix[e] - prefix[s]
+    return np.concatenate([[0], np.cumsum(mask, dtype=np.int32)])
+
+def compile_duration_rules(rules):
+    """
+    duration_rules 설정을 한 번만 분 단위 누적합 표로 변환.
+    - night / breaks: 심야 구간, 휴게시간 구간 목록 (근무 분에서 휴게시간은 제외)
+    - kinds: 구분별 정취 기준과 버킷 이름
+      regular_window(구간 안 근무가 정취, 평일 근무시간) 또는 regular_minutes(시작부터 근무 N분까지 정취, 휴일)
+      buckets: regular_day / regular_night / extra_day / extra_night → DURATION_MAPPING 키
+    - work_support: 순근무 min_minutes분 이상이면 hours 부여
+    """
+    working = np.ones(RULE_MINUTES, dtype=bool)
+    for window in rules.get("breaks", ()):
+        working &= ~_rule_window(window)
+    night = working & _rule_window(rules["night"])
+
+    kinds = {}
+    for kind, rule in rules["kinds"].items():
+        entry = {"buckets": rule["buckets"], "regular_minutes": rule.get("regular_minutes", 0)}
+        if "regular_window" in rule:
+            regular = working & _rule_window(rule["regular_window"])
+            entry["regular_work"] = _prefix_sum(regular)
+            entry["regular_night"] = _prefix_sum(regular & night)
+        kinds[kind] = entry
+    return {"work": _prefix_sum(working), "night": _prefix_sum(night), "kinds": kinds, "work_support": rules.get("work_support")}
+
+def rule_durations(rules, kind, start, end):
+    """
+    구분 kind 행들의 시작/종료(자정 기준 분 배열)로 근무시간 버킷을 한 번에 계산.
+    (유효 여부, 순근무 분, 총 분, {DURATION_MAPPING 키: 시간 배열(소수 둘째 자리)}) 반환.
+    시작/종료가 변환 실패이거나 같으면 유효하지 않음 (그 행의 값은 0).
+    """
+    start = np.asarray(start, dtype=np.int64)
+    end = np.asarray(end, dtype=np.int64)
+    valid = (start >= 0) & (end >= 0) & (start != end)
+    s = np.where(valid, start, 0)
+    e = np.where(valid, np.where(end > start, end, end + 1440), 0)
+
+    work, night, rule = rules["work"], rules["night"], rules["kinds"][kind]
+    net = work[e] - work[s]
+    night_total = night[e] - night[s]
+    if "regular_work" in rule:
+        regular = rule["regular_work"][e] - rule["regular_work"][s]
+        regular_night = rule["regular_night"][e] - rule["regular_night"][s]
+    else:
+        # 시작부터 근무 regular_minutes분이 채워지는 시각까지가 정취 (휴게시간은 세지 않음)
+        cut = np.minimum(np.searchsorted(work, work[s] + rule["regular_minutes"], side="left"), e)
+        regular = work[cut] - work[s]
+        regular_night = night[cut] - night[s]
+
+    buckets = rule["buckets"]
+    minutes = {
+        buckets["regular_day"]: regular - regular_night,
+        buckets["regular_night"]: regular_night,
+        buckets["extra_day"]: net - regular - (night_total - regular_night),
+        buckets["extra_night"]: night_total - regular_night,
+    }
+    hours = {key: np.round(value / 60, 2) for key, value in minutes.items()}
+    if rules["work_support"]:
+        support = rules["work_support"]
+        hours["work_support"] = np.where(net >= support["min_minutes"], float(support["hours"]), 0.0)
+    return valid, net, e - s, hours
+
+def _hhmm(minutes):
+    # 분 배열 → HHMM 정수 (신청시간 "1720" → 1720과 비교)
+    return minutes // 60 * 100 + minutes % 60
+
+def _work_time_numbers(work_time):
+    # 정규화한 신청시간("HHMM") → 정수, 네 자리 숫자가 아니면 -1
+    codes, uniques = pd.factorize(work_time)
+    numbers = np.array([int(v) if len(v) == 4 and v.isdigit() else -1 for v in uniques] + [-1], dtype=np.int64)
+    return numbers[codes]
+
+def _precheck_rules(df, pattern_index, times=None):
+    """
+    패턴 목록 대신 duration_rules로 판정 (벡터화).
+    - 시작/종료: 변환할 수 있고 서로 다르면 어떤 구간이든 허용 (자정 넘김 포함)
+    - 신청시간: 휴게시간을 뺀 순근무 또는 총 근무시간(HHMM)과 같아야 함
+    - 지각/조퇴와 예외패턴: 패턴 방식과 같은 조건 (패턴 시작/종료 대신 행의 시작/종료)
+    근무시간 컬럼에는 0이 아닌 버킷만 기재하고, 실패사유 문구는 패턴 방식과 같은 형식임.
+    """
+    rules = pattern_index["rules"]
+    if rules is None:
+        raise ValueError("patterns.json에 duration_rules 설정이 없습니다.")
+    times = precheck_time_columns(df) if times is None else times
+    result, target = _precheck_screen(df, rules["kinds"])
+
+    kinds = df["구분"].to_numpy()
+    work_time = _work_time_numbers(_normalize_work_time(df["신청시간"]))
+    columns = {excel_col: df[excel_col].to_numpy(dtype=object).copy() for excel_col, _ in DURATION_MAPPING.values()}
+    for kind in rules["kinds"]:
+        rows = np.flatnonzero(target & (kinds == kind))
+        if not len(rows):
+            continue
+        start, end, goto, getoff = (times[col].to_numpy()[rows].astype(np.int64) for col in PRECHECK_TIME_COLUMNS)
+        valid, net, gross, hours = rule_durations(rules, kind, start, end)
+
+        comparable = (goto >= 0) & (getoff >= 0) & (start >= 0) & (end >= 0)
+        special = comparable & (getoff >= end) & (start == SPECIAL_START_TIME) & (
+            (kind == "시간외근무") & np.isin(end, SPECIAL_OVERTIME_END_TIMES) & (goto < SPECIAL_OVERTIME_GOTO_LIMIT) |
+            (kind == "휴일근무") & (goto >= SPECIAL_HOLIDAY_GOTO_FROM)
+        )
+        reasons = pd.DataFrame({
+            "시작시간 불일치": start < 0,
+            "종료시간 불일치": (end < 0) | (start == end),
+            "신청시간 불일치": valid & (work_time[rows] != _hhmm(net)) & (work_time[rows] != _hhmm(gross)),
+            "지각,조퇴 기타사유": ~((comparable & (goto < start) & (getoff >= end)) | special),
+        })
+        matched = ~reasons.to_numpy().any(axis=1)
+        result[rows[matched]] = "작업가능"
+        result[rows[~matched]] = _failure_messages(reasons, ~matched)
+
+        for key, values in hours.items():
+            fill = matched & (values > 0)
+            if fill.any():
+                excel_col, _ = DURATION_MAPPING[key]
+                columns[excel_col][rows[fill]] = values[fill].tolist()
+
+    for excel_col, column in columns.items():
+        df[excel_col] = column
+    return pd.Series(result, index=df.index)
+
+def crosscheck_duration_rules(json_path):
+    """
+    patterns.json의 모든 패턴을 duration_rules로 다시 계산해 비교.
+    신청시간 목록(순근무/총 근무 HHMM)과 duration(0인 항목은 없는 항목과 같게 봄)이 다른 패턴 목록을 반환.
+    """
+    pattern_index = load_pattern_index(json_path)
+    rules = pattern_index["rules"]
+    if rules is None:
+        raise ValueError("patterns.json에 duration_rules 설정이 없습니다.")
+
+    mismatches = []
+    for kind, patterns in pattern_index["groups"].items():
+        for pattern in patterns:
+            expected = {key: value for key, value in pattern["duration"].items() if value}
+            if kind not in rules["kinds"]:
+                mismatches.append({"구분": kind, "pattern": pattern, "rules": None})
+                continue
+            valid, net, gross, hours = rule_durations(rules, kind, [pattern["start"]], [pattern["end"]])
+            computed = {key: float(values[0]) for key, values in hours.items() if values[0]}
+            work_times = {f"{_hhmm(int(net[0])):04d}", f"{_hhmm(int(gross[0])):04d}"}
+            same_duration = expected.keys() == computed.keys() and all(
+                abs(expected[key] - computed[key]) < 1e-9 for key in expected
+            )
+            if not valid[0] or not same_duration or work_times != set(pattern["work_times"]):
+                mismatches.append({
+                    "구분": kind, "pattern": pattern,
+                    "rules": {"work_times": sorted(work_times), "duration": computed},
+                })
+    return mismatches
+
+def report_duration_rules(json_path):
+    """규칙 대조 결과 출력. 모든 패턴이 같으면 True."""
+    mismatches = crosscheck_duration_rules(json_path)
+    total = sum(len(patterns) for patterns in load_pattern_index(json_path)["groups"].values())
+    for item in mismatches:
+        pattern = item["pattern"]
+        start, end = (f"{m // 60:02d}:{m % 60:02d}" for m in (pattern["start"], pattern["end"]))
+        print(f"❌ {item['구분']} {start}~{end}: 패턴 {sorted(pattern['work_times'])} {pattern['duration']} "
+              f"→ 규칙 {item['rules']}")
+    if mismatches:
+        print(f"⚠️ duration_rules 대조: 패턴 {total}개 중 {len(mismatches)}개 불일치")
+    else:
+        print(f"✅ duration_rules 대조: 패턴 {total}개 모두 일치")
+    return not mismatches
+
+# 사전검사에 필요한 입력 컬럼 (parallel 방식에서 작업 프로세스로 보내는 컬럼)
+PRECHECK_INPUT_COLUMNS = ["구분", "성명", "시작", "종료", "신청시간", "출근", "퇴근"]
+
+_worker_pattern_index = None
+
+def _init_precheck_worker(pattern_index):
+    # 작업 프로세스 시작 시 한 번만 컴파일된 패턴 인덱스를 받아 둠
+    global _worker_pattern_index
+    _worker_pattern_index = pattern_index
+
+def _precheck_chunk(chunk, engine):
+    """작업 프로세스: 묶음 하나를 판정해 작업여부 + duration 컬럼만 돌려줌."""
+    chunk = chunk.copy()
+    duration_columns = [excel_col for excel_col, _ in DURATION_MAPPING.values()]
+    for col in duration_columns:
+        chunk[col] = ""
+    if engine == "row":
+        result = _precheck_rows(chunk, _worker_pattern_index)
+    else:
+        result = _precheck_vectorized(chunk, _worker_pattern_index)
+    return result.to_numpy(dtype=object), {col: chunk[col].to_numpy(dtype=object) for col in duration_columns}
 
-def precheck_and_save_attendance_possibility(excel_path: str, json_path: str, output_path: str):
+def _precheck_parallel(df, pattern_index, workers=None, engine=None):
     """
-    '작업확인서_신청결과_정리자동.xlsx'의 구분(B열)에 따라
+    행을 순서대로 묶음으로 나눠 프로세스 풀에서 판정하고, 결과를 원래 순서대로 이어 붙임.
+    패턴 인덱스는 프로세스마다 initializer로 한 번만 전달하고, 묶음에는 입력 컬럼만 실어 보냄.
+    행이 적거나 작업 프로세스가 1개면 같은 방식으로 현재 프로세스에서 판정함 (결과는 serial과 동일).
+    """
+    workers = workers or PRECHECK_WORKERS
+    engine = engine or PRECHECK_PARALLEL_ENGINE
+    serial = _precheck_rows if engine == "row" else _precheck_vectorized
+    if workers <= 1 or len(df) < PRECHECK_PARALLEL_MIN_ROWS:
+        return serial(df, pattern_index)
+
+    _pattern_frame(pattern_index)  # 조인용 패턴 표도 미리 만들어 함께 보냄
+    inputs = df[PRECHECK_INPUT_COLUMNS]
+    bounds = np.linspace(0, len(df), workers * PRECHECK_CHUNKS_PER_WORKER + 1, dtype=int)
+    chunks = [inputs.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_precheck_worker, initargs=(pattern_index,)) as pool:
+        parts = list(pool.map(_precheck_chunk, chunks, [engine] * len(chunks)))
+
+    for excel_col, _ in DURATION_MAPPING.values():
+        df[excel_col] = np.concatenate([durations[excel_col] for _, durations in parts])
+    return pd.Series(np.concatenate([result for result, _ in parts]), index=df.index)
+
+def precheck_attendance(df: pd.DataFrame, json_path: str, mode: str = PRECHECK_MODE):
+    """
+    정리된 작업확인서 DataFrame의 구분(B열)에 따라
     holidaywork_patterns 또는 overtime_patterns와 비교하여
-    '작업가능' 또는 '작업불가능'을 '작업여부' 컬럼(O열)에 삽입하고 저장함.
+    '작업가능' 또는 '작업불가능'을 '작업여부' 컬럼(O열)에 넣은 사본을 반환함.
+
+    mode: "vector"(일괄 판정), "row"(행 단위 기준 구현), "verify"(두 방식 결과 대조 후 vector 결과 사용),
+          "parallel"(PRECHECK_WORKERS개 프로세스로 나눠 판정, 결과는 serial과 동일),
+          "rules"(패턴 목록 대신 duration_rules 구간 계산으로 판정)
     """
-    df = pd.read_excel(excel_path)
+    df = df.copy()
 
     for col in ["평일정취", "평일연장", "평일심야정취", "평일심야연장", "특근정취", "특근심야정취", "특근연장", "특근심야연장", "유급휴가", "지각"]:
         df[col] = ""
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        pattern_data = json.load(f)
-
-    holiday_patterns = pattern_data["holidaywork_patterns"]
-    overtime_patterns = pattern_data["overtime_patterns"]
+    # 새 문서가 없는 실행(빈 표, 입력 컬럼 없음)은 판정할 행이 없음
+    if df.empty:
+        df["작업여부"] = pd.Series(dtype=object, index=df.index)
+        return df
 
-    def check_row(row):
-        #예외설정(장태근, 김규환)
-        if row["성명"] in["장태근", "김규환", "이법훈", "배종태", "천국식", "손성호"]:
-            return "예외설정"
-
-        # 출근/퇴근 필수 체크
-        if pd.isna(row["출근"]) or pd.isna(row["퇴근"]) or str(row["출근"]).strip() == "" or str(row["퇴근"]).strip() == "":
-            return "출/퇴근시간 공란"
-
-        start_time = str_to_time(row["시작"])
-        end_time = str_to_time(row["종료"])
-        work_time = str(row["신청시간"]).strip().replace(":", "").replace(".", "").zfill(4)
-        goto_time = str_to_time(row["출근"])
-        getoff_time = str_to_time(row["퇴근"])
-
-        # 근무유형에 따라 비교할 패턴 선택
-        if row["구분"] == "휴일근무":
-            patterns = holiday_patterns
-        elif row["구분"] == "시간외근무":
-            patterns = overtime_patterns
-        else:
-            return "휴일,시간외근무 외 패턴"
+    pattern_index = load_pattern_index(json_path)
 
-        matched = False
-        failure_reasons = [] # 최종 실패 이유 수집
+    if mode == "parallel":
+        df["작업여부"] = _precheck_parallel(df, pattern_index)
+        return df
 
-        # 패턴 비교
-        for pattern in patterns:
-            pattern_start = str_to_time(pattern["start"])
-            pattern_end = str_to_time(pattern["end"])
-
-            reasons = [] # 현재 패턴에 대한 실패 이유
-
-            if start_time != pattern_start:
-                reasons.append("시작시간 불일치")
-            if end_time != pattern_end:
-                reasons.append("종료시간 불일치")
-            if work_time not in pattern["work_times"]:
-                reasons.append("신청시간 불일치")
-            if not (
-                 (goto_time < pattern_start and getoff_time >= pattern_end) or # 엑셀 '출근'이 패턴 '시작' 초과,  엑셀 '퇴근'이 패턴 '종료' 이상이거나
-                is_special_pattern_exception(row, pattern_start, pattern_end) # 예외패턴이면
-            ):
-                reasons.append("지각,조퇴 기타사유")
-
-            if not reasons:
-                #모든 조건 통과!
-                for key, value in pattern["duration"].items():
-                    if key in DURATION_MAPPING:
-                        excel_col, _ = DURATION_MAPPING[key]
-                        df.at[row.name, excel_col] = value
-                matched = True
-                break
+    times = precheck_time_columns(df)
+    if mode == "rules":
+        df["작업여부"] = _precheck_rules(df, pattern_index, times)
+    elif mode == "row":
+        df["작업여부"] = _precheck_rows(df, pattern_index, times)
+    else:
+        reference = df.copy() if mode == "verify" else None
+        df["작업여부"] = _precheck_vectorized(df, pattern_index, times)
+
+        if reference is not None:
+            reference["작업여부"] = _precheck_rows(reference, pattern_index, times)
+            mismatched = ~((reference == df) | (reference.isna() & df.isna())).all(axis=1)
+            if mismatched.any():
+                print(f"⚠️ 사전검사 방식 간 결과 불일치 {mismatched.sum()}건: 행 {list(df.index[mismatched][:20])}")
             else:
-                failure_reasons.append(reasons) # 현재 패턴 실패이유 누적
-                
-        if matched:
-            return "작업가능"
-        else:
-            if failure_reasons:
-                shortest_reason = min(failure_reasons, key=lambda x: len(x))
-                return f"패턴불일치({', '.join(shortest_reason)})"
+                print("✅ 사전검사 방식 간 결과 일치 (row == vector)")
+
+    return df
 
-    df["작업여부"] = df.apply(check_row, axis=1)
-    df.to_excel(output_path, index=False)
+def precheck_and_save_attendance_possibility(excel_path: str, json_path: str, output_path: str, mode: str = PRECHECK_MODE):
+    """
+    '작업확인서_신청결과_정리자동.xlsx'를 읽어 precheck_attendance로 판정하고 저장함.
+    """
+    df = precheck_attendance(pd.read_excel(excel_path), json_path, mode)
+    write_frame(df, output_path)
     print(f"✅ 저장 완료: {output_path}")
 
     return df
 
 
+# ──────────────────────────────────────────────────────────────
+# HRMS 프레임 전환 (현재 프레임 경로를 기억해 바뀔 때만 전환)
+# ──────────────────────────────────────────────────────────────
+HRMS_CONTENT_FRAME = "Iframe_myIBTab1_divIBTabItem_1_Content"
+HRMS_TOP_FRAMES = (HRMS_CONTENT_FRAME, "topF")
+HRMS_BOTTOM_FRAMES = (HRMS_CONTENT_FRAME, "bottomF")
+
+def _is_stale_frame_error(e):
+    # 기억한 프레임이 더 이상 유효하지 않을 때(프레임 재로딩/분리, 다른 문서) 나는 오류
+    if isinstance(e, (NoSuchFrameException, StaleElementReferenceException, TimeoutException)):
+        return True
+    message = str(e).lower()
+    return any(text in message for text in ("frame", "execution context", "is not defined"))
+
+class FrameContext:
+    """
+    HRMS 화면의 현재 프레임 경로(예: (Iframe_..., bottomF))를 기억해,
+    같은 경로면 전환을 생략하고 공통 상위 프레임까지만 되돌아가 필요한 만큼만 전환.
+    기억한 경로가 무효(stale)하면 run()에서 한 번 처음부터 다시 진입해 재시도함.
+    """
+    def __init__(self):
+        self.path = None          # 현재 프레임 경로 (None: 알 수 없음 → 최상위부터 진입)
+        self.switch_count = 0     # 실제 수행한 전환 횟수
+        self.saved_count = 0      # 기존 방식(매번 최상위부터 진입) 대비 생략한 전환 횟수
+        self.revalidate_count = 0 # 무효 감지 후 재진입 횟수
+
+    def invalidate(self):
+        # 창 전환, 페이지 이동 등으로 현재 프레임을 알 수 없게 되면 호출
+        self.path = None
 
+    def enter(self, path):
+        path = tuple(path)
+        full_cost = len(path) + 1  # default_content + 프레임 단계 수
+
+        try:
+            if self.path is None:
+                driver.switch_to.default_content()
+                common, cost = 0, 1
+            else:
+                common = 0
+                while common < min(len(self.path), len(path)) and self.path[common] == path[common]:
+                    common += 1
+                for _ in range(len(self.path) - common):
+                    driver.switch_to.parent_frame()
+                cost = len(self.path) - common
+
+            self.path = path[:common]
+            for name in path[common:]:
+                wait_for(EC.frame_to_be_available_and_switch_to_it((By.NAME, name)), "frame")
+                self.path += (name,)
+        except Exception:
+            # 전환 도중 실패하면 현재 프레임을 알 수 없으므로 다음 진입은 최상위부터
+            self.path = None
+            raise
+        cost += len(path) - common
+
+        self.switch_count += cost
+        self.saved_count += full_cost - cost
+
+    def run(self, path, action):
+        """
+        path 프레임에서 action() 실행. 기억한 프레임이 무효하면(전환 실패/대기 초과 포함)
+        최상위부터 다시 진입해 1회 재시도.
+        """
+        remembered, entered = self.path is not None, False
+        try:
+            self.enter(path)
+            entered = True
+            return action()
+        except Exception as e:
+            if not (_is_stale_frame_error(e) or (remembered and not entered)):
+                raise
+            self.revalidate_count += 1
+            self.invalidate()
+            self.enter(path)
+            return action()
+
+    def report(self):
+        total = self.switch_count + self.saved_count
+        if total:
+            print(f"\n🪟 프레임 전환 {self.switch_count}회 수행 / {self.saved_count}회 생략 "
+                  f"({self.saved_count / total:.0%} 절감), 재진입 {self.revalidate_count}회")
+
+frames = FrameContext()
 
 # ──────────────────────────────────────────────────────────────
 # HRMS 자동화 함수 (구현 예정 단계 포함)
@@ -533,13 +2416,14 @@ def precheck_and_save_attendance_possibility(excel_path: str, json_path: str, ou
 def login_hrms():
     print("🔄 [1] 통합인사시스템 로그인 중...")
     driver.get(LOGIN_HRMS_URL)
-    wait.until(EC.presence_of_element_located((By.ID, "login_id"))).send_keys(USERNAME)
+    frames.invalidate()
+    wait_for(EC.presence_of_element_located((By.ID, "login_id")), "hrms_login_form").send_keys(USERNAME)
     driver.find_element(By.ID, "passwd").send_keys(HRMS_PASSWORD)
     login_button = driver.find_element(By.CLASS_NAME, "btn_login")
     driver.execute_script("arguments[0].click();", login_button)
 
     try:
-        WebDriverWait(driver, 5).until(EC.alert_is_present())
+        wait_for(EC.alert_is_present(), "alert")
         alert = driver.switch_to.alert
         print(f"❌ 로그인 실패: {alert.text}")
         alert.accept()
@@ -547,7 +2431,7 @@ def login_hrms():
     except:
         pass
 
-    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    wait_for(EC.presence_of_element_located((By.TAG_NAME, "body")), "hrms_login")
     print("✅ 로그인 성공!")
     return True
 
@@ -555,18 +2439,23 @@ def set_hrms_role_if_needed():
     print("🔄 [2] 로그인 설정 '업무담당자'로 변경 중...")
     # 업무담당자가 이미 선택되어 있는지 확인하고, 없으면 설정
     driver.execute_script("onLoginAuthority();")
-    WebDriverWait(driver, 10).until(lambda d: len(d.window_handles) > 1)
+    frames.invalidate()
+    wait_for(lambda d: len(d.window_handles) > 1, "popup_window")
     original_window = driver.current_window_handle
     new_window = driver.window_handles[-1]
     driver.switch_to.window(new_window)
     print("✅ 로그인 권한 설정 창으로 전환 완료!")
 
-    WebDriverWait(driver, 10).until(EC.frame_to_be_available_and_switch_to_it((By.NAME, "bottomF")))
+    wait_for(EC.frame_to_be_available_and_switch_to_it((By.NAME, "bottomF")), "frame")
     print("✅ 'bottomF' 프레임 전환 완료!")
-    WebDriverWait(driver, 10).until(lambda d: d.execute_script("return document.readyState") == "complete")
-    time.sleep(5)
-
-    row = wait.until(EC.presence_of_element_located((By.XPATH, "//td[contains(text(), '업무담당자')]/parent::tr")))
+    wait_for(document_ready, "document_ready")
+
+    # 권한 그리드가 그려져 '업무담당자' 행의 선택 셀까지 나타날 때까지 대기
+    wait_for(
+        EC.presence_of_element_located((By.XPATH, "//td[contains(text(), '업무담당자')]/parent::tr//td[contains(@class, 'GMBool')]")),
+        "role_grid"
+    )
+    row = driver.find_element(By.XPATH, "//td[contains(text(), '업무담당자')]/parent::tr")
     print("✅ '업무담당자' 행 찾기 완료!")
 
     login_auth_td = row.find_element(By.XPATH, ".//td[contains(@class, 'GMBool')]")
@@ -578,17 +2467,17 @@ def set_hrms_role_if_needed():
 
     driver.execute_script("arguments[0].click();", login_auth_td)
     ActionChains(driver).move_to_element(login_auth_td).click().perform()
-    time.sleep(1)
     print("✅ 로그인권한 선택 클릭 및 선택 적용 완료!")
 
-    save_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//img[contains(@src, 'b_save.gif')]")))
+    save_button = wait_for(EC.element_to_be_clickable((By.XPATH, "//img[contains(@src, 'b_save.gif')]")), "role_save")
     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", save_button)
     driver.execute_script("arguments[0].click();", save_button)
 
-    WebDriverWait(driver, 5).until(EC.alert_is_present()).accept()
-    time.sleep(2)
-    WebDriverWait(driver, 5).until(EC.alert_is_present()).accept()
-    time.sleep(2)
+    # 저장 확인 → 저장 완료 알림을 차례로 수락하고, 알림이 모두 닫힐 때까지 대기
+    wait_for(EC.alert_is_present(), "alert").accept()
+    wait_for(EC.alert_is_present(), "alert").accept()
+    wait_for(no_alert_present, "alert", required=False)
+    wait_for(document_ready, "document_ready", required=False)
     print("✅ 저장 완료!")
 
     driver.close()
@@ -597,20 +2486,30 @@ def set_hrms_role_if_needed():
 
 def go_to_attendance_management():
     print("🔄 [3] 근태관리화면 이동 중...")
+    frames.invalidate()
     driver.execute_script("subMenu('HRM_ODM')")
-    time.sleep(1)
+    wait_for(js_function_ready("menuAction"), "menu_ready")
     driver.execute_script("menuAction('/common/page/comm_menu_action.jsp?menu_id=279503&action_uri=/odm/page/odm_offdutyDay_01_f.jsp','02');")
 
     # ✅ frame 또는 iframe 중 하나가 뜰 때까지 대기
     try:
-        WebDriverWait(driver, 10).until(
+        wait_for(
             lambda d: len(d.find_elements(By.TAG_NAME, "frame")) > 0 or
-                      len(d.find_elements(By.TAG_NAME, "iframe")) > 0
+                      len(d.find_elements(By.TAG_NAME, "iframe")) > 0,
+            "frame"
         )
         print("✅ '일일근태관리' 메뉴로 이동 완료!")
     except Exception as e:
         print(f"❌ 프레임 로딩 실패: {e}")
 
+# mySheet 첫 데이터 행(3행)이 조회한 사번(빈 값이면 확인 생략)/기준일자의 것이면 true (조회 결과가 다시 불러와졌는지 확인)
+SHEET_SEARCH_DONE_SCRIPT = """
+if (typeof mySheet === 'undefined' || mySheet.RowCount() <= 0) return false;
+var r = typeof mySheet.HeaderRows === 'function' ? mySheet.HeaderRows() : 3;
+var baseDate = String(mySheet.GetCellValue(r, 'base_date') || '').replace(/\\D/g, '');
+return (!arguments[0] || String(mySheet.GetCellValue(r, 'per_no')) === arguments[0]) && baseDate === arguments[1];
+"""
+
 def search_user_in_hrms(emp_no: str, base_date: str):
     try:
         # 📌 기준일자 숫자만 남기기
@@ -621,18 +2520,8 @@ def search_user_in_hrms(emp_no: str, base_date: str):
         # 📌 정산년월: 앞 6자리만
         jungsan_ym = numeric_date[:6]
 
-        # ✅ 프레임 초기화
-        driver.switch_to.default_content()
-
-        # ✅ 1단계: 바깥 프레임 진입 (Iframe_myIBTab1_divIBTabItem_1_Content)
-        WebDriverWait(driver, 10).until(
-            EC.frame_to_be_available_and_switch_to_it((By.NAME, "Iframe_myIBTab1_divIBTabItem_1_Content"))
-        )
-
-        # ✅ 2단계: 내부 프레임 진입 (topF)
-        WebDriverWait(driver, 10).until(
-            EC.frame_to_be_available_and_switch_to_it((By.NAME, "topF"))
-        )
+        # ✅ 조회 프레임(Iframe_myIBTab1_divIBTabItem_1_Content > topF) 진입 (이미 있으면 생략)
+        frames.run(HRMS_TOP_FRAMES, lambda: wait_for(EC.presence_of_element_located((By.ID, "per_no")), "hrms_search_form"))
 
         # 사번 입력 + onchange 트리거
         script = f"""
@@ -660,6 +2549,11 @@ def search_user_in_hrms(emp_no: str, base_date: str):
         search_button = driver.find_element(By.NAME, "Search_button")
         driver.execute_script("arguments[0].click();", search_button)
 
+        # 조회 결과가 그리드에 다시 불러와질 때까지 대기 (이전 사번 행에 입력하지 않도록, 프레임 전환에 기대지 않음)
+        frames.run(HRMS_BOTTOM_FRAMES, lambda: wait_for(
+            lambda d: d.execute_script(SHEET_SEARCH_DONE_SCRIPT, emp_no, re.sub(r"\D", "", base_date)), "hrms_search_result"
+        ))
+
         print(f"✅ 사용자 조회 성공: 사번={emp_no}, 기준일자={base_date}")
         return True
 
@@ -667,59 +2561,43 @@ def search_user_in_hrms(emp_no: str, base_date: str):
         print(f"❌ 사용자 조회 실패: {e}")
         return False
 
-def apply_attendance_type_code(code_name: str):
-    try:
-        # ✅ 프레임 초기화
-        driver.switch_to.default_content()
-
-        # ✅ 1단계: 바깥 프레임 진입 (Iframe_myIBTab1_divIBTabItem_1_Content)
-        WebDriverWait(driver, 10).until(
-            EC.frame_to_be_available_and_switch_to_it((By.NAME, "Iframe_myIBTab1_divIBTabItem_1_Content"))
-        )
-
-        # ✅ 2단계: 내부 프레임 진입 (topF)
-        WebDriverWait(driver, 10).until(
-            EC.frame_to_be_available_and_switch_to_it((By.NAME, "bottomF"))
-        )
+# 근태코드 매핑표
+ATTENDANCE_TYPE_CODES = {
+    "특근": "900",
+    "철야": "800",
+}
 
-        # 코드 매핑표
-        code_map = {
-            "특근": "900",
-            "철야": "800",
-        }
+def resolve_attendance_code(row: pd.Series):
+    # 행에 반영할 근태코드 이름 (휴일근무 → 특근, 07:00~00:20 시간외근무/특근 → 철야), 없으면 None
+    code_name = None
+    if row.get("구분") == "휴일근무":
+        code_name = "특근"
+    if row.get("시작") == "07:00" and row.get("종료") == "00:20" and row.get("구분") in ["시간외근무", "특근"]:
+        code_name = "철야"
+    return code_name
 
-        if code_name not in code_map:
+def apply_attendance_type_code(code_name: str):
+    try:
+        if code_name not in ATTENDANCE_TYPE_CODES:
             print(f"⚠️ 근태코드 '{code_name}'은(는) 지원되지 않음. 반영 생략.")
             return
 
-        code = code_map[code_name]
-        driver.execute_script(f"mySheet.SetCellValue(3, 'odm_cd', '{code}');")
+        # ✅ 그리드 프레임(Iframe_myIBTab1_divIBTabItem_1_Content > bottomF)에서 반영
+        code = ATTENDANCE_TYPE_CODES[code_name]
+        frames.run(HRMS_BOTTOM_FRAMES, lambda: driver.execute_script(f"mySheet.SetCellValue(3, 'odm_cd', '{code}');"))
         print(f"✅ 근태코드 '{code_name}' ({code}) 반영 완료!")
 
     except Exception as e:
         print(f"❌ 근태코드 반영 실패: {e}")
 
 def apply_attendance_hours(row: pd.Series):
-    # 프레임 진입
+    # 프레임 진입 + IBSheet 로드 대기
     try:
-        driver.switch_to.default_content()
-        WebDriverWait(driver, 10).until(
-            EC.frame_to_be_available_and_switch_to_it((By.NAME, "Iframe_myIBTab1_divIBTabItem_1_Content"))
-        )
-        WebDriverWait(driver, 10).until(
-            EC.frame_to_be_available_and_switch_to_it((By.NAME, "bottomF"))
-        )
+        frames.run(HRMS_BOTTOM_FRAMES, lambda: wait_for(
+            lambda d: d.execute_script("return typeof mySheet !== 'undefined'"), "ibsheet_load"
+        ))
     except Exception as e:
-        print(f"❌ 프레임 진입 실패: {e}")
-        return
-
-    # IBSheet 로드 대기
-    try:
-        WebDriverWait(driver, 10).until(
-            lambda d: d.execute_script("return typeof mySheet !== 'undefined'")
-        )
-    except Exception as e:
-        print(f"❌ IBSheet 로드 실패: {e}")
+        print(f"❌ 프레임 진입 또는 IBSheet 로드 실패: {e}")
         return
 
     if row["작업여부"] != "작업가능":
@@ -735,37 +2613,36 @@ def apply_attendance_hours(row: pd.Series):
             except Exception as e:
                 print(f"❌ 반영 실패: {col_name} → {e}")
 
+def submit_sheet_save():
+    """bottomF 프레임에서 저장 버튼 클릭 후 두 번의 알림을 수락하고, 저장 완료 알림 문구를 반환."""
+    # 저장 버튼 클릭
+    save_btn = wait_for(EC.element_to_be_clickable((By.ID, "btn_save")), "save_button")
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", save_btn)
+    save_btn.click()
+
+    # 저장 확인 알림 처리
+    wait_for(EC.alert_is_present(), "alert")
+    alert = driver.switch_to.alert
+    #print(f"💬 1차 알림: {alert.text}")
+    alert.accept()
+
+    # 저장 완료 알림 처리
+    wait_for(EC.alert_is_present(), "alert")
+    alert = driver.switch_to.alert
+    message = alert.text
+    #print(f"💬 2차 알림: {message}")
+    alert.accept()
+
+    # 저장 후 재조회가 끝나 IBSheet 변경 표시가 사라질 때까지 대기
+    wait_for(ibsheet_idle, "ibsheet_idle", required=False)
+    return message
+
 def save_attendance(df: pd.DataFrame, idx: int):
     try:
-        # 프레임 진입 (이미 이전에 들어가 있었으면 생략 가능하지만, 안전하게 다시 진입)
-        driver.switch_to.default_content()
-        WebDriverWait(driver, 10).until(
-            EC.frame_to_be_available_and_switch_to_it((By.NAME, "Iframe_myIBTab1_divIBTabItem_1_Content"))
-        )
-        WebDriverWait(driver, 10).until(
-            EC.frame_to_be_available_and_switch_to_it((By.NAME, "bottomF"))
-        )
+        # 프레임 진입 (이미 bottomF에 있으면 생략, 저장 버튼 확인으로 프레임 유효성 검증)
+        frames.run(HRMS_BOTTOM_FRAMES, lambda: wait_for(EC.element_to_be_clickable((By.ID, "btn_save")), "save_button"))
 
-        # 저장 버튼 클릭
-        save_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "btn_save"))
-        )
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", save_btn)
-        save_btn.click()
-
-        # 저장 확인 알림 처리
-        WebDriverWait(driver, 5).until(EC.alert_is_present())
-        alert = driver.switch_to.alert
-        #print(f"💬 1차 알림: {alert.text}")
-        alert.accept()
-        time.sleep(1)
-
-        # 저장 완료 알림 처리
-        WebDriverWait(driver, 5).until(EC.alert_is_present())
-        alert = driver.switch_to.alert
-        #print(f"💬 2차 알림: {alert.text}")
-        alert.accept()
-        time.sleep(1)
+        submit_sheet_save()
 
         df.at[idx, "완료여부"] = "성공"
         print("✅ 저장 완료")
@@ -776,100 +2653,645 @@ def save_attendance(df: pd.DataFrame, idx: int):
         print(f"❌ 저장 실패: {e}")
 
 # ──────────────────────────────────────────────────────────────
-# 메인 실행 흐름
+# HRMS 일괄 반영 (기준일자별 1회 조회/저장)
 # ──────────────────────────────────────────────────────────────
+# 반영 방식: "row"(행마다 조회/반영/저장), "batch"(기준일자별로 대상자를 한 번에 반영 후 1회 저장)
+HRMS_APPLY_MODE = "row"
+
+# diff 방식: 조회한 mySheet 값이 반영할 근태코드/근무시간과 이미 같으면 저장(알림 2회)을 생략하고 아래 문구 기재
+HRMS_SKIP_UNCHANGED = True
+HRMS_UNCHANGED_RESULT = "성공(변경없음)"
+
+# mySheet에서 항목의 행 번호를 찾는 공용 스크립트 (없거나 하나로 정해지지 않으면 -1)
+# - 항목에 base_date가 있으면 기준일자가 다른 행(이전 조회 결과)은 제외
+# - 같은 사번 행이 여러 개면 근태코드(odm_cd)가 같은 행이 하나일 때만 그 행
+SHEET_ROW_LOOKUP_JS = """
+var first = typeof mySheet.HeaderRows === 'function' ? mySheet.HeaderRows() : 3;
+var last = typeof mySheet.LastRow === 'function' ? mySheet.LastRow() : first + mySheet.RowCount() - 1;
+var rowsOf = {};
+for (var r = first; r <= last; r++) {
+    var perNo = String(mySheet.GetCellValue(r, 'per_no'));
+    (rowsOf[perNo] = rowsOf[perNo] || []).push(r);
+}
+function sheetRowOf(item) {
+    var rows = (rowsOf[item.per_no] || []).filter(function (r) {
+        var baseDate = String(mySheet.GetCellValue(r, 'base_date') || '').replace(/\\D/g, '');
+        return !item.base_date || !baseDate || baseDate === item.base_date;
+    });
+    if (rows.length > 1 && item.odm_cd) {
+        rows = rows.filter(function (r) { return String(mySheet.GetCellValue(r, 'odm_cd')) === String(item.odm_cd); });
+    }
+    return rows.length === 1 ? rows[0] : -1;
+}
+"""
+
+# 항목별 행을 찾아 근태코드/근무시간을 한 번에 입력. 항목별 행 번호(없으면 -1) 반환
+BATCH_SET_SCRIPT = SHEET_ROW_LOOKUP_JS + """
+return arguments[0].map(function (item) {
+    var r = sheetRowOf(item);
+    if (r < 0) return -1;
+    if (item.odm_cd) mySheet.SetCellValue(r, 'odm_cd', item.odm_cd);
+    for (var name in item.values) mySheet.SetCellValue(r, name, item.values[name]);
+    return r;
+});
+"""
+
+# 항목별 행을 찾아 입력 대상 컬럼의 현재 값과 행 상태를 읽음 (저장 전 diff 비교 / 저장 후 확인), 행이 없으면 null
+BATCH_READ_SCRIPT = SHEET_ROW_LOOKUP_JS + """
+return arguments[0].map(function (item) {
+    var r = sheetRowOf(item);
+    if (r < 0) return null;
+    var values = {};
+    for (var name in item.values) values[name] = mySheet.GetCellValue(r, name);
+    return {
+        odm_cd: String(mySheet.GetCellValue(r, 'odm_cd')),
+        values: values,
+        status: typeof mySheet.GetRowStatus === 'function' ? mySheet.GetRowStatus(r) : 'R'
+    };
+});
+"""
+
+# 조회 결과가 기준일자 arguments[0]의 것으로 다 불러와졌으면 행 수, 아니면(불러오는 중/이전 조회 결과) 0
+SHEET_LOADED_SCRIPT = """
+if (typeof mySheet === 'undefined' || mySheet.RowCount() <= 0) return 0;
+var first = typeof mySheet.HeaderRows === 'function' ? mySheet.HeaderRows() : 3;
+var last = typeof mySheet.LastRow === 'function' ? mySheet.LastRow() : first + mySheet.RowCount() - 1;
+for (var r = first; r <= last; r++) {
+    var baseDate = String(mySheet.GetCellValue(r, 'base_date') || '').replace(/\\D/g, '');
+    if (baseDate && baseDate !== arguments[0]) return 0;
+}
+return mySheet.RowCount();
+"""
 
-#로그인 정보 입력
-get_login_info()
-
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service)
-wait = WebDriverWait(driver, 10)
-
-login_groupware()
-go_to_received_documents()
-search_work_confirmation()
-dataframes, docnames = get_work_confirmation_documents()
-save_all_to_excel(dataframes, docnames)
-format_excel("작업확인서_신청결과.xlsx", "작업확인서_신청결과_정리자동.xlsx")
-precheck_and_save_attendance_possibility(
-    "작업확인서_신청결과_정리자동.xlsx",
-    "patterns.json",
-    "작업확인서_선별결과.xlsx"
-)
-login_hrms()
-set_hrms_role_if_needed()
-go_to_attendance_management()
-
-# 파일 읽기
-file_path = "작업확인서_선별결과.xlsx"
-df = pd.read_excel(file_path)
-df["완료여부"] = ""
-
-for idx, row in df.iterrows():
-    # 2. 작업가능 여부 확인
+def wait_sheet_loaded(base_date):
+    """기준일자 base_date(숫자 8자리)의 조회 결과가 mySheet에 불러와질 때까지 대기하고 행 수 반환."""
+    return frames.run(HRMS_BOTTOM_FRAMES, lambda: wait_for(
+        lambda d: d.execute_script(SHEET_LOADED_SCRIPT, base_date), "ibsheet_load"
+    ))
+
+def _sheet_value(value):
+    # IBSheet 입력값: 숫자로 바꿀 수 있으면 숫자로
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value).strip()
+
+def build_sheet_item(emp_no: str, row: pd.Series, base_date: str = ""):
+    """행 → mySheet 입력 항목 {per_no, base_date, odm_cd, values{savename: 값}}."""
+    code_name = resolve_attendance_code(row)
+    values = {}
+    for key, (col_name, savename) in DURATION_MAPPING.items():
+        value = row.get(col_name)
+        if pd.notna(value) and str(value).strip() != "":
+            values[savename] = _sheet_value(value)
+    return {
+        "per_no": emp_no, "base_date": re.sub(r"\D", "", base_date),
+        "odm_cd": ATTENDANCE_TYPE_CODES.get(code_name), "values": values,
+    }
+
+def _sheet_item_applied(item, current):
+    # 읽은 값이 입력 항목과 같고 행이 변경(미저장) 상태가 아니면 반영 완료 (저장 후 확인 / 저장 전 diff 비교 공용)
+    if current is None or current["status"] in ("U", "I"):
+        return False
+    if item["odm_cd"] and current["odm_cd"] != item["odm_cd"]:
+        return False
+    for name, value in item["values"].items():
+        saved = current["values"].get(name)
+        if isinstance(value, float):
+            try:
+                if abs(float(saved) - value) > 1e-6:
+                    return False
+            except (TypeError, ValueError):
+                return False
+        elif str(saved).strip() != value:
+            return False
+    return True
+
+def sheet_row_unchanged(item):
+    """
+    조회된 mySheet에서 항목의 사번 행을 읽어 반영할 값과 이미 같은지 확인 (스크립트 1회 읽기).
+    행이 나타나지 않으면(조회 결과 없음/지연) 변경이 필요한 것으로 봄.
+    """
+    current = frames.run(HRMS_BOTTOM_FRAMES, lambda: wait_for(
+        lambda d: d.execute_script(BATCH_READ_SCRIPT, [item])[0], "hrms_sheet_row", required=False
+    ))
+    return bool(current) and _sheet_item_applied(item, current)
+
+def hrms_target(idx, row: pd.Series):
+    """반영 대상 행이면 (사번, 근무일자), 아니면 사유를 출력하고 None."""
+    if row.get("완료여부"):
+        print(f"⏭️ 건너뜀: {row.get('성명')} / {row.get('사번')} → {row.get('완료여부')}")
+        return None
     if row.get("작업여부") != "작업가능":
         print(f"⏭️ 건너뜀: {row.get('성명')} / {row.get('사번')} → 작업불가능")
-        continue
+        return None
 
     emp_no = str(row.get("사번")).strip()
     work_date = str(row.get("근무일자")).strip()
 
     if not emp_no or not work_date:
         print(f"⚠️ 사번 또는 근무일자 누락 → 행 {idx+2} 건너뜀")
-        continue
+        return None
+    return emp_no, work_date
+
+def apply_rows_to_hrms_batch(df: pd.DataFrame):
+    """
+    작업가능 행을 기준일자(정산년월 포함)별로 묶어, 사번 없이 한 번 조회한 mySheet에
+    대상자 전원의 근태코드/근무시간을 스크립트 1회로 입력하고 한 번만 저장.
+    저장 후 행별 값을 다시 읽어 '완료여부'를 기재하며, 그리드에 없는 사번과 같은 날 사번이 겹치는 신청은 행 단위 방식으로 처리.
+    '완료여부'가 이미 채워진 행(이전 실행에서 반영)은 건너뜀.
+    """
+    groups = {}
+    for idx, row in df.iterrows():
+        target = hrms_target(idx, row)
+        if target:
+            emp_no, work_date = target
+            groups.setdefault(re.sub(r"\D", "", work_date), []).append((idx, emp_no, work_date, row))
+
+    fallback = []
+    for base_date, members in groups.items():
+        # 같은 날 같은 사번이 여러 건(구분이 다른 신청)이면 한 그리드 행에 겹쳐 쓰지 않도록 행 단위 방식으로 처리
+        per_no_counts = Counter(emp_no for _, emp_no, _, _ in members)
+        repeated = [member for member in members if per_no_counts[member[1]] > 1]
+        if repeated:
+            print(f"ℹ️ 기준일자 {base_date}: 같은 사번 여러 건 {len(repeated)}건 → 행 단위 처리")
+            fallback += repeated
+            members = [member for member in members if per_no_counts[member[1]] == 1]
+            if not members:
+                continue
+
+        print(f"▶️ 일괄 처리 중: 기준일자 {base_date} / {len(members)}건")
+        group_probe = metrics.probe()
+
+        if not search_user_in_hrms("", members[0][2]):
+            df.loc[[idx for idx, *_ in members], "완료여부"] = "실패"
+            if ledger is not None:
+                ledger.record_applied(df, [idx for idx, *_ in members])
+            continue
+
+        try:
+            # 이전 조회 결과가 아니라 이 기준일자의 행이 불러와진 뒤에 입력
+            loaded = wait_sheet_loaded(base_date)
+            if loaded < len(members):
+                print(f"⚠️ 기준일자 {base_date}: 조회 {loaded}행 < 대상 {len(members)}건 (없는 사번은 행 단위 처리)")
+
+            items = [build_sheet_item(emp_no, row, work_date) for _, emp_no, work_date, row in members]
+            if HRMS_SKIP_UNCHANGED:
+                # 이미 같은 값인 대상자는 입력/저장에서 제외
+                current = driver.execute_script(BATCH_READ_SCRIPT, items)
+                unchanged = [_sheet_item_applied(item, saved) for item, saved in zip(items, current)]
+                same = [idx for (idx, *_), flag in zip(members, unchanged) if flag]
+                if same:
+                    df.loc[same, "완료여부"] = HRMS_UNCHANGED_RESULT
+                    if ledger is not None:
+                        ledger.record_applied(df, same)
+                    print(f"⏭️ 변경 없음: {len(same)}건 저장 생략")
+                members = [member for member, flag in zip(members, unchanged) if not flag]
+                items = [item for item, flag in zip(items, unchanged) if not flag]
+                if not members:
+                    continue
+
+            sheet_rows = driver.execute_script(BATCH_SET_SCRIPT, items)
+
+            found = [(member, item) for member, item, sheet_row in zip(members, items, sheet_rows) if sheet_row >= 0]
+            fallback += [member for member, sheet_row in zip(members, sheet_rows) if sheet_row < 0]
+            if not found:
+                continue
+
+            message = submit_sheet_save()
+            print(f"✅ 일괄 저장 완료: {len(found)}건 ({message})")
+
+            current = driver.execute_script(BATCH_READ_SCRIPT, [item for _, item in found])
+            for ((idx, emp_no, _, _), item), saved in zip(found, current):
+                df.at[idx, "완료여부"] = "성공" if _sheet_item_applied(item, saved) else "실패"
+            if ledger is not None:
+                ledger.record_applied(df, [idx for (idx, *_), _ in found])
+            metrics.record_item("batch", base_date, group_probe, 건수=len(found))
+
+        except Exception as e:
+            print(f"❌ 일괄 반영 실패: 기준일자 {base_date} - {e}")
+            # 행 단위 처리로 넘긴 대상자(그리드에 없는 사번)는 아래에서 따로 시도하므로 실패로 기재하지 않음
+            queued = {idx for idx, *_ in fallback}
+            failed = [idx for idx, *_ in members if idx not in queued and df.at[idx, "완료여부"] == ""]
+            df.loc[failed, "완료여부"] = "실패"
+            if ledger is not None:
+                ledger.record_applied(df, failed)
+
+    if fallback:
+        print(f"ℹ️ 조회 결과에 없거나 같은 날 사번이 겹치는 신청 {len(fallback)}건 → 행 단위 처리")
+        for idx, _, _, row in fallback:
+            _apply_row_to_hrms(df, idx, row)
+
+    return df
+
+# ──────────────────────────────────────────────────────────────
+# 파이프라인 단계 (정리 → 사전검사 → HRMS 반영)
+# ──────────────────────────────────────────────────────────────
+def write_intermediate_files(dataframes, doc_numbers, df_formatted, df_checked):
+    # 메모리 파이프라인의 중간 결과를 기존과 같은 엑셀 파일로 기록
+    try:
+        save_all_to_excel(dataframes, doc_numbers, RAW_RESULT_FILE)
+        write_frame(df_formatted, FORMATTED_FILE)
+        write_frame(df_checked, PRECHECK_FILE)
+        print(f"✅ 중간 결과 파일 저장 완료: {FORMATTED_FILE}, {PRECHECK_FILE}")
+    except Exception as e:
+        print(f"❌ 중간 결과 파일 저장 실패: {e}")
+
+def prepare_attendance_rows(dataframes, doc_numbers, mode=PIPELINE_MODE):
+    """
+    수집된 문서 표 → 정리 → 사전검사까지 수행하고 (선별결과 DataFrame, 중간파일 저장 스레드) 반환.
+    - "memory": DataFrame을 단계 간 바로 넘기고, 중간 엑셀은 백그라운드 스레드에서 기록
+    - "excel" : 단계마다 중간 엑셀을 저장한 뒤 다시 읽는 기존 방식
+    """
+    if mode == "excel":
+        metrics.stage("normalize")
+        save_all_to_excel(dataframes, doc_numbers, RAW_RESULT_FILE)
+        format_excel(RAW_RESULT_FILE, FORMATTED_FILE)
+        metrics.stage("precheck")
+        precheck_and_save_attendance_possibility(FORMATTED_FILE, PATTERNS_FILE, PRECHECK_FILE, PRECHECK_MODE)
+        return pd.read_excel(PRECHECK_FILE), None
+
+    metrics.stage("normalize")
+    df_formatted = normalize_documents(dataframes, doc_numbers)
+    metrics.stage("precheck")
+    df_checked = precheck_attendance(df_formatted, PATTERNS_FILE, PRECHECK_MODE)
+
+    writer = None
+    if SAVE_INTERMEDIATE_FILES:
+        writer = threading.Thread(
+            target=write_intermediate_files,
+            args=(dataframes, doc_numbers, df_formatted, df_checked.copy()),
+        )
+        writer.start()
+
+    return df_checked, writer
+
+def _apply_row_to_hrms(df: pd.DataFrame, idx, row: pd.Series):
+    # 2. 작업가능 여부 확인
+    target = hrms_target(idx, row)
+    if not target:
+        return
+    emp_no, work_date = target
 
     print(f"▶️ 처리 중: {row.get('성명')} ({emp_no}) / {work_date}")
+    row_probe = metrics.probe()
 
     # 3. 사용자 조회
     if not search_user_in_hrms(emp_no, work_date):
-        continue
+        return
 
-    # 4-1. 근태코드 반영 (휴일근무인 경우만)
-    if row.get("구분") == "휴일근무":
-        apply_attendance_type_code("특근")
+    # 조회된 값이 반영할 값과 같으면 입력/저장 생략 (diff 방식)
+    if HRMS_SKIP_UNCHANGED and sheet_row_unchanged(build_sheet_item(emp_no, row, work_date)):
+        df.at[idx, "완료여부"] = HRMS_UNCHANGED_RESULT
+        print(f"⏭️ 변경 없음: {row.get('성명')} ({emp_no}) / {work_date} → 저장 생략")
+    else:
+        # 4. 근태코드 반영 (휴일근무 → 특근, 철야 → 철야)
+        code_name = resolve_attendance_code(row)
+        if code_name:
+            apply_attendance_type_code(code_name)
+
+        # 5. 근무시간 반영
+        apply_attendance_hours(row)
+
+        # 6. 저장 버튼 클릭 / 완료여부 기재
+        save_attendance(df, idx)
+    if ledger is not None:
+        ledger.record_applied(df, [idx])
+    metrics.record_item("row", f"{emp_no}/{work_date}", row_probe,
+                        문서번호=row.get("문서번호"), 결과=df.at[idx, "완료여부"])
+
+def apply_rows_to_hrms(df: pd.DataFrame, mode: str = None, applied_keys=()):
+    """
+    작업가능 행을 HRMS에 반영하고 '완료여부' 기재 (mode: "row" 한 건씩 / "batch" 기준일자별 일괄).
+    applied_keys의 (사번, 근무일자, 구분)은 이전 실행에서 반영된 것으로 보고 건너뜀.
+    """
+    df["완료여부"] = ""
+    if applied_keys:
+        done = df.apply(lambda row: row_key(row) in applied_keys, axis=1).astype(bool)
+        df.loc[done, "완료여부"] = "성공(이전 실행)"
+        print(f"ℹ️ 이전 실행에서 반영된 {int(done.sum())}건 건너뜀")
+
+    mode = mode or HRMS_APPLY_MODE
+    if mode == "batch":
+        apply_rows_to_hrms_batch(df)
+    else:
+        for idx, row in df.iterrows():
+            _apply_row_to_hrms(df, idx, row)
 
-    # 4-2. 근태코드 반영 (철야인 경우만)
-    if row.get("시작") == "07:00" and row.get("종료") == "00:20" and row.get("구분") in ["시간외근무", "특근"]:
-        apply_attendance_type_code("철야")
-        
-    # 5. 근무시간 반영
-    apply_attendance_hours(row)
+    counts = df["완료여부"].value_counts()
+    print(f"📊 HRMS 반영 결과: 저장 {counts.get('성공', 0)}건 / 변경없음(저장 생략) {counts.get(HRMS_UNCHANGED_RESULT, 0)}건 / "
+          f"이전 실행 {counts.get('성공(이전 실행)', 0)}건 / 실패 {counts.get('실패', 0)}건")
+    return df
 
-    # 6. 저장 버튼 클릭 / 완료여부 기재
-    save_attendance(df, idx)
+# ──────────────────────────────────────────────────────────────
+# pipelined 방식 (그룹웨어 수집 ↔ HRMS 반영 동시 진행)
+# ──────────────────────────────────────────────────────────────
+_PIPELINE_DONE = object()
 
-#이전 파일 삭제
-# for f in ["작업확인서_신청결과.xlsx", "작업확인서_신청결과_정리자동.xlsx"]:
-#     if os.path.exists(f):
-#         os.remove(f)
-    
-#최종 파일
-df.to_excel("작업확인서_처리결과.xlsx", index=False)
-print("📝 완료결과 저장됨 → 작업확인서_처리결과.xlsx")
-
-#로그 저장
-append_log_to_excel(log_file, "작업확인서_처리결과.xlsx")
-
-# 폴더 생성 및 파일 이동
-today_folder = datetime.now().strftime("%Y%m%d_%H%M")
-if not os.path.exists(today_folder):
-    os.makedirs(today_folder)
-
-result_files = [
-    "작업확인서_처리결과.xlsx",
-    "작업확인서_신청결과.xlsx",
-    "작업확인서_신청결과_정리자동.xlsx",
-    "작업확인서_선별결과.xlsx",
-    log_file  # 자동생성된 로그 파일
-]
-
-for file in result_files:
-    if os.path.exists(file):
-        shutil.move(file, os.path.join(today_folder, file))
-        print(f"✅ {file} → {today_folder} 폴더로 이동 완료")
-
-print(f"\n📁 모든 결과 파일이 '{today_folder}' 폴더로 정리되었습니다.")
-
-input("🔹 종료하려면 Enter 키를 누르세요...")
-driver.quit()
+class DocumentPipeline:
+    """
+    그룹웨어 세션(생산자 스레드)과 HRMS 세션(소비자)을 크기 PIPELINE_QUEUE_SIZE의 대기열로 연결.
+    - 생산자: 그룹웨어 로그인 → 작업확인서 수집. 문서 1건을 수집할 때마다 바로 정리/사전검사해
+              (문서번호, 원본 표, 정리본, 선별결과)를 대기열에 넣음. --resume으로 복원한 문서가 먼저 들어감
+    - 역압: 대기열이 가득 차면 put이 막혀 수집이 HRMS 반영 속도에 맞춰짐 (쌓이는 문서 수 상한)
+    - 순서: 생산자 1개 → 소비자 1개 FIFO이므로 문서는 수집 순서대로, 행은 문서 안 순서대로 나오고
+            이어 붙인 결과의 행 순서는 순차 방식과 같음
+    - 오류: 생산자 예외는 종료 표시 뒤에 전달되어, 소비자가 받은 문서를 모두 처리한 다음 다시 발생함
+    """
+    def __init__(self, gw_driver, skip_doc_numbers=(), restored=((), ())):
+        self.gw_driver = gw_driver
+        self.skip_doc_numbers = skip_doc_numbers
+        self.restored = restored
+        self.queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self.login_failed = False
+        self.error = None
+        self.thread = threading.Thread(target=self._produce, name="groupware", daemon=True)
+
+    def _emit(self, doc_number, df):
+        df_formatted = normalize_documents([df], [doc_number])
+        df_checked = None
+        if not df_formatted.empty:
+            df_checked = precheck_attendance(df_formatted, PATTERNS_FILE, PRECHECK_MODE)
+            if ledger is not None:
+                ledger.record_prechecked(df_checked)
+        self.queue.put((doc_number, df, df_formatted, df_checked))
+
+    def _produce(self):
+        try:
+            for df, doc_number in zip(*self.restored):
+                self._emit(doc_number, df)
+            try:
+                login_groupware(self.gw_driver)
+            except Exception as e:
+                print(f"❌ 그룹웨어 로그인 실패: {e}")
+                self.login_failed = True
+                return
+            collect_work_confirmation_documents(self.skip_doc_numbers, drv=self.gw_driver, on_document=self._emit)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.queue.put(_PIPELINE_DONE)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _PIPELINE_DONE:
+                break
+            yield item
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+def run_pipelined(skip_doc_numbers=(), restored=((), ()), applied_keys=(), headless=False):
+    """
+    그룹웨어 수집/정리/사전검사(별도 브라우저 세션)와 HRMS 반영(메인 세션)을 동시에 진행.
+    HRMS 로그인/권한/메뉴 진입은 수집과 겹쳐 진행하고, 문서가 도착할 때마다 작업가능 행을 반영함.
+    HRMS 로그인에 실패해도 수집은 끝까지 진행함(순차 방식과 같음). batch 반영은 문서 단위로 묶임.
+    (반영 결과 DataFrame, 중간파일 저장 스레드) 또는 로그인 실패 시 (None, 중간파일 저장 스레드) 반환.
+    """
+    metrics.stage("pipeline")
+    gw_driver = create_driver(headless=headless)
+    pipeline = DocumentPipeline(gw_driver, skip_doc_numbers, restored).start()
+
+    hrms_ready = login_hrms()
+    if hrms_ready:
+        set_hrms_role_if_needed()
+        go_to_attendance_management()
+
+    dataframes, doc_numbers, formatted, checked, applied = [], [], [], [], []
+    try:
+        for doc_number, df, df_formatted, df_checked in pipeline:
+            dataframes.append(df)
+            doc_numbers.append(doc_number)
+            if df_checked is None:
+                continue
+            formatted.append(df_formatted)
+            checked.append(df_checked.copy())
+            if hrms_ready:
+                print(f"▶️ 문서 반영: {doc_number} ({len(df_checked)}행)")
+                df_checked = apply_rows_to_hrms(df_checked, applied_keys=applied_keys)
+            applied.append(df_checked)
+    finally:
+        gw_driver.quit()
+
+    def combine(parts):
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    writer = None
+    if SAVE_INTERMEDIATE_FILES and dataframes:
+        writer = threading.Thread(
+            target=write_intermediate_files,
+            args=(dataframes, doc_numbers, combine(formatted), combine(checked)),
+        )
+        writer.start()
+
+    if pipeline.login_failed or not hrms_ready:
+        return None, writer
+    return combine(applied), writer
+
+# ──────────────────────────────────────────────────────────────
+# 메인 실행 흐름
+# ──────────────────────────────────────────────────────────────
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="작업확인서 수집 → 사전검사 → HRMS 반영 자동 처리")
+    parser.add_argument("--headless", action="store_true", help="브라우저 창 없이 실행")
+    parser.add_argument("--batch", action="store_true",
+                        help="비대화식 실행 (--headless --no-pause, 로그인 정보는 파일/환경변수/keyring에서만)")
+    parser.add_argument("--no-pause", action="store_true", help="종료 시 Enter 입력을 기다리지 않음")
+    parser.add_argument("--credentials", metavar="FILE", help="로그인 정보 JSON 파일")
+    parser.add_argument("--chromedriver", metavar="PATH", help="사용할 chromedriver 경로 (webdriver_manager 생략)")
+    parser.add_argument("--resume", action="store_true", help="처리 기록을 이용해 중단된 실행 이어하기")
+    parser.add_argument("--full", action="store_true",
+                        help="증분 검색 기준(watermark)을 무시하고 수신 문서 전체 검색 (누락 확인/대사용)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="그룹웨어 수집과 HRMS 반영을 브라우저 2개로 동시에 진행 (PIPELINE_MODE=pipelined)")
+    parser.add_argument("--collect", choices=["browser", "index", "http"],
+                        help="문서 수집 방식 (index: 목록 전체 색인 후 문서별 수집 + 일괄접수, "
+                             "http: 목록/문서를 로그인 쿠키로 직접 받아 파싱하고 브라우저는 접수에만 사용)")
+    parser.add_argument("--no-diff", action="store_true", help="HRMS 값이 이미 같아도 저장 (변경없음 건 저장 생략 끔)")
+    parser.add_argument("--precheck-workers", type=int, metavar="N", help="사전검사를 N개 프로세스로 나눠 실행 (parallel 방식)")
+    parser.add_argument("--rules", action="store_true",
+                        help="패턴 목록 대신 patterns.json duration_rules 구간 계산으로 사전검사 (rules 방식)")
+    parser.add_argument("--check-rules", action="store_true",
+                        help="duration_rules로 patterns.json의 모든 패턴을 다시 계산해 대조하고 종료")
+    args = parser.parse_args(argv)
+    if args.batch:
+        args.headless = args.no_pause = True
+    return args
+
+def main(argv=None):
+    """전체 실행. 종료 코드(EXIT_*) 반환."""
+    global driver, ledger, PRECHECK_MODE, PRECHECK_WORKERS, HRMS_SKIP_UNCHANGED, PIPELINE_MODE, COLLECT_MODE
+    started = time.perf_counter()
+    args = parse_args(argv)
+    if args.check_rules:
+        return EXIT_OK if report_duration_rules(PATTERNS_FILE) else EXIT_CONFIG_ERROR
+    if args.pipelined:
+        PIPELINE_MODE = "pipelined"
+    if args.collect:
+        COLLECT_MODE = args.collect
+    if args.no_diff:
+        HRMS_SKIP_UNCHANGED = False
+    if args.precheck_workers:
+        PRECHECK_MODE, PRECHECK_WORKERS = "parallel", args.precheck_workers
+    if args.rules:
+        PRECHECK_MODE = "rules"
+
+    # 로그 경로 설정
+    log_file = f"작업확인서_자동처리로그_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    sys.stdout = sys.stderr = DualLogger(log_file)
+
+    #로그인 정보 (파일/환경변수/keyring → 없으면 대화식 입력, batch 모드는 종료)
+    if not load_credentials(args.credentials):
+        if args.batch:
+            print("❌ batch 모드에서는 로그인 정보가 모두 필요합니다.")
+            return EXIT_CONFIG_ERROR
+        get_login_info()
+
+    metrics.stage("startup")
+    try:
+        resolve_chromedriver(args.chromedriver)
+        driver = create_driver(headless=args.headless)
+    except Exception as e:
+        print(f"❌ 브라우저 시작 실패: {e}")
+        return EXIT_ERROR
+    print(f"🚀 브라우저 준비 완료: {time.perf_counter() - started:.2f}초 "
+          f"({'cold' if _chromedriver_source == 'webdriver_manager' else 'warm'} start, chromedriver: {_chromedriver_source})")
+
+    try:
+        exit_code = run_pipeline(args, log_file)
+    except Exception as e:
+        print(f"❌ 처리 중단: {e}")
+        exit_code = EXIT_ERROR
+    finally:
+        if ledger is not None:
+            ledger.close()
+            ledger = None
+
+    print(f"🏁 종료 코드 {exit_code} (총 {time.perf_counter() - started:.1f}초)")
+    if not args.no_pause:
+        input("🔹 종료하려면 Enter 키를 누르세요...")
+    driver.quit()
+    return exit_code
+
+def run_pipeline(args, log_file):
+    global ledger, search_date_range
+    run_started = datetime.now()
+    collection_errors.clear()
+
+    # 처리 기록 열기 (--resume: 이전 실행에서 수집/반영된 작업은 건너뜀)
+    resume = args.resume
+    ledger = Ledger(LEDGER_FILE)
+    skip_doc_numbers = ledger.collected_doc_numbers() if resume else set()
+    restored_frames, restored_docs = ledger.pending_documents() if resume else ([], [])
+    if resume:
+        print(f"🔁 이어하기: 수집된 문서 {len(skip_doc_numbers)}건 중 미완료 {len(restored_docs)}건 복원")
+
+    applied_keys = ledger.applied_keys() if resume else ()
+
+    # 증분 검색: 직전 성공 실행의 watermark 이후 기안된 문서만 검색 (--full: 전체 검색)
+    watermark = ledger.get_meta(WATERMARK_KEY)
+    search_date_range = None if args.full else load_search_date_range(watermark)
+    if search_date_range:
+        print(f"🔎 증분 검색: 기안일 {search_date_range[0]} ~ {search_date_range[1]} (직전 실행 {watermark.get('run_at')})")
+    else:
+        print("🔎 전체 검색" + (" (--full)" if args.full and watermark else ""))
+
+    if PIPELINE_MODE == "pipelined":
+        # 그룹웨어 수집과 HRMS 반영을 동시에 진행 (수집 순서 = 반영 순서)
+        df, artifact_writer = run_pipelined(
+            skip_doc_numbers, (restored_frames, restored_docs), applied_keys, headless=args.headless
+        )
+        if df is None:
+            if artifact_writer is not None:
+                artifact_writer.join()
+            return EXIT_LOGIN_FAILED
+    else:
+        metrics.stage("groupware_login")
+        try:
+            login_groupware()
+        except Exception as e:
+            print(f"❌ 그룹웨어 로그인 실패: {e}")
+            return EXIT_LOGIN_FAILED
+        metrics.stage("collect")
+        dataframes, docnames = collect_work_confirmation_documents(skip_doc_numbers)
+        dataframes, docnames = restored_frames + dataframes, restored_docs + docnames
+        df_checked, artifact_writer = prepare_attendance_rows(dataframes, docnames)
+        ledger.record_prechecked(df_checked)
+
+        metrics.stage("hrms_login")
+        if not login_hrms():
+            if artifact_writer is not None:
+                artifact_writer.join()
+            return EXIT_LOGIN_FAILED
+        metrics.stage("hrms_role")
+        set_hrms_role_if_needed()
+        metrics.stage("hrms_menu")
+        go_to_attendance_management()
+
+        metrics.stage("hrms_apply")
+        df = apply_rows_to_hrms(df_checked, applied_keys=applied_keys)
+    ledger.finish_documents(df)
+    failed = int(df["완료여부"].eq("실패").sum()) if "완료여부" in df else 0
+    exit_code = EXIT_ROWS_FAILED if failed else EXIT_OK
+
+    # 실패한 문서/행이 있으면 watermark를 올리지 않음 → 다음 실행도 같은 기간부터 검색해 다시 처리
+    # (문서 목록에서 기안일을 알 수 없는 수집 방식도 있어, 실패 문서의 기안일 대신 직전 watermark를 상한으로 둠)
+    if exit_code == EXIT_OK and not collection_errors:
+        doc_numbers = df["문서번호"].dropna().astype(str).unique() if "문서번호" in df else ()
+        ledger.set_meta(WATERMARK_KEY, make_watermark(run_started, doc_numbers, watermark))
+    else:
+        print(f"⚠️ 수집 실패 {len(collection_errors)}건 / 반영 실패 {failed}행 → 검색 기준일 유지"
+              + (f" ({watermark.get('date')})" if watermark else " (다음 실행도 전체 검색)"))
+    report_wait_stats()
+    frames.report()
+
+    #이전 파일 삭제
+    # for f in [RAW_RESULT_FILE, FORMATTED_FILE]:
+    #     if os.path.exists(f):
+    #         os.remove(f)
+
+    metrics.stage("report")
+    #최종 파일 (로그 시트 포함)
+    print(f"📝 완료결과 저장 중 → {FINAL_RESULT_FILE}")
+    write_frame(df, FINAL_RESULT_FILE, log_path=log_file)
+
+    # 중간 결과 파일 저장 대기
+    if artifact_writer is not None:
+        artifact_writer.join()
+
+    # 폴더 생성 및 파일 이동
+    today_folder = datetime.now().strftime("%Y%m%d_%H%M")
+    if not os.path.exists(today_folder):
+        os.makedirs(today_folder)
+
+    result_files = [
+        FINAL_RESULT_FILE,
+        RAW_RESULT_FILE,
+        FORMATTED_FILE,
+        PRECHECK_FILE,
+    ]
+    if not isinstance(sys.stdout, DualLogger):
+        result_files += [log_file, log_records_path(log_file)]
+
+    for file in result_files:
+        if os.path.exists(file):
+            shutil.move(file, os.path.join(today_folder, file))
+            print(f"✅ {file} → {today_folder} 폴더로 이동 완료")
+
+    # 자동생성된 로그 파일과 구조화 로그 기록(JSONL)은 기록 중이므로 닫고 옮긴 뒤 이어서 기록
+    if isinstance(sys.stdout, DualLogger):
+        for file in sys.stdout.move_to(today_folder):
+            print(f"✅ {os.path.basename(file)} → {today_folder} 폴더로 이동 완료")
+
+    metrics.write_report(today_folder)
+    print(f"\n📁 모든 결과 파일이 '{today_folder}' 폴더로 정리되었습니다.")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""사전검사 vector 방식이 행 단위(row) 방식과 같은 결과를 내는지 확인."""
+import pandas as pd
+import pytest
+
+import main
+
+COLUMNS = ["구분", "사번", "성명", "시작", "종료", "신청시간", "출근", "퇴근", "문서번호"]
+
+OK = "작업가능"
+LATE = "패턴불일치(지각,조퇴 기타사유)"
+BLANK = "출/퇴근시간 공란"
+
+# (구분, 사번, 성명, 시작, 종료, 신청시간, 출근, 퇴근) + 기대 결과
+ROWS = [
+    # 정상 건
+    ("시간외근무", "1001", "직원1", "15:40", "16:40", "01:00", "15:30", "16:55", OK),
+    ("시간외근무", "1002", "직원2", "15:40", "22:20", "06:40", "15:30", "22:35", OK),
+    ("휴일근무", "1003", "직원3", "07:00", "15:40", "08:40", "06:50", "15:55", OK),
+    ("휴일근무", "1004", "직원4", "07:00", "12:40", "05:00", "06:50", "12:45", OK),
+    ("시간외근무", "1005", "직원5", "15:40", "16:40", "1:00", "15:30", "16:55", OK),  # "1:00" → "0100"
+    # 휴게시간(19:40~20:20)을 지나 자정을 넘기는 근무
+    ("휴일근무", "1006", "직원6", "15:40", "00:20", "08:00", "15:30", "00:35", OK),
+    ("휴일근무", "1007", "직원7", "15:40", "02:20", "10:40", "15:30", "02:30", OK),
+    ("시간외근무", "1008", "직원8", "07:00", "00:20", "17:20", "06:50", "00:30", OK),
+    ("휴일근무", "1009", "직원9", "07:00", "00:20", "16:00", "06:40", "00:25", OK),
+    # 심야 시작 예외패턴 (출근이 전날 밤이어도 허용되는 경우 / 허용되지 않는 경우)
+    ("시간외근무", "1010", "직원10", "00:20", "01:20", "01:00", "00:10", "01:35", OK),
+    ("휴일근무", "1011", "직원11", "00:20", "07:00", "06:40", "23:50", "07:10", OK),
+    ("휴일근무", "1012", "직원12", "00:20", "07:00", "06:40", "22:50", "07:10", LATE),
+    ("휴일근무", "1013", "직원13", "00:20", "07:00", "06:40", "00:30", "07:10", LATE),
+    # 틀린 시각 / 신청시간
+    ("시간외근무", "1014", "직원14", "15:50", "16:40", "01:00", "15:30", "16:55", "패턴불일치(시작시간 불일치)"),
+    ("시간외근무", "1015", "직원15", "15:40", "16:50", "01:00", "15:30", "16:55", "패턴불일치(종료시간 불일치)"),
+    ("시간외근무", "1016", "직원16", "25:00", "16:40", "01:00", "15:30", "16:55", "패턴불일치(시작시간 불일치)"),
+    ("휴일근무", "1017", "직원17", "07:00", "abc", "08:40", "06:50", "15:55", "패턴불일치(종료시간 불일치)"),
+    ("휴일근무", "1018", "직원18", "07:00", "15:40", "06:30", "06:50", "15:55", "패턴불일치(신청시간 불일치)"),
+    ("휴일근무", "1019", "직원19", "07:00", "15:40", "07:40", "06:50", "15:55", "패턴불일치(종료시간 불일치)"),
+    # 지각 / 조퇴
+    ("시간외근무", "1020", "직원20", "15:40", "17:40", "02:00", "15:45", "17:50", LATE),
+    ("휴일근무", "1021", "직원21", "07:00", "15:40", "08:40", "06:50", "15:30", LATE),
+    # 출/퇴근 공란
+    ("시간외근무", "1022", "직원22", "15:40", "16:40", "01:00", None, "16:55", BLANK),
+    ("휴일근무", "1023", "직원23", "07:00", "15:40", "08:40", "06:50", "", BLANK),
+    ("시간외근무", "1024", "직원24", "15:40", "16:40", "01:00", "  ", "16:55", BLANK),
+    # 휴일/시간외근무가 아닌 구분, 예외 대상자
+    ("연차", "1025", "직원25", "07:00", "15:40", "08:40", "06:50", "15:55", "휴일,시간외근무 외 패턴"),
+    ("시간외근무", "1026", main.PRECHECK_EXCEPTION_NAMES[0], "15:40", "16:40", "01:00", "15:50", "16:30", "예외설정"),
+]
+
+DURATION_COLUMNS = [excel_col for excel_col, _ in main.DURATION_MAPPING.values()]
+
+
+@pytest.fixture
+def attendance():
+    return pd.DataFrame([row[:-1] + ("TEST-0001",) for row in ROWS], columns=COLUMNS)
+
+
+def checked(df, mode):
+    return main.precheck_attendance(df, main.PATTERNS_FILE, mode=mode)
+
+
+def test_vector_matches_row(attendance):
+    row = checked(attendance, "row")
+    vector = checked(attendance, "vector")
+    pd.testing.assert_frame_equal(vector[["작업여부"] + DURATION_COLUMNS], row[["작업여부"] + DURATION_COLUMNS])
+
+
+@pytest.mark.parametrize("mode", ["row", "vector"])
+def test_expected_results(attendance, mode):
+    assert checked(attendance, mode)["작업여부"].tolist() == [row[-1] for row in ROWS]
+
+
+def test_duration_columns_for_matched_rows(attendance):
+    df = checked(attendance, "vector")
+    assert df.loc[0, "평일연장"] == 1.0
+    assert df.loc[2, "특근정취"] == 8.0
+    assert (df.loc[df["작업여부"] != OK, DURATION_COLUMNS] == "").all().all()
+
+
+class RecordingPool(main.ProcessPoolExecutor):
+    """map에 넘어간 묶음 수를 기록하는 프로세스 풀 (parallel 방식이 실제로 묶음을 나눴는지 확인)."""
+    chunk_counts = []
+
+    def map(self, fn, *iterables, **kwargs):
+        iterables = [list(iterable) for iterable in iterables]
+        RecordingPool.chunk_counts.append(len(iterables[0]))
+        return super().map(fn, *iterables, **kwargs)
+
+
+def test_parallel_matches_serial(attendance, monkeypatch):
+    df = pd.concat([attendance] * 4, ignore_index=True)
+    monkeypatch.setattr(main, "PRECHECK_PARALLEL_MIN_ROWS", 0)
+    monkeypatch.setattr(main, "PRECHECK_CHUNKS_PER_WORKER", 3)
+    monkeypatch.setattr(main, "PRECHECK_WORKERS", 2)
+    monkeypatch.setattr(main, "PRECHECK_PARALLEL_ENGINE", "vector")
+    monkeypatch.setattr(main, "ProcessPoolExecutor", RecordingPool)
+    RecordingPool.chunk_counts.clear()
+
+    serial = checked(df, "vector")
+    parallel = checked(df, "parallel")
+
+    assert RecordingPool.chunk_counts == [6]
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert list(parallel.dtypes) == list(serial.dtypes)
+    assert parallel.to_csv(index=False) == serial.to_csv(index=False)
+
+
+@pytest.mark.parametrize("mode", ["row", "vector", "verify", "parallel", "rules"])
+@pytest.mark.parametrize("columns", [[], COLUMNS])
+def test_empty_input(mode, columns):
+    # 새 문서가 없는 실행: normalize_documents([], [])는 컬럼 없는 빈 표를 돌려줌
+    df = checked(pd.DataFrame(columns=columns), mode)
+    assert df.empty
+    assert "작업여부" in df.columns and set(DURATION_COLUMNS) <= set(df.columns)
+
+
+@pytest.mark.parametrize("value, minutes", [
+    ("15:40", 940), (" 7:00 ", 420), ("07:00:59", 420), ("24:00", -1), ("", -1), (None, -1),
+    # 엑셀 시각 값 (하루=1.0): 0.0은 자정, 1 이상(날짜가 붙은 값, 24:00)과 음수는 변환 불가
+    (0.0, 0), (15 / 24 + 40 / 1440, 940), (0.5, 720), (0.99999999, 1439),
+    (1.0, -1), (45000.5, -1), (-0.25, -1), (float("nan"), -1), (7, -1),
+])
+def test_time_to_minutes(value, minutes):
+    assert main.time_to_minutes(value) == minutes
+
+
+def test_numeric_times_match_text(attendance):
+    # 출근/퇴근을 엑셀 시각 값(실수)으로 바꿔도 문자열과 같은 결과, 1.0은 00:00으로 보지 않고 변환 불가로 판정
+    numeric = attendance.copy()
+    for col in ["출근", "퇴근"]:
+        numeric[col] = numeric[col].map(lambda v: main.time_to_minutes(v) / 1440 if main.time_to_minutes(v) >= 0 else v)
+    numeric.loc[0, "퇴근"] = 1.0
+    expected = [LATE] + [row[-1] for row in ROWS[1:]]
+    for mode in ["row", "vector"]:
+        assert checked(numeric, mode)["작업여부"].tolist() == expected